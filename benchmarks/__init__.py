@@ -0,0 +1 @@
+"""Benchmarks del pipeline amb pàgines sintètiques."""
@@ -0,0 +1,148 @@
+"""Import benchmark - Temps d'arrencada dels mòduls del CLI i dependències pesades carregades.
+
+Cada mesura és un intèrpret nou, com una execució del cron. A més del temps, comprova
+que cap mòdul importi dependències que només calen per un parser o exporter concret.
+
+Ús (des de l'arrel del repositori):
+
+    python -m benchmarks.imports               # falla si algun mòdul carrega una dependència vetada
+    python -m benchmarks.imports --max-ms 300  # i també si algun supera aquest temps
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+HEAVY = ("playwright", "httpx", "bs4", "openpyxl", "reportlab", "pyarrow")
+
+# Dependències pesades que cada mòdul no ha de carregar només per ser importat
+TARGETS: Dict[str, Tuple[str, ...]] = {
+    'stripscraper': HEAVY,
+    'stripscraper.main': HEAVY,
+    'stripscraper.parser': HEAVY,
+    'stripscraper.scraper': HEAVY,
+    'stripscraper.parser.lxml': HEAVY,
+    'stripscraper.scraper.concurrent': ("playwright", "bs4", "openpyxl", "reportlab", "pyarrow"),
+    'stripscraper.exporters.csv': HEAVY,
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'modules': sorted(sys.modules)}}))
+"""
+
+
+@dataclass
+class ImportResult:
+    module: str
+    best: float
+    median: float
+    heavy: List[str]
+    forbidden: List[str]
+    slowest: List[Tuple[str, float]]
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC), env.get('PYTHONPATH')]))
+    # Sense bytecode no es mesuraria l'arrencada real sinó la compilació
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+
+def _probe(module: str, importtime: bool = False) -> Tuple[dict, str]:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else [])
+    command += ["-c", _PROBE.format(module=module)]
+    completed = subprocess.run(command, capture_output=True, text=True, env=_environment(),
+                               check=True)
+    return json.loads(completed.stdout), completed.stderr
+
+
+def slowest_imports(importtime: str, count: int = 3) -> List[Tuple[str, float]]:
+    """Paquets de tercers amb més temps acumulat (sortida de ``-X importtime``), en segons."""
+    timings: Dict[str, float] = {}
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name == " site":
+            # Tot el que hi ha fins aquí és l'arrencada de l'intèrpret (fitxers .pth inclosos)
+            timings.clear()
+            continue
+        package = name.strip().split(".")[0]
+        if not cumulative.strip().isdigit() or package == "stripscraper" \
+                or package in sys.stdlib_module_names or package.startswith("_"):
+            continue
+        # La primera importació del paquet és la que inclou els seus submòduls
+        timings[package] = max(timings.get(package, 0.0), int(cumulative) / 1e6)
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:count]
+    return [(package, seconds) for package, seconds in slowest if seconds >= 0.001]
+
+
+def measure(module: str, forbidden: Tuple[str, ...], repeat: int) -> ImportResult:
+    _probe(module)  # escalfament: bytecode i memòria cau del sistema de fitxers
+    timings = []
+    for _ in range(repeat):
+        result, _ = _probe(module)
+        timings.append(result['seconds'])
+
+    result, importtime = _probe(module, importtime=True)
+    loaded = set(result['modules'])
+    heavy = [name for name in HEAVY if name in loaded]
+    return ImportResult(module=module,
+                        best=round(min(timings), 6),
+                        median=round(statistics.median(timings), 6),
+                        heavy=heavy,
+                        forbidden=[name for name in heavy if name in forbidden],
+                        slowest=slowest_imports(importtime))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks.imports",
+                                     description="Temps d'importació dels mòduls del CLI")
+    parser.add_argument("-k", dest="filter", default=None,
+                        help="Només els mòduls que contenen aquest text")
+    parser.add_argument("--repeat", type=int, default=5, help="Intèrprets nous per mòdul")
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="Falla si el millor temps d'algun mòdul supera aquest límit")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    targets = {module: forbidden for module, forbidden in TARGETS.items()
+               if args.filter is None or args.filter in module}
+
+    failures = []
+    print(f"{'mòdul':<34}{'millor':>10}{'mediana':>10}  més lents")
+    for module, forbidden in targets.items():
+        result = measure(module, forbidden, args.repeat)
+        slowest = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in result.slowest)
+        print(f"{module:<34}{result.best * 1000:>8.1f}ms{result.median * 1000:>8.1f}ms  {slowest}")
+
+        if result.forbidden:
+            print(f"  carrega {', '.join(result.forbidden)} en importar-se")
+            failures.append(module)
+        elif args.max_ms is not None and result.best * 1000 > args.max_ms:
+            print(f"  supera el límit de {args.max_ms:.0f}ms")
+            failures.append(module)
+
+    if failures:
+        print(f"{len(failures)} mòduls amb regressions d'importació: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Benchmarks - Escenaris cronometrats del pipeline i comparació amb la línia base desada.
+
+Ús (des de l'arrel del repositori):
+
+    python -m benchmarks.run                     # executa i compara amb baseline.json
+    python -m benchmarks.run --update-baseline   # desa els temps actuals com a línia base
+    python -m benchmarks.run -k export           # només els escenaris que contenen "export"
+"""
+
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+from benchmarks.synthetic import generate_division
+from stripscraper.classifier import Classifier
+from stripscraper.exporters.csv import CSVExporter
+from stripscraper.exporters.excel import ExcelExporter
+from stripscraper.exporters.pdf import PDFExporter
+from stripscraper.parser.html import HtmlParser
+from stripscraper.parser.stream import StreamingHtmlParser
+from stripscraper.strip import StripCalculator
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+
+# Regressió si el millor temps, relatiu al calibratge, supera el de la línia base en més
+# d'aquest factor. El mínim és molt menys sensible que la mediana a la càrrega de la màquina
+DEFAULT_THRESHOLD = 1.3
+THRESHOLDS = {
+    # Escenaris de pocs mil·lisegons o dominats per l'escriptura a disc: més soroll relatiu
+    'classifier': 1.5,
+    'strip_combine': 1.5,
+    'export_csv': 2.0,
+}
+
+DIVISIONS = ("1a Div", "2a Div", "3a Div", "4a Div")
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    repeat: int
+    median: float
+    best: float
+    calibration: float
+
+
+class Fixture:
+    """Dades sintètiques compartides per tots els escenaris (4 divisions × Cadet/Juvenil)."""
+
+    def __init__(self, groups: int, teams_per_group: int, stat_columns: int):
+        self.pages: List[str] = []
+        for seed, division in enumerate(DIVISIONS):
+            cadet, juvenil = generate_division(division, groups, teams_per_group,
+                                               stat_columns=stat_columns, seed=seed * 2)
+            self.pages += [cadet, juvenil]
+
+        self.parsed = [HtmlParser("lxml").parse_classification(page) for page in self.pages]
+        self.strip = StripCalculator().calculate_strip_classifications(self.parsed)
+        self.classified = Classifier().classify(self.strip)
+        self.output = Path(tempfile.mkdtemp(prefix="stripscraper-bench-"))
+
+
+def _scenarios(fixture: Fixture) -> Dict[str, Callable[[], object]]:
+    return {
+        'parse_bs4': lambda: [HtmlParser("bs4").parse_classification(p) for p in fixture.pages],
+        'parse_lxml': lambda: [HtmlParser("lxml").parse_classification(p) for p in fixture.pages],
+        'parse_stream': lambda: [StreamingHtmlParser().parse_stream([p.encode('utf-8')])
+                                 for p in fixture.pages],
+        'strip_combine': lambda: StripCalculator().calculate_strip_classifications(fixture.parsed),
+        'classifier': lambda: Classifier().classify(fixture.strip),
+        'export_csv': lambda: CSVExporter().export(fixture.classified, fixture.output),
+        'export_excel': lambda: ExcelExporter().export(fixture.classified, fixture.output),
+        'export_excel_write_only': lambda: ExcelExporter(write_only=True).export(
+            fixture.classified, fixture.output),
+        'export_pdf': lambda: PDFExporter().export(fixture.classified, fixture.output),
+    }
+
+
+def calibrate(repeat: int = 3) -> float:
+    """Temps d'una càrrega fixa de Python pur, per normalitzar la velocitat de la màquina."""
+    def workload():
+        data = [(i * 7919) % 10007 for i in range(200_000)]
+        data.sort()
+        return sum(str(x).count('7') for x in data[:50_000])
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        workload()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings), 6)
+
+
+def run(scenarios: Dict[str, Callable[[], object]], repeat: int) -> List[BenchmarkResult]:
+    results = []
+    for name, scenario in scenarios.items():
+        scenario()  # escalfament: imports, memòries cau, fonts de reportlab...
+        calibration = calibrate()
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scenario()
+            timings.append(time.perf_counter() - start)
+        results.append(BenchmarkResult(name=name, repeat=repeat,
+                                       median=round(statistics.median(timings), 6),
+                                       best=round(min(timings), 6),
+                                       calibration=min(calibration, calibrate())))
+    return results
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict[str, dict],
+            threshold: Optional[float]) -> List[str]:
+    regressions = []
+    print(f"{'escenari':<26}{'millor':>11}{'mediana':>11}{'base':>11}{'ràtio':>8}")
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            print(f"{result.name:<26}{result.best * 1000:>9.2f}ms{result.median * 1000:>9.2f}ms"
+                  f"{'-':>11}{'-':>8}")
+            continue
+
+        # Es compara en unitats de calibratge, mesurat just abans i després de cada escenari
+        ratio = (result.best / result.calibration) / (base['best'] / base['calibration'])
+        limit = threshold or THRESHOLDS.get(result.name, DEFAULT_THRESHOLD)
+        flag = "  REGRESSIÓ" if ratio > limit else ""
+        print(f"{result.name:<26}{result.best * 1000:>9.2f}ms{result.median * 1000:>9.2f}ms"
+              f"{base['best'] * 1000:>9.2f}ms{ratio:>7.2f}x{flag}")
+        if flag:
+            regressions.append(result.name)
+    return regressions
+
+
+def load_baseline() -> dict:
+    if not BASELINE_FILE.exists():
+        return {}
+    return json.loads(BASELINE_FILE.read_text(encoding='utf-8'))
+
+
+def save_baseline(results: List[BenchmarkResult], args: argparse.Namespace):
+    baseline = load_baseline()
+    scenarios = baseline.get('scenarios', {})
+    scenarios.update({r.name: asdict(r) for r in results})
+    baseline = {
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                    'processor': platform.machine()},
+        'fixture': {'groups': args.groups, 'teams_per_group': args.teams,
+                    'stat_columns': args.stat_columns},
+        'scenarios': dict(sorted(scenarios.items())),
+    }
+    BASELINE_FILE.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n",
+                             encoding='utf-8')
+    print(f"Línia base desada a {BASELINE_FILE}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="benchmarks",
+                                     description="Benchmarks del pipeline amb pàgines sintètiques")
+    parser.add_argument("-k", dest="filter", default=None,
+                        help="Només els escenaris que contenen aquest text")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticions per escenari")
+    parser.add_argument("--groups", type=int, default=4, help="Grups per categoria")
+    parser.add_argument("--teams", type=int, default=12, help="Equips per grup")
+    parser.add_argument("--stat-columns", type=int, default=15,
+                        help="Columnes de cada fila de la taula (mínim 15)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="Factor de regressió comú (per defecte, THRESHOLDS per escenari)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Desa els resultats com a nova línia base")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    fixture = Fixture(args.groups, args.teams, args.stat_columns)
+    scenarios = {name: scenario for name, scenario in _scenarios(fixture).items()
+                 if args.filter is None or args.filter in name}
+
+    try:
+        results = run(scenarios, args.repeat)
+    finally:
+        shutil.rmtree(fixture.output, ignore_errors=True)
+
+    if args.update_baseline:
+        save_baseline(results, args)
+        return 0
+
+    baseline = load_baseline()
+    if baseline.get('fixture') not in (None, {'groups': args.groups, 'teams_per_group': args.teams,
+                                              'stat_columns': args.stat_columns}):
+        print("Avís: la línia base es va mesurar amb unes altres dades sintètiques")
+
+    regressions = compare(results, baseline.get('scenarios', {}), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} escenaris per sobre del llindar: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
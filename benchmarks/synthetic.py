@@ -0,0 +1,111 @@
+"""Synthetic pages - Genera HTML amb la forma de clasificacion_completa.php per als benchmarks."""
+
+import random
+from html import escape
+from typing import List, Optional, Tuple
+
+TOWNS = [
+    "Sabadell", "Terrassa", "Sant Cugat", "Mataró", "Girona", "Lleida", "Tarragona", "Reus",
+    "Manresa", "Vic", "Granollers", "Badalona", "L'Hospitalet", "Cornellà", "Sant Boi",
+    "Castelldefels", "Vilanova", "Igualada", "Olot", "Figueres", "Blanes", "Rubí", "Martorell",
+    "Sitges", "Valls", "Tortosa", "Balaguer", "Cerdanyola", "Ripollet", "Montcada",
+]
+PREFIXES = ["CV", "Club Voleibol", "CE", "AE", "UE", "CVB"]
+SUFFIXES = ["", " Blau", " Vermell", " Verd", " Negre", " A", " B"]
+
+MIN_STAT_COLUMNS = 15
+
+
+def team_names(count: int, seed: int = 0) -> List[str]:
+    available = len(PREFIXES) * len(TOWNS) * len(SUFFIXES)
+    if count > available:
+        raise ValueError(f"Massa equips per generar noms diferents: {count} (màx {available})")
+
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        names.add(f"{rng.choice(PREFIXES)} {rng.choice(TOWNS)}{rng.choice(SUFFIXES)}")
+    return sorted(names)
+
+
+def _team_row(position: int, name: str, played: int, stat_columns: int, rng: random.Random) -> str:
+    won = rng.randint(0, played)
+    lost = played - won
+    won_3 = rng.randint(0, won)
+    lost_1 = rng.randint(0, lost)
+    points = won_3 * 3 + (won - won_3) * 2 + lost_1
+    sets_for = won * 3 + lost * rng.randint(0, 2)
+    sets_against = lost * 3 + won * rng.randint(0, 2)
+    points_for = rng.randint(15, 25) * (sets_for + sets_against)
+    points_against = rng.randint(15, 25) * (sets_for + sets_against)
+    form = "".join(rng.choice("VD") for _ in range(min(played, 5)))
+
+    def pct(value: int) -> int:
+        return int(100 * value / played) if played else 0
+
+    def avg(value: int) -> str:
+        return f"{value / played:.2f}" if played else "0.00"
+
+    cells = [
+        str(position),
+        f"<a href='equipo.php?id={position}'>{escape(name)}</a>",
+        form,
+        str(points),
+        str(played),
+        f"{won} {pct(won)}%",
+        f"{lost} {pct(lost)}%",
+        str(sets_for),
+        str(sets_against),
+        f"{points_for} {avg(points_for)} ptos./part.",
+        f"{points_against} {avg(points_against)} ptos./part.",
+        str(won_3),
+        str(won - won_3),
+        str(lost_1),
+        str(lost - lost_1),
+    ]
+    cells += ["0"] * (stat_columns - MIN_STAT_COLUMNS)
+    return "<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>"
+
+
+def generate_page(category: str,
+                  groups: int = 4,
+                  teams_per_group: int = 10,
+                  round_num: int = 7,
+                  stat_columns: int = MIN_STAT_COLUMNS,
+                  seed: int = 0,
+                  names: Optional[List[str]] = None) -> str:
+    if stat_columns < MIN_STAT_COLUMNS:
+        raise ValueError(f"Calen com a mínim {MIN_STAT_COLUMNS} columnes per fila: {stat_columns}")
+
+    rng = random.Random(seed)
+    names = names or team_names(groups * teams_per_group, seed)
+    played = min(round_num, teams_per_group - 1)
+
+    parts = ["<html><head><meta charset='utf-8'><title>Clasificación</title></head><body>",
+             f"<h2>CLASIFICACIONES {escape(category)}</h2>"]
+    for g in range(groups):
+        label = chr(ord('A') + g) if g < 26 else str(g + 1)
+        parts.append(f"<h4>PRIMERA FASE - GRUP {label}</h4>")
+        parts.append(f"<h4>Jornada: {round_num}</h4>")
+        parts.append("<table><tr>" + "<th>col</th>" * stat_columns + "</tr>")
+        group_names = names[g * teams_per_group:(g + 1) * teams_per_group]
+        for position, name in enumerate(group_names, start=1):
+            parts.append(_team_row(position, name, played, stat_columns, rng))
+        parts.append("</table>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def generate_division(division: str = "4a Div",
+                      groups: int = 4,
+                      teams_per_group: int = 10,
+                      round_num: int = 7,
+                      stat_columns: int = MIN_STAT_COLUMNS,
+                      seed: int = 0) -> Tuple[str, str]:
+    """Pàgines Cadet i Juvenil d'una divisió amb els mateixos clubs als mateixos grups."""
+    names = team_names(groups * teams_per_group, seed)
+    cadet = generate_page(f"Cadet Femení {division}", groups, teams_per_group, round_num,
+                          stat_columns, seed, [f"{n} Cadet" for n in names])
+    juvenil = generate_page(f"Juvenil Femení {division}", groups, teams_per_group, round_num,
+                            stat_columns, seed + 1, [f"{n} Juvenil" for n in names])
+    return cadet, juvenil
@@ -0,0 +1,163 @@
+"""Archive - Pàgines descarregades adreçades per contingut (sha256), comprimides i deduplicades."""
+
+import gzip
+import hashlib
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+@dataclass
+class ArchiveEntry:
+    url: str
+    fetched_at: str
+    sha256: str
+    size: int
+
+
+class _ArchiveSink:
+
+    def __init__(self, compressor: BinaryIO):
+        self._compressor = compressor
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes):
+        self._digest.update(chunk)
+        self._compressor.write(chunk)
+        self.size += len(chunk)
+
+    def tee(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        for chunk in chunks:
+            self.write(chunk)
+            yield chunk
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+
+class PageArchive:
+
+    def __init__(self, root: Path = Path("outputs/archive"), compression: str = "gzip"):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Compressió desconeguda: {compression} "
+                             f"(opcions: {', '.join(COMPRESSIONS)})")
+        self.root = Path(root)
+        self.compression = compression
+        self.index_file = self.root / "index.jsonl"
+
+    @contextmanager
+    def writer(self, url: str) -> Iterator[_ArchiveSink]:
+        objects = self.root / "objects"
+        objects.mkdir(parents=True, exist_ok=True)
+        tmp = objects / f".{os.getpid()}-{uuid.uuid4().hex}.tmp"
+
+        try:
+            with open(tmp, 'wb') as raw, self._compressor(raw) as compressor:
+                sink = _ArchiveSink(compressor)
+                yield sink
+
+            path = self._object_path(sink.sha256)
+            if path.exists():
+                logger.debug(f"Pàgina ja arxivada ({sink.sha256[:12]}), no es duplica")
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        self._append_index(ArchiveEntry(
+            url=url,
+            fetched_at=datetime.now(timezone.utc).isoformat(),
+            sha256=sink.sha256,
+            size=sink.size
+        ))
+
+    def store(self, url: str, data: bytes) -> str:
+        with self.writer(url) as sink:
+            sink.write(data)
+        return sink.sha256
+
+    def store_stream(self, url: str, chunks: Iterable[bytes]) -> str:
+        with self.writer(url) as sink:
+            for chunk in chunks:
+                sink.write(chunk)
+        return sink.sha256
+
+    def read(self, sha256: str) -> bytes:
+        # Un arxiu pot barrejar objectes gzip i zstd si se n'ha canviat la compressió
+        for compression in [self.compression] + [c for c in COMPRESSIONS if c != self.compression]:
+            path = self._object_path(sha256, compression)
+            if path.exists():
+                with open(path, 'rb') as raw, self._decompressor(raw, compression) as f:
+                    return f.read()
+        raise ValueError(f"No hi ha cap pàgina arxivada amb hash {sha256}")
+
+    def history(self, url: Optional[str] = None) -> List[ArchiveEntry]:
+        if not self.index_file.exists():
+            return []
+        entries = []
+        with open(self.index_file, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entries.append(ArchiveEntry(**json.loads(line)))
+        if url is not None:
+            entries = [e for e in entries if e.url == url]
+        return entries
+
+    def latest(self, at: Optional[datetime] = None) -> List[ArchiveEntry]:
+        # Última versió de cada URL arxivada fins a `at` (o la més recent), ordenades per URL
+        if at is not None and at.tzinfo is None:
+            at = at.replace(tzinfo=timezone.utc)
+        latest = {}
+        for entry in self.history():
+            if at is None or datetime.fromisoformat(entry.fetched_at) <= at:
+                latest[entry.url] = entry
+        return [latest[url] for url in sorted(latest)]
+
+    def _object_path(self, sha256: str, compression: Optional[str] = None) -> Path:
+        suffix = COMPRESSIONS[compression or self.compression]
+        return self.root / "objects" / sha256[:2] / f"{sha256}.html{suffix}"
+
+    def _compressor(self, raw: BinaryIO) -> BinaryIO:
+        if self.compression == "zstd":
+            return self._zstandard().ZstdCompressor().stream_writer(raw, closefd=False)
+        # mtime=0 i sense nom (si no, s'hi desaria el del temporal): el mateix contingut
+        # genera sempre el mateix fitxer comprimit
+        return gzip.GzipFile(filename='', fileobj=raw, mode='wb', mtime=0)
+
+    def _decompressor(self, raw: BinaryIO, compression: Optional[str] = None) -> BinaryIO:
+        if (compression or self.compression) == "zstd":
+            return self._zstandard().ZstdDecompressor().stream_reader(raw)
+        return gzip.GzipFile(fileobj=raw, mode='rb')
+
+    def _zstandard(self):
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError("La compressió zstd necessita el paquet 'zstandard' "
+                              "(pip install stripscraper[archive])") from e
+        return zstandard
+
+    def _append_index(self, entry: ArchiveEntry):
+        line = json.dumps(asdict(entry), ensure_ascii=False) + "\n"
+        with open(self.index_file, 'a', encoding='utf-8') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            f.write(line)
+            f.flush()
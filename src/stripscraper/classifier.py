@@ -2,6 +2,7 @@
 
 from typing import List
 
+from stripscraper.instrumentation import stage
 from stripscraper.models import Classification, GlobalClassification, TeamWithContext
 
 
@@ -11,7 +12,8 @@ class Classifier:
         global_class = []
 
         for classification in classifications:
-            global_class.append(self._global_classify(classification))
+            with stage("classify", classification.category):
+                global_class.append(self._global_classify(classification))
 
         return global_class
 
@@ -0,0 +1,196 @@
+"""Watch daemon - Vigila cada categoria i recalcula només les divisions amb jornada nova."""
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from loguru import logger
+
+from stripscraper.classifier import Classifier
+from stripscraper.instrumentation import stage
+from stripscraper.models import Classification
+from stripscraper.strip import StripCalculator
+
+# Segons màxims en què es reparteix la primera consulta de cada URL en arrencar
+STARTUP_SPREAD = 10.0
+
+
+@dataclass
+class UrlSchedule:
+    url: str
+    interval: float
+    next_poll: float = 0.0
+    failures: int = 0
+    category: Optional[str] = None
+    division: Optional[str] = None
+    rounds: Dict[str, int] = field(default_factory=dict)
+    classification: Optional[Classification] = None
+
+
+class WatchDaemon:
+    """Consulta cada URL periòdicament i recalcula la tira de les divisions amb jornada nova.
+
+    La primera consulta de cada URL només desa les jornades actuals: en arrencar no es
+    torna a exportar tot. Amb ``export_on_start=True`` la primera consulta també compta
+    com a jornada nova (útil si el dimoni ha estat aturat mentre avançava una jornada).
+    Un error en una categoria o divisió es registra i el dimoni continua amb les altres.
+    """
+
+    def __init__(self,
+                 parser,
+                 urls: List[str],
+                 exporters: list,
+                 export_dir: Path = Path("outputs"),
+                 interval: float = 900.0,
+                 intervals: Optional[Dict[str, float]] = None,
+                 jitter: float = 0.2,
+                 max_backoff: float = 6 * 3600.0,
+                 seed: Optional[int] = None,
+                 on_update: Optional[Callable[[str, list], None]] = None,
+                 export_on_start: bool = False):
+        if not urls:
+            raise ValueError("Cal com a mínim una URL per vigilar")
+        if not 0 <= jitter < 1:
+            raise ValueError(f"El jitter ha d'estar entre 0 i 1: {jitter}")
+
+        self.parser = parser
+        self.exporters = exporters
+        self.export_dir = Path(export_dir)
+        self.jitter = jitter
+        self.max_backoff = max_backoff
+        self.on_update = on_update
+        self.export_on_start = export_on_start
+
+        self.strip = StripCalculator()
+        self.classifier = Classifier()
+
+        self._random = random.Random(seed)
+        self._stop = threading.Event()
+
+        intervals = intervals or {}
+        now = time.monotonic()
+        # Primera consulta escalonada perquè no surtin totes les peticions alhora
+        self.schedules = [UrlSchedule(url=url, interval=intervals.get(url, interval),
+                                      next_poll=now + self._random.uniform(0, STARTUP_SPREAD))
+                          for url in urls]
+        self._pending: Set[str] = set()
+
+    def run(self, max_cycles: Optional[int] = None):
+        interval = min(s.interval for s in self.schedules)
+        logger.info(f"Vigilant {len(self.schedules)} categories "
+                    f"(interval {interval:.0f}s, jitter {self.jitter:.0%})")
+        cycles = 0
+        while not self._stop.is_set():
+            due = self._wait_for_due()
+            if not due:
+                break
+
+            for schedule in due:
+                try:
+                    division = self.poll(schedule)
+                except Exception as e:
+                    logger.exception(f"Error inesperat consultant {schedule.url}: {e}")
+                    continue
+                if division:
+                    self._pending.add(division)
+
+            # Les divisions que no s'han pogut calcular es tornen a provar al cicle següent
+            for division in sorted(self._pending):
+                try:
+                    done = self.recompute(division)
+                except Exception as e:
+                    logger.exception(f"Divisió {division}: error recalculant la tira: {e}")
+                    continue
+                if done:
+                    self._pending.discard(division)
+
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+
+        logger.info("Vigilància aturada")
+
+    def stop(self):
+        self._stop.set()
+
+    def poll(self, schedule: UrlSchedule) -> Optional[str]:
+        """Consulta una URL i retorna la divisió a recalcular si alguna jornada ha avançat."""
+        try:
+            with stage("watch.poll", schedule.url):
+                classification = self.parser.parse_classification(schedule.url)
+        except Exception as e:
+            schedule.failures += 1
+            delay = min(schedule.interval * 2 ** schedule.failures, self.max_backoff)
+            schedule.next_poll = time.monotonic() + self._jittered(delay)
+            logger.warning(f"Error consultant {schedule.url} ({schedule.failures} seguits): {e}. "
+                           f"Reintent en {delay:.0f}s")
+            return None
+
+        schedule.failures = 0
+        schedule.next_poll = time.monotonic() + self._jittered(schedule.interval)
+
+        try:
+            division = self.strip.extract_division(classification.category)
+        except ValueError as e:
+            logger.warning(f"{schedule.url}: categoria sense divisió coneguda, s'ignora: {e}")
+            return None
+
+        first_poll = schedule.category is None
+        rounds = {group.name: group.round for group in classification.groups}
+        advanced = [name for name, round_num in rounds.items()
+                    if round_num > schedule.rounds.get(name, -1)]
+
+        schedule.category = classification.category
+        schedule.division = division
+        schedule.classification = classification
+        schedule.rounds = rounds
+
+        if first_poll and not self.export_on_start:
+            logger.info(f"{classification.category}: jornades actuals desades")
+            return None
+        if not advanced:
+            logger.debug(f"{classification.category}: cap jornada nova")
+            return None
+
+        logger.info(f"{classification.category}: jornada nova a {', '.join(sorted(advanced))}")
+        return division
+
+    def recompute(self, division: str) -> bool:
+        members = [s.classification for s in self.schedules
+                   if s.classification is not None and s.division == division]
+        if len(members) < 2:
+            logger.debug(f"Divisió {division}: esperant Cadet i Juvenil per recalcular")
+            return False
+
+        with stage("watch.recompute", division):
+            try:
+                strip = self.strip.calculate_strip_classifications(members)
+            except ValueError as e:
+                # Si una categoria ja té la jornada nova i l'altra no, els grups poden no quadrar
+                logger.warning(f"Divisió {division}: no es pot calcular la tira encara: {e}")
+                return False
+
+            classified = self.classifier.classify(strip)
+            for exporter in self.exporters:
+                exporter.export(classified, self.export_dir)
+
+        logger.success(f"Divisió {division}: tira recalculada i exportada")
+        if self.on_update:
+            self.on_update(division, classified)
+        return True
+
+    def _wait_for_due(self) -> List[UrlSchedule]:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            due = [s for s in self.schedules if s.next_poll <= now]
+            if due:
+                return sorted(due, key=lambda s: s.next_poll)
+            wait = min(s.next_poll for s in self.schedules) - now
+            self._stop.wait(wait)
+        return []
+
+    def _jittered(self, seconds: float) -> float:
+        return seconds * self._random.uniform(1 - self.jitter, 1 + self.jitter)
@@ -1,12 +1,13 @@
 """CSV Exporter - Exporta classificacions a CSV."""
 
 import csv
-from datetime import datetime
 from typing import List
 from pathlib import Path
 
 from loguru import logger
 
+from stripscraper.exporters.files import atomic_output, output_file
+from stripscraper.instrumentation import stage
 from stripscraper.models import GlobalClassification
 
 
@@ -14,17 +15,15 @@ class CSVExporter:
 
     def export(self, classifications: List[GlobalClassification], filepath: Path):
         for classification in classifications:
-            self._export_classification(classification, filepath)
+            with stage("export.csv", classification.category):
+                self._export_classification(classification, filepath)
 
     def _export_classification(self, classification: GlobalClassification, filepath: Path):
-        file_name = f"{classification.category}-{datetime.today().strftime('%Y-%m-%d')}.csv"
-        csv_file = Path(filepath / file_name)
-        csv_file.unlink(missing_ok=True)
-        csv_file.parent.mkdir(parents=True, exist_ok=True)
+        csv_file = output_file(classification, filepath, "csv")
 
         logger.info(f"Exporting {csv_file}")
 
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        with atomic_output(csv_file) as tmp, open(tmp, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
 
             writer.writerow([
@@ -0,0 +1,170 @@
+"""Dataset Exporter - Exporta classificacions a un dataset particionat (Parquet o CSV gzip)."""
+
+import gzip
+import re
+from datetime import date, datetime, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from stripscraper.classifier import Classifier
+from stripscraper.exporters.files import atomic_output
+from stripscraper.instrumentation import stage
+from stripscraper.models import GlobalClassification
+from stripscraper.snapshots import SnapshotStore
+
+FORMATS = {"parquet": ".parquet", "csv.gz": ".csv.gz"}
+
+# Columnes de les classificacions globals (tira classificada). Totes les particions del
+# dataset, també les dels snapshots, tenen aquest esquema
+CLASSIFICATION_COLUMNS = {
+    'fetched_at': 'U',
+    'global_position': 'i4',
+    'name': 'U',
+    'points_percentage': 'f8',
+    'total_points': 'i4',
+    'group': 'U',
+    'new_group': 'i4',
+    'group_position': 'i4',
+    'matches_played': 'i4',
+    'matches_won': 'i4',
+    'matches_lost': 'i4',
+    'sets_for': 'i4',
+    'sets_against': 'i4',
+    'sets_difference': 'i4',
+    'points_for': 'i4',
+    'points_against': 'i4',
+    'points_difference': 'i4',
+}
+
+_STATS_ATTRIBUTES = {
+    'name': 'name',
+    'points_percentage': 'points_percentage',
+    'total_points': 'total_points',
+    'new_group': 'new_group',
+    'group_position': 'position',
+    'matches_played': 'matches_played',
+    'matches_won': 'matches_won',
+    'matches_lost': 'matches_lost',
+    'sets_for': 'sets_for',
+    'sets_against': 'sets_against',
+    'sets_difference': 'sets_difference',
+    'points_for': 'points_for',
+    'points_against': 'points_against',
+    'points_difference': 'points_difference',
+}
+
+
+def classification_columns(classification: GlobalClassification,
+                           fetched_at: datetime) -> Dict[str, np.ndarray]:
+    teams = classification.teams
+    stamp = fetched_at.astimezone(timezone.utc).isoformat()
+    columns = {'fetched_at': np.full(len(teams), stamp),
+               'global_position': np.arange(1, len(teams) + 1, dtype='i4')}
+    for column, attribute in _STATS_ATTRIBUTES.items():
+        values = [getattr(team.stats, attribute) for team in teams]
+        columns[column] = np.array(values, dtype=CLASSIFICATION_COLUMNS[column])
+    columns['group'] = np.array([team.group for team in teams], dtype='U')
+    return {column: columns[column] for column in CLASSIFICATION_COLUMNS}
+
+
+def _csv_column(values: np.ndarray) -> np.ndarray:
+    text = values.astype(str)
+    if values.dtype.kind != 'U':
+        return text
+    # Cometes només on calen, com fa csv.writer amb QUOTE_MINIMAL
+    needs_quotes = (np.char.find(text, ',') >= 0) | (np.char.find(text, '"') >= 0) \
+        | (np.char.find(text, '\n') >= 0)
+    if not needs_quotes.any():
+        return text
+    quoted = np.char.add(np.char.add('"', np.char.replace(text, '"', '""')), '"')
+    return np.where(needs_quotes, quoted, text)
+
+
+class DatasetExporter:
+
+    def __init__(self, format: str = "parquet"):
+        if format not in FORMATS:
+            raise ValueError(f"Format de dataset desconegut: {format} "
+                             f"(opcions: {', '.join(FORMATS)})")
+        self.format = format
+
+    def export(self, classifications: List[GlobalClassification], filepath: Path,
+               day: Optional[date] = None,
+               fetched_at: Optional[datetime] = None) -> List[Path]:
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        day = day or date.today()
+        written = []
+        for classification in classifications:
+            with stage("export.dataset", classification.category):
+                columns = classification_columns(classification, fetched_at)
+                written.append(self._write_partition(columns, filepath, classification.category,
+                                                     day, "part-0"))
+        logger.info(f"Dataset {self.format}: {len(written)} particions a {filepath}")
+        return written
+
+    def export_snapshots(self, store: SnapshotStore, filepath: Path,
+                         category: Optional[str] = None) -> List[Path]:
+        """Un sol fitxer per (categoria, data) amb tots els snapshots d'aquell dia, classificats."""
+        keys = store.list(category)  # ordenats per categoria i hora
+        written = []
+        snapshots = 0
+        for (category_name, day), day_keys in groupby(
+                keys, key=lambda k: (k.category, k.fetched_at.date())):
+            with stage("export.dataset", category_name):
+                parts = []
+                for key in day_keys:
+                    classified = Classifier().classify([store.load(key)])[0]
+                    parts.append(classification_columns(classified, key.fetched_at))
+                columns = {name: np.concatenate([part[name] for part in parts])
+                           for name in CLASSIFICATION_COLUMNS}
+                written.append(self._write_partition(columns, filepath, category_name, day,
+                                                     "part-0"))
+            snapshots += len(parts)
+        logger.info(f"Dataset {self.format}: {snapshots} snapshots exportats a {filepath} "
+                    f"({len(written)} particions)")
+        return written
+
+    def _write_partition(self, columns: Dict[str, np.ndarray], filepath: Path,
+                         category: str, day: date, part: str) -> Path:
+        directory = Path(filepath) / f"category={self._slug(category)}" / f"date={day.isoformat()}"
+        path = directory / f"{part}{FORMATS[self.format]}"
+
+        with atomic_output(path) as tmp:
+            if self.format == "parquet":
+                self._write_parquet(columns, tmp)
+            else:
+                self._write_csv(columns, tmp)
+
+        logger.debug(f"Partició escrita: {path}")
+        return path
+
+    def _write_parquet(self, columns: Dict[str, np.ndarray], path: Path):
+        pa, pq = self._pyarrow()
+        table = pa.table({name: pa.array(values) for name, values in columns.items()})
+        pq.write_table(table, path)
+
+    def _write_csv(self, columns: Dict[str, np.ndarray], path: Path):
+        header = ",".join(columns)
+        text_columns = [_csv_column(values).tolist() for values in columns.values()]
+        lines = [",".join(row) for row in zip(*text_columns)]
+
+        # mtime=0 i sense el nom del temporal: el mateix contingut genera el mateix fitxer
+        with open(path, 'wb') as raw, \
+                gzip.GzipFile(filename='', fileobj=raw, mode='wb', mtime=0) as f:
+            f.write("\n".join([header] + lines).encode('utf-8') + b"\n")
+
+    def _slug(self, category: str) -> str:
+        return re.sub(r'\W+', '_', category).strip('_') or 'categoria'
+
+    def _pyarrow(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("El format Parquet necessita el paquet 'pyarrow' "
+                              "(pip install stripscraper[dataset])") from e
+        return pyarrow, pyarrow.parquet
@@ -1,27 +1,189 @@
 """Excel Exporter - Exporta classificacions a Excel."""
 
-from datetime import datetime
-from typing import List
+import re
+import shutil
+import zipfile
+from datetime import date, datetime, time
 from pathlib import Path
+from typing import List, Optional
 
 from loguru import logger
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.writer.excel import ExcelWriter
 
-from stripscraper.models import GlobalClassification
+from stripscraper.exporters.files import atomic_output, dated_file, output_file
+from stripscraper.instrumentation import stage
+from stripscraper.models import GlobalClassification, TeamWithContext
+
+HEADERS = [
+    'Posició Global',
+    'Equip',
+    'Ponderat',
+    'Punts',
+    'Grup',
+    'Nou Grup',
+    'Posició Grup',
+    'Partits',
+    'Victòries',
+    'Derrotes',
+    'Sets Favor',
+    'Sets Contra',
+    'Dif Sets',
+    'Punts Favor',
+    'Punts Contra',
+    'Dif Punts'
+]
+
+COLUMN_WIDTH = 15
+
+HEADER_FONT = Font(bold=True)
+HEADER_FILL = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+HEADER_ALIGNMENT = Alignment(horizontal='center')
+
+# Excel limita el nom de la fulla a 31 caràcters i no hi admet []:*?/\
+MAX_SHEET_TITLE = 31
+_INVALID_SHEET_CHARS = re.compile(r'[\[\]:*?/\\]')
+
+class _FixedDateZipFile(zipfile.ZipFile):
+    """ZipFile que dona la mateixa data i permisos a totes les entrades que s'hi escriuen."""
+
+    def __init__(self, *args, date_time: tuple, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._date_time = date_time
+
+    def _entry(self, name: str, compress_type: Optional[int]) -> zipfile.ZipInfo:
+        entry = zipfile.ZipInfo(name, date_time=self._date_time)
+        entry.compress_type = self.compression if compress_type is None else compress_type
+        entry.external_attr = 0o600 << 16
+        return entry
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        if not isinstance(zinfo_or_arcname, zipfile.ZipInfo):
+            zinfo_or_arcname = self._entry(zinfo_or_arcname, compress_type)
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+    def write(self, filename, arcname=None, compress_type=None, compresslevel=None):
+        # Els fulls write-only arriben com a fitxers temporals: sense la seva mtime
+        entry = self._entry(arcname or str(filename), compress_type)
+        with open(filename, 'rb') as source, self.open(entry, 'w') as target:
+            shutil.copyfileobj(source, target, 1024 * 64)
+
+
+def save_workbook(wb: Workbook, path: Path, day: Optional[date] = None):
+    """Desa el llibre amb dates fixes (les del dia d'exportació, a mitjanit).
+
+    openpyxl hi posa l'hora actual a docProps/core.xml i a cada entrada del zip; així el
+    mateix contingut genera sempre els mateixos bytes, com el PDF amb ``invariant=True``.
+    """
+    stamp = datetime.combine(day or date.today(), time.min)
+    if wb.write_only and not wb.worksheets:
+        wb.create_sheet()
+    # Workbook.save() sobreescriu ``modified`` amb l'hora actual: s'escriu amb ExcelWriter
+    wb.properties.created = stamp
+    wb.properties.modified = stamp
+
+    with _FixedDateZipFile(path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True,
+                           date_time=stamp.timetuple()[:6]) as archive:
+        ExcelWriter(wb, archive).save()
+
+
+def team_row(position: int, team: TeamWithContext) -> list:
+    return [
+        position,
+        team.stats.name,
+        int(team.stats.points_percentage),
+        team.stats.total_points,
+        team.group,
+        int(team.stats.new_group),
+        team.stats.position,
+        team.stats.matches_played,
+        team.stats.matches_won,
+        team.stats.matches_lost,
+        team.stats.sets_for,
+        team.stats.sets_against,
+        team.stats.sets_difference,
+        team.stats.points_for,
+        team.stats.points_against,
+        team.stats.points_difference,
+    ]
 
 
 class ExcelExporter:
 
+    def __init__(self, write_only: bool = False):
+        self.write_only = write_only
+
     def export(self, classifications: List[GlobalClassification], filepath: Path):
         for classification in classifications:
-            self._export_classification(classification, filepath)
+            with stage("export.excel", classification.category):
+                if self.write_only:
+                    excel_file = output_file(classification, filepath, "xlsx")
+                    logger.info(f"Exporting {excel_file}")
+                    self._stream_workbook([classification], excel_file, ["Classificació"])
+                else:
+                    self._export_classification(classification, filepath)
+
+    def export_workbook(self,
+                        classifications: List[GlobalClassification],
+                        filepath: Path,
+                        name: str = "classificacions",
+                        sheet_titles: Optional[List[str]] = None) -> Path:
+        if sheet_titles is None:
+            sheet_titles = [c.category for c in classifications]
+        if len(sheet_titles) != len(classifications):
+            raise ValueError(f"Calen {len(classifications)} noms de fulla, "
+                             f"se n'han donat {len(sheet_titles)}")
+
+        excel_file = dated_file(filepath, name, "xlsx")
+        logger.info(f"Exporting {excel_file} ({len(classifications)} fulles)")
+        self._stream_workbook(classifications, excel_file, sheet_titles)
+        return excel_file
+
+    def _stream_workbook(self, classifications: List[GlobalClassification],
+                         excel_file: Path, sheet_titles: List[str]):
+        wb = Workbook(write_only=True)
+
+        header_style = NamedStyle(name='Capçalera', font=HEADER_FONT, fill=HEADER_FILL,
+                                  alignment=HEADER_ALIGNMENT)
+        wb.add_named_style(header_style)
+
+        used_titles = set()
+        for classification, title in zip(classifications, sheet_titles):
+            ws = wb.create_sheet(self._sheet_title(title, used_titles))
+
+            # En mode write-only les amplades s'han de fixar abans d'escriure cap fila
+            for col in range(1, len(HEADERS) + 1):
+                ws.column_dimensions[get_column_letter(col)].width = COLUMN_WIDTH
+
+            header = []
+            for value in HEADERS:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.style = header_style.name
+                header.append(cell)
+            ws.append(header)
+
+            for i, team in enumerate(classification.teams, start=1):
+                ws.append(team_row(i, team))
+
+        with atomic_output(excel_file) as tmp:
+            save_workbook(wb, tmp)
+
+    def _sheet_title(self, title: str, used: set) -> str:
+        base = _INVALID_SHEET_CHARS.sub('_', title).strip("'")[:MAX_SHEET_TITLE] or "Fulla"
+        candidate = base
+        n = 2
+        while candidate.lower() in used:
+            suffix = f" ({n})"
+            candidate = base[:MAX_SHEET_TITLE - len(suffix)] + suffix
+            n += 1
+        used.add(candidate.lower())
+        return candidate
 
     def _export_classification(self, classification: GlobalClassification, filepath: Path):
-        file_name = f"{classification.category}-{datetime.today().strftime('%Y-%m-%d')}.xlsx"
-        excel_file = Path(filepath / file_name)
-        excel_file.unlink(missing_ok=True)
-        excel_file.parent.mkdir(parents=True, exist_ok=True)
+        excel_file = output_file(classification, filepath, "xlsx")
 
         logger.info(f"Exporting {excel_file}")
 
@@ -29,50 +191,17 @@ class ExcelExporter:
         ws = wb.active
         ws.title = "Classificació"
 
-        headers = [
-            'Posició Global',
-            'Equip',
-            'Ponderat',
-            'Punts',
-            'Grup',
-            'Nou Grup',
-            'Posició Grup',
-            'Partits',
-            'Victòries',
-            'Derrotes',
-            'Sets Favor',
-            'Sets Contra',
-            'Dif Sets',
-            'Punts Favor',
-            'Punts Contra',
-            'Dif Punts'
-        ]
-
-        for col, header in enumerate(headers, start=1):
+        for col, header in enumerate(HEADERS, start=1):
             cell = ws.cell(row=1, column=col, value=header)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-            cell.alignment = Alignment(horizontal='center')
-
-        for i, team in enumerate(classification.teams, start=2):
-            ws.cell(row=i, column=1, value=i-1)
-            ws.cell(row=i, column=2, value=team.stats.name)
-            ws.cell(row=i, column=3, value=int(team.stats.points_percentage))
-            ws.cell(row=i, column=4, value=team.stats.total_points)
-            ws.cell(row=i, column=5, value=team.group)
-            ws.cell(row=i, column=6, value=int(team.stats.new_group))
-            ws.cell(row=i, column=7, value=team.stats.position)
-            ws.cell(row=i, column=8, value=team.stats.matches_played)
-            ws.cell(row=i, column=9, value=team.stats.matches_won)
-            ws.cell(row=i, column=10, value=team.stats.matches_lost)
-            ws.cell(row=i, column=11, value=team.stats.sets_for)
-            ws.cell(row=i, column=12, value=team.stats.sets_against)
-            ws.cell(row=i, column=13, value=team.stats.sets_difference)
-            ws.cell(row=i, column=14, value=team.stats.points_for)
-            ws.cell(row=i, column=15, value=team.stats.points_against)
-            ws.cell(row=i, column=16, value=team.stats.points_difference)
-
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[chr(64 + col)].width = 15
-
-        wb.save(excel_file)
\ No newline at end of file
+            cell.font = HEADER_FONT
+            cell.fill = HEADER_FILL
+            cell.alignment = HEADER_ALIGNMENT
+
+        for i, team in enumerate(classification.teams, start=1):
+            ws.append(team_row(i, team))
+
+        for col in range(1, len(HEADERS) + 1):
+            ws.column_dimensions[get_column_letter(col)].width = COLUMN_WIDTH
+
+        with atomic_output(excel_file) as tmp:
+            save_workbook(wb, tmp)
@@ -0,0 +1,31 @@
+"""Utilitats compartides pels exporters: nom del fitxer de sortida i escriptura atòmica."""
+
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from stripscraper.models import GlobalClassification
+
+
+def output_file(classification: GlobalClassification, filepath: Path, extension: str) -> Path:
+    return dated_file(filepath, classification.category, extension)
+
+
+def dated_file(filepath: Path, name: str, extension: str) -> Path:
+    file_name = f"{name}-{datetime.today().strftime('%Y-%m-%d')}.{extension}"
+    return Path(filepath / file_name)
+
+
+@contextmanager
+def atomic_output(path: Path) -> Iterator[Path]:
+    """Retorna un fitxer temporal al mateix directori que substitueix ``path`` en acabar bé."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.stem}.{os.getpid()}-{threading.get_ident()}.tmp{path.suffix}")
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
@@ -1,92 +1,143 @@
 """PDF Exporter - Exporta classificacions a PDF."""
 
-from datetime import datetime
+from functools import lru_cache
 from typing import List
 from pathlib import Path
 
 from loguru import logger
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.styles import StyleSheet1, getSampleStyleSheet
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import (PageBreak, SimpleDocTemplate, Table, TableStyle, Paragraph,
+                                Spacer)
 
+from stripscraper.exporters.files import atomic_output, dated_file, output_file
+from stripscraper.instrumentation import stage
 from stripscraper.models import GlobalClassification
 
+HEADERS = [
+    'Pos',
+    'Equip',
+    'Pond',
+    'Punts',
+    'Grup',
+    'Nou Grup',
+    'Pos Grup',
+    'Part',
+    'Vict',
+    'Derr',
+    'Sets+',
+    'Sets-',
+    'Dif Sets',
+    'Punts+',
+    'Punts-',
+    'Dif Punts'
+]
+
+HEADER_FONT = ('Helvetica-Bold', 10)
+BODY_FONT = ('Helvetica', 8)
+CELL_PADDING = 12  # LEFTPADDING + RIGHTPADDING per defecte de Table
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), HEADER_FONT[0]),
+    ('FONTSIZE', (0, 0), (-1, 0), HEADER_FONT[1]),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), BODY_FONT[1]),
+])
+
+
+@lru_cache(maxsize=1)
+def _styles() -> StyleSheet1:
+    return getSampleStyleSheet()
+
+
+def classification_rows(classification: GlobalClassification) -> List[List[str]]:
+    return [[
+        str(i),
+        team.stats.name,
+        f"{team.stats.points_percentage:.2f}",
+        str(team.stats.total_points),
+        team.group,
+        str(team.stats.new_group),
+        str(team.stats.position),
+        str(team.stats.matches_played),
+        str(team.stats.matches_won),
+        str(team.stats.matches_lost),
+        str(team.stats.sets_for),
+        str(team.stats.sets_against),
+        str(team.stats.sets_difference),
+        str(team.stats.points_for),
+        str(team.stats.points_against),
+        str(team.stats.points_difference)
+    ] for i, team in enumerate(classification.teams, start=1)]
+
+
+def column_widths(rows: List[List[str]]) -> List[float]:
+    # Les mateixes amplades que calcularia Table, però un sol cop: així les parts d'una
+    # taula partida entre pàgines (i totes les taules d'un document) no es tornen a mesurar
+    widths = [stringWidth(header, *HEADER_FONT) for header in HEADERS]
+    for row in rows:
+        for col, value in enumerate(row):
+            width = stringWidth(value, *BODY_FONT)
+            if width > widths[col]:
+                widths[col] = width
+    return [width + CELL_PADDING for width in widths]
+
 
 class PDFExporter:
 
     def export(self, classifications: List[GlobalClassification], filepath: Path):
         for classification in classifications:
-            self._export_classification(classification, filepath)
+            with stage("export.pdf", classification.category):
+                self._export_classification(classification, filepath)
+
+    def export_document(self, classifications: List[GlobalClassification], filepath: Path,
+                        name: str = "classificacions") -> Path:
+        pdf_file = dated_file(filepath, name, "pdf")
+
+        logger.info(f"Exporting {pdf_file} ({len(classifications)} classificacions)")
+
+        tables = [classification_rows(c) for c in classifications]
+        widths = column_widths([row for rows in tables for row in rows])
+
+        story = []
+        for classification, rows in zip(classifications, tables):
+            if story:
+                story.append(PageBreak())
+            story.extend(self._flowables(classification, rows, widths))
+
+        with atomic_output(pdf_file) as tmp:
+            self._document(str(tmp)).build(story)
+        return pdf_file
 
     def _export_classification(self, classification: GlobalClassification, filepath: Path):
-        file_name = f"{classification.category}-{datetime.today().strftime('%Y-%m-%d')}.pdf"
-        pdf_file = Path(filepath / file_name)
-        pdf_file.unlink(missing_ok=True)
-        pdf_file.parent.mkdir(parents=True, exist_ok=True)
+        pdf_file = output_file(classification, filepath, "pdf")
 
         logger.info(f"Exporting {pdf_file}")
 
-        doc = SimpleDocTemplate(str(pdf_file), pagesize=landscape(A4))
-        styles = getSampleStyleSheet()
-        story = []
+        rows = classification_rows(classification)
+        story = self._flowables(classification, rows, column_widths(rows))
+
+        with atomic_output(pdf_file) as tmp:
+            self._document(str(tmp)).build(story)
+
+    def _document(self, target: str) -> SimpleDocTemplate:
+        # invariant: sense data ni ID aleatori, el mateix contingut dona el mateix PDF
+        return SimpleDocTemplate(target, pagesize=landscape(A4), invariant=True)
+
+    def _flowables(self, classification: GlobalClassification, rows: List[List[str]],
+                   widths: List[float]) -> list:
+        title = Paragraph(f"<b>{classification.category}</b>", _styles()['Title'])
+
+        # repeatRows=1: si la taula no hi cap en una pàgina, cada part repeteix la capçalera
+        table = Table([HEADERS] + rows, colWidths=widths, repeatRows=1)
+        table.setStyle(TABLE_STYLE)
 
-        title = Paragraph(f"<b>{classification.category}</b>", styles['Title'])
-        story.append(title)
-        story.append(Spacer(1, 0.5*cm))
-
-        data = [[
-            'Pos',
-            'Equip',
-            'Pond',
-            'Punts',
-            'Grup',
-            'Nou Grup',
-            'Pos Grup',
-            'Part',
-            'Vict',
-            'Derr',
-            'Sets+',
-            'Sets-',
-            'Dif Sets',
-            'Punts+',
-            'Punts-',
-            'Dif Punts'
-        ]]
-
-        for i, team in enumerate(classification.teams, start=1):
-            data.append([
-                str(i),
-                team.stats.name,
-                f"{team.stats.points_percentage:.2f}",
-                str(team.stats.total_points),
-                team.group,
-                str(team.stats.new_group),
-                str(team.stats.position),
-                str(team.stats.matches_played),
-                str(team.stats.matches_won),
-                str(team.stats.matches_lost),
-                str(team.stats.sets_for),
-                str(team.stats.sets_against),
-                str(team.stats.sets_difference),
-                str(team.stats.points_for),
-                str(team.stats.points_against),
-                str(team.stats.points_difference)
-            ])
-
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ]))
-
-        story.append(table)
-        doc.build(story)
\ No newline at end of file
+        return [title, Spacer(1, 0.5*cm), table]
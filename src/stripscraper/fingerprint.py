@@ -0,0 +1,62 @@
+"""Fingerprint - Empremta de cada classificació per saltar les divisions sense canvis."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from loguru import logger
+
+from stripscraper.models import Classification, Group
+
+
+def group_fingerprint(group: Group) -> str:
+    digest = hashlib.sha256()
+    for team in group.teams:
+        digest.update(json.dumps(team.to_dict(), sort_keys=True).encode('utf-8'))
+    return f"{group.round}:{digest.hexdigest()[:16]}"
+
+
+def classification_fingerprint(classification: Classification) -> Dict[str, str]:
+    return {group.name: group_fingerprint(group) for group in classification.groups}
+
+
+class FingerprintStore:
+
+    def __init__(self, path: Path = Path("outputs/.fingerprints.json")):
+        self.path = Path(path)
+        self._fingerprints: Dict[str, Dict[str, str]] = {}
+        if self.path.exists():
+            self._fingerprints = json.loads(self.path.read_text(encoding='utf-8'))
+
+    def changed(self, classification: Classification) -> bool:
+        previous = self._fingerprints.get(classification.category)
+        return previous != classification_fingerprint(classification)
+
+    def select_changed(self,
+                       classifications: List[Classification],
+                       division_of: Callable[[str], str]) -> List[Classification]:
+        by_division: Dict[str, List[Classification]] = {}
+        for classification in classifications:
+            by_division.setdefault(division_of(classification.category), []).append(classification)
+
+        selected = []
+        for division, members in by_division.items():
+            if any(self.changed(c) for c in members):
+                logger.info(f"Divisió {division}: canvis detectats, es recalcula")
+                selected.extend(members)
+            else:
+                logger.info(f"Divisió {division}: sense canvis, s'omet")
+
+        return selected
+
+    def update(self, classifications: List[Classification]):
+        for classification in classifications:
+            self._fingerprints[classification.category] = classification_fingerprint(classification)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(self._fingerprints, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp, self.path)
@@ -1,3 +1,8 @@
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
 def current_percentage(total_points: int, matches_played: int) -> float:
     return total_points / (matches_played * 3) * 100 if matches_played > 0 else 0
 
@@ -40,3 +45,133 @@ def rounding_to_7(total_points: int, group_teams: int) -> float:
     if group_teams == 7:
         return ( 7 / 6) * total_points
     raise ValueError(f"Tenim un grup amb {group_teams} equips!")
+
+
+def project_to_group_total(total_points: int, matches_played: int, group_teams: int) -> float:
+    if matches_played == 0:
+        return 0
+    total_matches_in_group = group_teams - 1
+    projected_points = (total_points / matches_played) * total_matches_in_group
+    return (projected_points / (total_matches_in_group * 3)) * 100
+
+
+def normalized_to_6(total_points: int, matches_played: int) -> float:
+    if matches_played == 0:
+        return 0
+    projected_points = (total_points / matches_played) * 6
+    return (projected_points / 18) * 100
+
+
+def weighted_by_completion(total_points: int, matches_played: int, group_teams: int) -> float:
+    if matches_played == 0:
+        return 0
+    base_percentage = (total_points / (matches_played * 3)) * 100
+    completion_ratio = matches_played / (group_teams - 1)
+    return base_percentage * (0.7 + 0.3 * completion_ratio)
+
+
+# Versions vectoritzades: reben arrays (o escalars) i retornen np.ndarray de float64.
+# Les files amb 0 partits (o grups de mida invàlida) valen 0, sense branques Python.
+
+def _divide(numerator, denominator) -> np.ndarray:
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    numerator, denominator = np.broadcast_arrays(numerator, denominator)
+    out = np.zeros(numerator.shape, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def current_percentage_batch(total_points, matches_played) -> np.ndarray:
+    return _divide(total_points, np.asarray(matches_played) * 3) * 100
+
+
+def normalized_to_7_batch(total_points, matches_played) -> np.ndarray:
+    projected_points = _divide(total_points, matches_played) * 7
+    return (projected_points / 21) * 100
+
+
+def normalized_to_6_batch(total_points, matches_played) -> np.ndarray:
+    projected_points = _divide(total_points, matches_played) * 6
+    return (projected_points / 18) * 100
+
+
+def normalized_with_penalty_batch(total_points, matches_played) -> np.ndarray:
+    projected_points = _divide(total_points, matches_played) * 7
+    confidence = np.asarray(matches_played) / 7
+    adjusted_points = projected_points * (0.7 + 0.3 * confidence)
+    return (adjusted_points / 21) * 100
+
+
+def weighted_difficulty_batch(total_points, matches_played) -> np.ndarray:
+    difficulty_multiplier = 1.0 + (np.asarray(matches_played) - 6) * 0.05
+    weighted_points = np.asarray(total_points) * difficulty_multiplier
+    normalized_points = _divide(weighted_points, matches_played) * 7
+    return (normalized_points / 21) * 100
+
+
+def rounding_to_8_batch(total_points, group_teams) -> np.ndarray:
+    return _divide(8, group_teams) * np.asarray(total_points)
+
+
+def rounding_to_7_batch(total_points, group_teams) -> np.ndarray:
+    return _divide(7, np.asarray(group_teams) - 1) * np.asarray(total_points)
+
+
+def project_to_group_total_batch(total_points, matches_played, group_teams) -> np.ndarray:
+    total_matches_in_group = np.asarray(group_teams) - 1
+    projected_points = _divide(total_points, matches_played) * total_matches_in_group
+    return _divide(projected_points, total_matches_in_group * 3) * 100
+
+
+def weighted_by_completion_batch(total_points, matches_played, group_teams) -> np.ndarray:
+    base_percentage = current_percentage_batch(total_points, matches_played)
+    completion_ratio = _divide(matches_played, np.asarray(group_teams) - 1)
+    return base_percentage * (0.7 + 0.3 * completion_ratio)
+
+
+BatchFormula = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+FORMULAS: Dict[str, BatchFormula] = {}
+
+
+def register(name: str, batch: Optional[BatchFormula] = None):
+    """Registra una fórmula vectoritzada amb signatura (punts, partits, equips_grup).
+
+    Es pot fer servir directament o com a decorador: ``@register("nom")``.
+    """
+    def decorator(fn: BatchFormula) -> BatchFormula:
+        FORMULAS[name] = fn
+        return fn
+
+    return decorator(batch) if batch is not None else decorator
+
+
+def get_formula(name: str) -> BatchFormula:
+    try:
+        return FORMULAS[name]
+    except KeyError:
+        raise ValueError(f"Fórmula desconeguda: {name} "
+                         f"(disponibles: {', '.join(sorted(FORMULAS))})") from None
+
+
+def evaluate(name: str, total_points, matches_played, group_teams) -> np.ndarray:
+    return get_formula(name)(total_points, matches_played, group_teams)
+
+
+register("current_percentage",
+         lambda points, played, teams: current_percentage_batch(points, played))
+register("normalized_to_7",
+         lambda points, played, teams: normalized_to_7_batch(points, played))
+register("normalized_to_6",
+         lambda points, played, teams: normalized_to_6_batch(points, played))
+register("normalized_with_penalty",
+         lambda points, played, teams: normalized_with_penalty_batch(points, played))
+register("weighted_difficulty",
+         lambda points, played, teams: weighted_difficulty_batch(points, played))
+register("rounding_to_8",
+         lambda points, played, teams: rounding_to_8_batch(points, teams))
+register("rounding_to_7",
+         lambda points, played, teams: rounding_to_7_batch(points, teams))
+register("project_to_group_total", project_to_group_total_batch)
+register("weighted_by_completion", weighted_by_completion_batch)
@@ -0,0 +1,328 @@
+"""Instrumentation - Temps de paret, temps de CPU i pic de memòria per etapa del pipeline.
+
+Desactivada per defecte: ``stage()`` retorna un context buit compartit i el cost és
+una crida i una comprovació. S'activa amb ``configure(enabled=True)`` (``--report`` o
+``--metrics`` a la línia d'ordres).
+
+    with stage("parse", url):
+        ...
+
+    @timed("classify")
+    def classify(...):
+        ...
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Callable, ContextManager, Deque, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+METRIC_PREFIX = "stripscraper"
+
+# Registres que es conserven: en mode --watch el procés no acaba i no han de créixer sense
+# límit. El resum i les mètriques es calculen sobre els registres conservats.
+MAX_RECORDS = 10_000
+
+_DISABLED = nullcontext()
+
+
+@dataclass
+class StageRecord:
+    stage: str
+    label: str
+    started_at: str
+    wall_seconds: float
+    cpu_seconds: Optional[float]
+    peak_bytes: Optional[int]
+    error: Optional[str] = None
+
+
+class _MemoryFrame:
+    __slots__ = ("start", "peak")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.peak = start
+
+
+class _Stage:
+
+    def __init__(self, instrumentation: "Instrumentation", name: str, label: str, memory: bool):
+        self._instrumentation = instrumentation
+        self._name = name
+        self._label = label
+        # El pic de tracemalloc és un de sol pel procés: només es reinicia des del fil principal
+        self._memory = memory and instrumentation.memory \
+            and threading.current_thread() is threading.main_thread()
+        self._frame: Optional[_MemoryFrame] = None
+
+    def __enter__(self) -> "_Stage":
+        if self._memory:
+            self._frame = self._instrumentation._push_memory()
+        self._started_at = datetime.now(timezone.utc).isoformat()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        peak = self._instrumentation._pop_memory(self._frame) if self._frame else None
+
+        self._instrumentation._add(StageRecord(
+            stage=self._name,
+            label=self._label,
+            started_at=self._started_at,
+            wall_seconds=wall,
+            cpu_seconds=cpu,
+            peak_bytes=peak,
+            error=exc_type.__name__ if exc_type else None
+        ))
+        return False
+
+
+class Instrumentation:
+
+    def __init__(self, enabled: bool = False, memory: bool = True,
+                 max_records: Optional[int] = MAX_RECORDS):
+        self.enabled = enabled
+        self.memory = memory
+        self.max_records = max_records
+        self.records: Deque[StageRecord] = deque(maxlen=max_records)
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._memory_stack: List[_MemoryFrame] = []
+        self._local = threading.local()
+        self._started_tracemalloc = False
+        self._started_at = datetime.now(timezone.utc).isoformat()
+        self._wall = time.perf_counter()
+
+    def stage(self, name: str, label: str = "", memory: bool = True) -> ContextManager:
+        """Mesura el bloc com a etapa ``name`` (``label``: URL, categoria...).
+
+        El temps de CPU i el pic de tracemalloc són del procés sencer: ``memory=False`` per
+        blocs que s'intercalen amb altres (corrutines), i ``suppressed()`` per blocs que
+        s'executen alhora en diversos fils.
+        """
+        if not self.enabled or self.is_suppressed():
+            return _DISABLED
+        return _Stage(self, name, label, memory)
+
+    @contextmanager
+    def suppressed(self) -> Iterator[None]:
+        """Desactiva les etapes dins del bloc, només en aquest fil.
+
+        Per feina que corre en paral·lel (jobs d'un pool): les seves etapes es barrejarien
+        amb les dels altres fils, així que qui la reparteix la registra amb ``record()``.
+        """
+        previous = self.is_suppressed()
+        self._local.suppressed = True
+        try:
+            yield
+        finally:
+            self._local.suppressed = previous
+
+    def is_suppressed(self) -> bool:
+        return getattr(self._local, 'suppressed', False)
+
+    def timed(self, name: str, memory: bool = True) -> Callable:
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self.is_suppressed():
+                    return func(*args, **kwargs)
+                with _Stage(self, name, "", memory):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, label: str, wall_seconds: float,
+               cpu_seconds: Optional[float] = None):
+        """Afegeix una etapa mesurada fora d'aquest procés (p. ex. en un ProcessPoolExecutor)."""
+        if not self.enabled:
+            return
+        self._add(StageRecord(
+            stage=name,
+            label=label,
+            started_at=datetime.now(timezone.utc).isoformat(),
+            wall_seconds=wall_seconds,
+            cpu_seconds=cpu_seconds,
+            peak_bytes=None
+        ))
+
+    def reset(self):
+        with self._lock:
+            self.records = deque(maxlen=self.max_records)
+            self.dropped = 0
+        self._started_at = datetime.now(timezone.utc).isoformat()
+        self._wall = time.perf_counter()
+
+    def close(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def snapshot(self) -> List[StageRecord]:
+        with self._lock:
+            return list(self.records)
+
+    def summary(self) -> Dict[str, dict]:
+        stages: Dict[str, dict] = {}
+        for record in self.snapshot():
+            entry = stages.setdefault(record.stage, {
+                'count': 0, 'wall_seconds': 0.0, 'cpu_seconds': None, 'peak_bytes': None
+            })
+            entry['count'] += 1
+            entry['wall_seconds'] += record.wall_seconds
+            if record.cpu_seconds is not None:
+                entry['cpu_seconds'] = (entry['cpu_seconds'] or 0.0) + record.cpu_seconds
+            if record.peak_bytes is not None:
+                entry['peak_bytes'] = max(entry['peak_bytes'] or 0, record.peak_bytes)
+        return stages
+
+    def report(self) -> dict:
+        return {
+            'started_at': self._started_at,
+            'wall_seconds': time.perf_counter() - self._wall,
+            'pid': os.getpid(),
+            'memory_tracing': self.memory,
+            'records_dropped': self.dropped,
+            'stages': self.summary(),
+            'records': [asdict(r) for r in self.snapshot()],
+        }
+
+    def write_report(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2, ensure_ascii=False), encoding='utf-8')
+        logger.info(f"Informe d'execució desat a {path}")
+
+    def write_prometheus(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        # Escriptura atòmica: el node_exporter (textfile collector) no ha de llegir mig fitxer
+        tmp.write_text(self.prometheus(), encoding='utf-8')
+        os.replace(tmp, path)
+        logger.info(f"Mètriques Prometheus desades a {path}")
+
+    def prometheus(self) -> str:
+        totals: Dict[Tuple[str, str], dict] = {}
+        for record in self.snapshot():
+            entry = totals.setdefault((record.stage, record.label), {
+                'count': 0, 'wall': 0.0, 'cpu': None, 'peak': None, 'errors': 0
+            })
+            entry['count'] += 1
+            entry['wall'] += record.wall_seconds
+            if record.cpu_seconds is not None:
+                entry['cpu'] = (entry['cpu'] or 0.0) + record.cpu_seconds
+            entry['errors'] += 1 if record.error else 0
+            if record.peak_bytes is not None:
+                entry['peak'] = max(entry['peak'] or 0, record.peak_bytes)
+
+        metrics = [
+            ('stage_wall_seconds', 'Temps de paret acumulat per etapa', 'wall'),
+            ('stage_cpu_seconds', 'Temps de CPU del procés acumulat per etapa', 'cpu'),
+            ('stage_peak_memory_bytes', 'Pic de memòria Python (tracemalloc) per etapa', 'peak'),
+            ('stage_runs', "Cops que s'ha executat l'etapa", 'count'),
+            ('stage_errors', "Cops que l'etapa ha acabat amb una excepció", 'errors'),
+        ]
+
+        lines = []
+        for metric, help_text, field in metrics:
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for (stage, label), entry in sorted(totals.items()):
+                if entry[field] is None:
+                    continue
+                labels = f'stage="{_escape(stage)}",label="{_escape(label)}"'
+                lines.append(f"{name}{{{labels}}} {entry[field]}")
+
+        run = f"{METRIC_PREFIX}_run_wall_seconds"
+        lines.append(f"# HELP {run} Temps de paret de tota l'execució")
+        lines.append(f"# TYPE {run} gauge")
+        lines.append(f"{run} {time.perf_counter() - self._wall}")
+        return "\n".join(lines) + "\n"
+
+    def _add(self, record: StageRecord):
+        with self._lock:
+            # Amb el límit ple, el deque descarta el registre més antic
+            if self.records.maxlen is not None and len(self.records) == self.records.maxlen:
+                self.dropped += 1
+            self.records.append(record)
+
+    def _push_memory(self) -> _MemoryFrame:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        current, peak = tracemalloc.get_traced_memory()
+        # El pic és global: abans de reiniciar-lo, es passa a l'etapa que conté aquesta
+        if self._memory_stack:
+            parent = self._memory_stack[-1]
+            parent.peak = max(parent.peak, peak)
+        tracemalloc.reset_peak()
+
+        frame = _MemoryFrame(current)
+        self._memory_stack.append(frame)
+        return frame
+
+    def _pop_memory(self, frame: _MemoryFrame) -> int:
+        _, peak = tracemalloc.get_traced_memory()
+        frame.peak = max(frame.peak, peak)
+
+        if frame in self._memory_stack:
+            self._memory_stack.remove(frame)
+        if self._memory_stack:
+            parent = self._memory_stack[-1]
+            parent.peak = max(parent.peak, frame.peak)
+        tracemalloc.reset_peak()
+
+        return frame.peak - frame.start
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+_instrumentation = Instrumentation()
+
+
+def get() -> Instrumentation:
+    return _instrumentation
+
+
+def configure(enabled: bool = True, memory: bool = True,
+              max_records: Optional[int] = MAX_RECORDS) -> Instrumentation:
+    _instrumentation.enabled = enabled
+    _instrumentation.memory = memory
+    _instrumentation.max_records = max_records
+    _instrumentation.reset()
+    return _instrumentation
+
+
+def stage(name: str, label: str = "", memory: bool = True) -> ContextManager:
+    return _instrumentation.stage(name, label, memory)
+
+
+def timed(name: str, memory: bool = True) -> Callable:
+    return _instrumentation.timed(name, memory)
+
+
+def suppressed() -> ContextManager:
+    return _instrumentation.suppressed()
+
+
+def record(name: str, label: str, wall_seconds: float, cpu_seconds: Optional[float] = None):
+    _instrumentation.record(name, label, wall_seconds, cpu_seconds)
@@ -1,38 +1,202 @@
+import argparse
+import signal
+from datetime import datetime
 from pathlib import Path
+from typing import List, Optional
 
 from loguru import logger
 
+from stripscraper import instrumentation
+from stripscraper.archive import PageArchive
 from stripscraper.classifier import Classifier
-from stripscraper.exporters.csv import CSVExporter
-from stripscraper.exporters.excel import ExcelExporter
-from stripscraper.exporters.pdf import PDFExporter
-from stripscraper.scraper import FixedUrlsScraper as CompetitionScraper
+from stripscraper.exporters.dataset import FORMATS as DATASET_FORMATS
+from stripscraper.fingerprint import FingerprintStore
+from stripscraper.models import Classification
+from stripscraper.parser.cache import ResponseCache
 from stripscraper.strip import StripCalculator
 
+# Els scrapers, els exportadors, el dimoni i la simulació s'importen a la branca que els fa
+# servir: playwright, httpx, openpyxl i reportlab són la major part de l'arrencada del CLI
 
-def main():
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="scraper",
+        description="Calcula la classificació de la tira a partir de fcvolei.cat")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Descarrega totes les categories en paral·lel amb httpx asíncron")
+    parser.add_argument("--max-concurrency", type=int, default=4,
+                        help="Nombre màxim de descàrregues simultànies (amb --concurrent)")
+    parser.add_argument("--replay", type=Path, default=None,
+                        help="Reparseja pàgines desades (directori, .zip, .tar o --archive-dir) "
+                             "en lloc de descarregar")
+    parser.add_argument("--replay-at", type=datetime.fromisoformat, default=None,
+                        help="Amb --replay d'un arxiu de pàgines, reparseja la versió vigent "
+                             "en aquest moment (ISO 8601, UTC si no porta zona)")
+    parser.add_argument("--cache-dir", type=Path, default=None,
+                        help="Directori de la memòria cau de pàgines (desactivada si no s'indica)")
+    parser.add_argument("--cache-ttl", type=float, default=300.0,
+                        help="Segons que una pàgina en memòria cau es considera vigent "
+                             "sense revalidar")
+    parser.add_argument("--archive-dir", type=Path, default=None,
+                        help="Arxiva cada pàgina descarregada (deduplicada per contingut)")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="Només recalcula i exporta les divisions amb Cadet o Juvenil "
+                             "modificats")
+    parser.add_argument("--simulations", type=int, default=0,
+                        help="Simula N cops els partits pendents i mostra la probabilitat "
+                             "de quedar entre els 40 primers")
+    parser.add_argument("--snapshot-dir", type=Path, default=None,
+                        help="Desa les classificacions parsejades com a snapshots binaris "
+                             "en aquest directori")
+    parser.add_argument("--export-workers", type=int, default=1,
+                        help="Processos per exportar CSV/Excel/PDF en paral·lel (1 = seqüencial)")
+    parser.add_argument("--dataset", choices=list(DATASET_FORMATS), default=None,
+                        help="Afegeix la tira a outputs/dataset particionat per categoria i data")
+    parser.add_argument("--watch", action="store_true",
+                        help="Vigila les categories i recalcula les divisions amb jornada nova")
+    parser.add_argument("--watch-interval", type=float, default=900.0,
+                        help="Segons entre consultes de cada categoria en mode --watch")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Desa un informe JSON amb temps i memòria de cada etapa")
+    parser.add_argument("--metrics", type=Path, default=None,
+                        help="Desa les mètriques per etapa en format text de Prometheus")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
     logger.info("Iniciant web scraper per a fcvolei.cat")
 
-    scraper = CompetitionScraper()
-    classifications = scraper.scrape_all_categories()
+    if not (args.report or args.metrics):
+        _run(args)
+        return
+
+    instruments = instrumentation.configure(enabled=True)
+    try:
+        with instruments.stage("run"):
+            _run(args)
+    finally:
+        if args.report:
+            instruments.write_report(args.report)
+        if args.metrics:
+            instruments.write_prometheus(args.metrics)
+        instruments.close()
+
+
+def _run(args: argparse.Namespace):
 
+    cache = ResponseCache(args.cache_dir, ttl=args.cache_ttl) if args.cache_dir else None
+    archive = PageArchive(args.archive_dir) if args.archive_dir else None
+
+    if args.watch:
+        _watch(args, cache, archive)
+        return
+
+    if args.replay:
+        from stripscraper.scraper.replay import ReplayScraper
+        # La memòria cau de codificacions no s'escriu mai dins de les pàgines reparsejades
+        encodings = args.cache_dir / "replay-encodings.json" if args.cache_dir \
+            else Path("outputs") / ".replay-encodings.json"
+        scraper = ReplayScraper(args.replay, encoding_cache=encodings, at=args.replay_at)
+    elif args.concurrent:
+        from stripscraper.scraper.concurrent import AsyncUrlsScraper
+        scraper = AsyncUrlsScraper(max_concurrency=args.max_concurrency,
+                                   cache=cache, archive=archive)
+    else:
+        from stripscraper.scraper.urls import FixedUrlsScraper
+        scraper = FixedUrlsScraper(cache=cache, archive=archive)
+
+    with scraper, instrumentation.stage("scrape"):
+        parsed = scraper.scrape_all_categories()
+
+    if args.snapshot_dir:
+        from stripscraper.snapshots import SnapshotStore
+        with instrumentation.stage("snapshots"):
+            SnapshotStore(args.snapshot_dir).save_all(parsed)
+
+    export_dir = Path("outputs")
     strip = StripCalculator()
+
+    classifications = parsed
+    fingerprints = None
+    if args.only_changed:
+        fingerprints = FingerprintStore(export_dir / ".fingerprints.json")
+        classifications = fingerprints.select_changed(parsed, strip.extract_division)
+        if not classifications:
+            logger.success("Cap divisió ha canviat des de l'última execució")
+            return
+
     classifications = strip.calculate_strip_classifications(classifications)
 
+    if args.simulations > 0:
+        _log_simulations(classifications, args.simulations)
+
     classifier = Classifier()
     classifications = classifier.classify(classifications)
 
+    exporters = _exporters()
+    if args.export_workers > 1:
+        from stripscraper.exporters.pipeline import ExportPipeline
+        ExportPipeline(exporters, workers=args.export_workers).export(classifications, export_dir)
+    else:
+        for exporter in exporters:
+            exporter.export(classifications, export_dir)
+
+    if args.dataset:
+        from stripscraper.exporters.dataset import DatasetExporter
+        DatasetExporter(args.dataset).export(classifications, export_dir / "dataset")
+
+    if fingerprints:
+        fingerprints.update(parsed)
+        fingerprints.save()
+
+
+def _watch(args: argparse.Namespace, cache: Optional[ResponseCache],
+           archive: Optional[PageArchive]):
+    if args.replay:
+        raise ValueError("--watch no es pot combinar amb --replay")
+
+    from stripscraper.daemon import WatchDaemon
+    from stripscraper.scraper.urls import FixedUrlsScraper
+
     export_dir = Path("outputs")
+    on_update = None
+    if args.dataset:
+        from stripscraper.exporters.dataset import DatasetExporter
+        dataset = DatasetExporter(args.dataset)
+
+        def on_update(division: str, classified: list):
+            dataset.export(classified, export_dir / "dataset")
+
+    with FixedUrlsScraper(cache=cache, archive=archive) as scraper:
+        daemon = WatchDaemon(scraper.parser, scraper.urls,
+                             exporters=_exporters(),
+                             export_dir=export_dir,
+                             interval=args.watch_interval,
+                             on_update=on_update)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: daemon.stop())
+        daemon.run()
 
-    to_csv = CSVExporter()
-    to_csv.export(classifications, export_dir)
 
-    to_xls = ExcelExporter()
-    to_xls.export(classifications, export_dir)
+def _exporters() -> list:
+    from stripscraper.exporters.csv import CSVExporter
+    from stripscraper.exporters.excel import ExcelExporter
+    from stripscraper.exporters.pdf import PDFExporter
+    return [CSVExporter(), ExcelExporter(), PDFExporter()]
 
-    to_pdf = PDFExporter()
-    to_pdf.export(classifications, export_dir)
 
+def _log_simulations(classifications: List[Classification], simulations: int):
+    from stripscraper.simulation import MonteCarloSimulator
+    for classification in classifications:
+        with instrumentation.stage("simulate", classification.category):
+            result = MonteCarloSimulator(classification).simulate(simulations)
+        logger.info(f"Simulació {classification.category} ({simulations} simulacions):")
+        for row in result.summary():
+            logger.info(f"  {row['expected_position']:6.2f}"
+                        f"  [{row['best_position']:3d}-{row['worst_position']:3d}]"
+                        f"  top40={row['top_40'] * 100:5.1f}%  {row['name']} ({row['group']})")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TeamStats:
     position: int
     name: str
@@ -35,10 +35,17 @@ class TeamStats:
         return self.points_for - self.points_against
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {name: getattr(self, name) for name in _TEAM_FIELDS}
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "TeamStats":
+        return cls(**{name: data[name] for name in _TEAM_FIELDS})
 
-@dataclass
+
+_TEAM_FIELDS = tuple(f.name for f in fields(TeamStats))
+
+
+@dataclass(slots=True)
 class Group:
     name: str
     round: int
@@ -70,7 +77,15 @@ class Group:
             'teams': [t.to_dict() for t in self.teams]
         }
 
-@dataclass
+    @classmethod
+    def from_dict(cls, data: dict) -> "Group":
+        return cls(
+            name=data['name'],
+            round=data['round'],
+            teams=[TeamStats.from_dict(t) for t in data['teams']]
+        )
+
+@dataclass(slots=True)
 class Classification:
     competition: str
     category: str
@@ -100,7 +115,6 @@ class Classification:
 
     def to_dict(self) -> dict:
         return {
-            'url': self.url,
             'competition': self.competition,
             'category': self.category,
             'total_groups': self.total_groups,
@@ -108,8 +122,16 @@ class Classification:
             'groups': [g.to_dict() for g in self.groups]
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> "Classification":
+        return cls(
+            competition=data['competition'],
+            category=data['category'],
+            groups=[Group.from_dict(g) for g in data['groups']]
+        )
+
 
-@dataclass
+@dataclass(slots=True)
 class TeamWithContext:
     stats: TeamStats
     competition: str
@@ -117,7 +139,7 @@ class TeamWithContext:
     group: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalClassification:
     competition: str
     category: str
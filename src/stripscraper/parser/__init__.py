@@ -1,4 +1,27 @@
-from stripscraper.parser.httpx import HttpxParser
-from stripscraper.parser.playwright import PlaywrightParser
+"""Parsers de classificacions.
 
-__all__ = ["HttpxParser","PlaywrightParser"]
\ No newline at end of file
+Els backends es carreguen el primer cop que s'hi accedeix: importar playwright o httpx
+costa desenes de mil·lisegons i cada execució només en fa servir un.
+"""
+
+import importlib
+
+_LAZY = {
+    "HttpxParser": "stripscraper.parser.httpx",
+    "HybridParser": "stripscraper.parser.hybrid",
+    "PlaywrightParser": "stripscraper.parser.playwright",
+}
+
+__all__ = ["HttpxParser", "HybridParser", "PlaywrightParser"]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
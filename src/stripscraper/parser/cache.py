@@ -0,0 +1,131 @@
+"""Response cache - Guarda a disc les pàgines descarregades i les revalida amb GET condicional."""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from loguru import logger
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    fetched_at: float
+    body: str = ""
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class ResponseCache:
+
+    def __init__(self,
+                 directory: Path = Path(".cache/pages"),
+                 ttl: float = 300.0,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        meta_file, body_file = self._paths(url)
+        try:
+            meta = json.loads(meta_file.read_text(encoding='utf-8'))
+            body = body_file.read_text(encoding='utf-8')
+        except (OSError, ValueError):
+            return None
+
+        # L'mtime del cos fa de marca LRU per a l'evicció
+        os.utime(body_file)
+        return CachedResponse(body=body, **meta)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return entry.age() < self.ttl
+
+    def conditional_headers(self, entry: CachedResponse) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def put(self, url: str, body: str,
+            etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> CachedResponse:
+        content_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
+        entry = CachedResponse(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            content_hash=content_hash,
+            fetched_at=time.time(),
+            body=body
+        )
+
+        meta_file, body_file = self._paths(url)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        previous = self.get(url)
+        if previous is None or previous.content_hash != content_hash:
+            self._write_atomic(body_file, body)
+        else:
+            logger.debug(f"Contingut sense canvis per {url}")
+        self._write_atomic(meta_file, json.dumps(self._meta(entry)))
+
+        self._evict()
+        return entry
+
+    def touch(self, url: str) -> Optional[CachedResponse]:
+        entry = self.get(url)
+        if entry is None:
+            return None
+        entry.fetched_at = time.time()
+        meta_file, _ = self._paths(url)
+        self._write_atomic(meta_file, json.dumps(self._meta(entry)))
+        return entry
+
+    def discard(self, url: str):
+        for path in self._paths(url):
+            path.unlink(missing_ok=True)
+
+    def _meta(self, entry: CachedResponse) -> dict:
+        meta = asdict(entry)
+        del meta['body']
+        return meta
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.html"
+
+    def _write_atomic(self, path: Path, text: str):
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(text, encoding='utf-8')
+        os.replace(tmp, path)
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for body_file in self.directory.glob("*.html"):
+            try:
+                stat = body_file.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, body_file))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, body_file in entries:
+            if total <= self.max_bytes:
+                break
+            logger.debug(f"Evicting cached page {body_file.name}")
+            body_file.unlink(missing_ok=True)
+            body_file.with_suffix('.json').unlink(missing_ok=True)
+            total -= size
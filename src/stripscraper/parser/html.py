@@ -1,14 +1,30 @@
-from bs4 import BeautifulSoup
-from typing import List
+from typing import TYPE_CHECKING, List
 from loguru import logger
 
 from stripscraper import formula
 from stripscraper.models import Classification, Group, TeamStats
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+BACKENDS = ("bs4", "lxml")
+
 
 class HtmlParser:
+    def __init__(self, backend: str = "bs4"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend de parseig desconegut: {backend} "
+                             f"(opcions: {', '.join(BACKENDS)})")
+        self.backend = backend
+
     def parse_classification(self, html: str) -> Classification:
+        if self.backend == "lxml":
+            from stripscraper.parser.lxml import LxmlHtmlParser
+            return LxmlHtmlParser().parse_classification(html)
 
+        # bs4 només es carrega amb aquest backend; l'lxml i el parser incremental no el necessiten
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(html, 'lxml')
 
         competition = self._extract_competition(soup)
@@ -23,7 +39,7 @@ class HtmlParser:
             groups=groups
         )
 
-    def _extract_competition(self, soup: BeautifulSoup) -> str:
+    def _extract_competition(self, soup: "BeautifulSoup") -> str:
         h2 = soup.find('h2')
         if not h2:
             raise ValueError("No s'ha trobat l'element h2 amb la competició")
@@ -34,7 +50,7 @@ class HtmlParser:
 
         return text
 
-    def _extract_category(self, soup: BeautifulSoup) -> str:
+    def _extract_category(self, soup: "BeautifulSoup") -> str:
         h2 = soup.find('h2')
         if not h2:
             raise ValueError("No s'ha trobat l'element h2 amb la categoria")
@@ -45,7 +61,7 @@ class HtmlParser:
 
         return text
 
-    def _extract_groups(self, soup: BeautifulSoup) -> List[Group]:
+    def _extract_groups(self, soup: "BeautifulSoup") -> List[Group]:
         groups = []
 
         all_h4 = soup.find_all('h4')
@@ -103,58 +119,63 @@ class HtmlParser:
         team_link = cols[1].find('a')
         team_name = team_link.get_text(strip=True) if team_link else cols[1].get_text(strip=True)
 
-
         form = cols[2].get_text(strip=True)
 
-        def safe_int(text: str) -> int:
-            cleaned = text.strip().replace('%', '')
-            parts = cleaned.split()
-            if not parts:
-                raise ValueError(f"No s'ha pogut parsejar enter de: {text}")
-            return int(parts[0])
-
-        def safe_float(text: str) -> float:
-            cleaned = text.strip().replace('ptos./part.', '').replace('sets/part.', '')
-            parts = cleaned.split()
-            if len(parts) >= 2:
-                return float(parts[-2])
-            if parts:
-                return float(parts[0])
-            raise ValueError(f"No s'ha pogut parsejar float de: {text}")
-
-        total_points = safe_int(cols[3].get_text())
-        matches_played = safe_int(cols[4].get_text())
-
-        matches_won_parts = cols[5].get_text().split()
-        if not matches_won_parts:
-            raise ValueError(f"No s'ha pogut parsejar victòries de: {cols[5].get_text()}")
-
-        matches_lost_parts = cols[6].get_text().split()
-        if not matches_lost_parts:
-            raise ValueError(f"No s'ha pogut parsejar derrotes de: {cols[6].get_text()}")
-
-        points_percentage = formula.current_percentage(total_points, matches_played * 3)
-
-        return TeamStats(
-            position=safe_int(cols[0].get_text()),
-            name=team_name,
-            recent_form=form,
-            total_points=total_points,
-            points_percentage=points_percentage,
-            matches_played=matches_played,
-            matches_won=safe_int(matches_won_parts[0]),
-            win_percentage=safe_int(matches_won_parts[1]) if len(matches_won_parts) > 1 else 0,
-            matches_lost=safe_int(matches_lost_parts[0]),
-            loss_percentage=safe_int(matches_lost_parts[1]) if len(matches_lost_parts) > 1 else 0,
-            sets_for=safe_int(cols[7].get_text()),
-            sets_against=safe_int(cols[8].get_text()),
-            points_for=safe_int(cols[9].get_text()),
-            avg_points_for=safe_float(cols[9].get_text()),
-            points_against=safe_int(cols[10].get_text()),
-            avg_points_against=safe_float(cols[10].get_text()),
-            victories_3_sets=safe_int(cols[11].get_text()),
-            victories_2_sets=safe_int(cols[12].get_text()),
-            defeats_1_point=safe_int(cols[13].get_text()),
-            defeats_0_points=safe_int(cols[14].get_text()) if len(cols) > 14 else 0,
-            new_group=0
-        )
\ No newline at end of file
+        return team_from_cells(team_name, form, [col.get_text() for col in cols])
+
+
+def _safe_int(text: str) -> int:
+    cleaned = text.strip().replace('%', '')
+    parts = cleaned.split()
+    if not parts:
+        raise ValueError(f"No s'ha pogut parsejar enter de: {text}")
+    return int(parts[0])
+
+
+def _safe_float(text: str) -> float:
+    cleaned = text.strip().replace('ptos./part.', '').replace('sets/part.', '')
+    parts = cleaned.split()
+    if len(parts) >= 2:
+        return float(parts[-2])
+    if parts:
+        return float(parts[0])
+    raise ValueError(f"No s'ha pogut parsejar float de: {text}")
+
+
+def team_from_cells(team_name: str, form: str, cells: List[str]) -> TeamStats:
+    total_points = _safe_int(cells[3])
+    matches_played = _safe_int(cells[4])
+
+    matches_won_parts = cells[5].split()
+    if not matches_won_parts:
+        raise ValueError(f"No s'ha pogut parsejar victòries de: {cells[5]}")
+
+    matches_lost_parts = cells[6].split()
+    if not matches_lost_parts:
+        raise ValueError(f"No s'ha pogut parsejar derrotes de: {cells[6]}")
+
+    points_percentage = formula.current_percentage(total_points, matches_played * 3)
+
+    return TeamStats(
+        position=_safe_int(cells[0]),
+        name=team_name,
+        recent_form=form,
+        total_points=total_points,
+        points_percentage=points_percentage,
+        matches_played=matches_played,
+        matches_won=_safe_int(matches_won_parts[0]),
+        win_percentage=_safe_int(matches_won_parts[1]) if len(matches_won_parts) > 1 else 0,
+        matches_lost=_safe_int(matches_lost_parts[0]),
+        loss_percentage=_safe_int(matches_lost_parts[1]) if len(matches_lost_parts) > 1 else 0,
+        sets_for=_safe_int(cells[7]),
+        sets_against=_safe_int(cells[8]),
+        points_for=_safe_int(cells[9]),
+        avg_points_for=_safe_float(cells[9]),
+        points_against=_safe_int(cells[10]),
+        avg_points_against=_safe_float(cells[10]),
+        victories_3_sets=_safe_int(cells[11]),
+        victories_2_sets=_safe_int(cells[12]),
+        defeats_1_point=_safe_int(cells[13]),
+        defeats_0_points=_safe_int(cells[14]) if len(cells) > 14 else 0,
+        new_group=0
+    )
@@ -1,40 +1,166 @@
 """Volleyball parser with dataclasses."""
 
-from typing import List
-from loguru import logger
+import time
+from typing import Iterator, Optional
+
 import httpx
-import gzip
+from loguru import logger
 
-from stripscraper.models import TeamStats, Group, Classification
+from stripscraper.archive import PageArchive
+from stripscraper.instrumentation import stage
+from stripscraper.models import Classification, Group
+from stripscraper.parser.cache import ResponseCache
 from stripscraper.parser.html import HtmlParser
+from stripscraper.parser.stream import StreamingHtmlParser
+
+DEFAULT_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'ca,es;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0'
+}
+
+RETRY_STATUS_CODES = {500, 502, 503, 504}
 
 
 class HttpxParser:
 
-    def __init__(self):
+    def __init__(self,
+                 http2: bool = False,
+                 max_connections: int = 10,
+                 max_keepalive_connections: int = 5,
+                 keepalive_expiry: float = 30.0,
+                 timeout: float = 30.0,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 cache: Optional[ResponseCache] = None,
+                 archive: Optional[PageArchive] = None):
         logger.info("Initializing ClassificationParser")
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'ca,es;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
+        self.headers = dict(DEFAULT_HEADERS)
+        if http2:
+            # Capçalera prohibida en HTTP/2: la connexió ja és persistent
+            self.headers.pop('Connection', None)
+
+        self.retries = retries
+        self.backoff = backoff
+        self.cache = cache
+        self.archive = archive
+        self.client = httpx.Client(
+            headers=self.headers,
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            timeout=timeout,
+            follow_redirects=True
+        )
 
     def parse_classification(self, url: str) -> Classification:
+        with stage("download", url):
+            html = self.download(url)
+
+        with stage("parse", url):
+            parser = HtmlParser()
+            return parser.parse_classification(html)
+
+    def stream_classification(self, url: str) -> Classification:
+        parser = StreamingHtmlParser()
+        groups = list(self._stream_groups(url, parser))
+        return Classification(competition=parser.competition, category=parser.category,
+                              groups=groups)
+
+    def iter_groups(self, url: str) -> Iterator[Group]:
+        yield from self._stream_groups(url, StreamingHtmlParser())
+
+    def _stream_groups(self, url: str, parser: StreamingHtmlParser) -> Iterator[Group]:
+        if self.cache is not None:
+            # La memòria cau desa pàgines senceres: es parseja el cos que torna download()
+            yield from parser.iter_groups([self.download(url)])
+            return
+
+        logger.info("Streaming " + url)
+
+        # Els reintents només cobreixen la connexió i l'estat, abans de llegir el cos
+        response = self._get(url, stream=True)
+        try:
+            parser.encoding = response.charset_encoding
+            if self.archive is None:
+                yield from parser.iter_groups(response.iter_bytes())
+                return
+
+            with self.archive.writer(url) as sink:
+                yield from parser.iter_groups(sink.tee(response.iter_bytes()))
+        finally:
+            response.close()
+
+    def download(self, url: str) -> str:
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            logger.info(f"Using cached page for {url} ({int(cached.age())}s old)")
+            return cached.body
+
         logger.info("Downloading " + url)
 
-        response = httpx.get(url, headers=self.headers, timeout=30.0, follow_redirects=True)
-        response.raise_for_status()
-        html = response.text
+        headers = self.cache.conditional_headers(cached) if cached else None
+        response = self._get(url, headers=headers)
+
+        if response.status_code == 304 and cached:
+            logger.success("Page not modified, using cached copy")
+            self.cache.touch(url)
+            return cached.body
 
+        html = response.text
         logger.success("Page downloaded (" + str(len(html)) + " bytes)")
 
-        parser = HtmlParser()
-        return parser.parse_classification(html)
\ No newline at end of file
+        if self.archive:
+            self.archive.store(url, response.content)
+
+        if self.cache:
+            self.cache.put(url, html,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+        return html
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self) -> "HttpxParser":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get(self, url: str, headers: Optional[dict] = None,
+             stream: bool = False) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                request = self.client.build_request("GET", url, headers=headers)
+                response = self.client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= self.retries:
+                    raise
+                logger.warning(f"Error de xarxa a {url} ({e!r}), "
+                               f"reintent {attempt + 1}/{self.retries}")
+            else:
+                if response.status_code == 304:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.retries:
+                    if response.is_error:
+                        response.close()
+                    response.raise_for_status()
+                    return response
+                response.close()
+                logger.warning(f"HTTP {response.status_code} a {url}, "
+                               f"reintent {attempt + 1}/{self.retries}")
+
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
@@ -0,0 +1,144 @@
+"""Hybrid parser - Descarrega amb httpx i només obre Chromium si la pàgina no és completa."""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+from loguru import logger
+
+from stripscraper.archive import PageArchive
+from stripscraper.instrumentation import stage
+from stripscraper.models import Classification
+from stripscraper.parser.cache import ResponseCache
+from stripscraper.parser.httpx import HttpxParser
+from stripscraper.parser.lxml import LxmlHtmlParser, has_classification, parse_document
+
+HTTP = "http"
+BROWSER = "browser"
+
+# Segons que es manté la decisió de fer servir el navegador abans de tornar a provar httpx
+DEFAULT_RECHECK = 24 * 3600.0
+
+INCOMPLETE = "la resposta HTTP no conté la classificació"
+
+
+@dataclass
+class FetchDecision:
+    method: str
+    decided_at: float
+    reason: str = ""
+
+
+class HybridParser:
+    """Prova primer una petició HTTP i recorre a Playwright quan la resposta no és vàlida.
+
+    La decisió es recorda per URL a ``decisions_file`` (per defecte només en memòria): les
+    pàgines que necessiten el navegador no tornen a passar per httpx fins al cap de
+    ``recheck_after`` segons.
+    Playwright i Chromium només es carreguen el primer cop que alguna pàgina ho necessita.
+    """
+
+    def __init__(self,
+                 cache: Optional[ResponseCache] = None,
+                 archive: Optional[PageArchive] = None,
+                 decisions_file: Optional[Path] = None,
+                 recheck_after: float = DEFAULT_RECHECK,
+                 http: Optional[HttpxParser] = None,
+                 browser=None):
+        self.cache = cache
+        self.archive = archive
+        self.decisions_file = Path(decisions_file) if decisions_file else None
+        self.recheck_after = recheck_after
+        self.http = http if http is not None else HttpxParser(cache=cache, archive=archive)
+        self._browser = browser
+        self.decisions: Dict[str, FetchDecision] = self._load_decisions()
+
+    @property
+    def browser(self):
+        if self._browser is None:
+            from stripscraper.parser.playwright import PlaywrightParser
+            self._browser = PlaywrightParser(cache=self.cache, archive=self.archive)
+        return self._browser
+
+    def parse_classification(self, url: str) -> Classification:
+        if self._needs_browser(url):
+            logger.info(f"{url}: es fa servir el navegador (decisió desada)")
+            return self.browser.parse_classification(url)
+
+        try:
+            with stage("download", url):
+                html = self.http.download(url)
+        except httpx.HTTPStatusError as e:
+            return self._fall_back(url, f"HTTP {e.response.status_code}")
+        except httpx.TransportError as e:
+            return self._fall_back(url, f"error de xarxa ({e!r})")
+
+        # L'arbre que valida la pàgina és el mateix que es parseja
+        try:
+            root = parse_document(html)
+        except ValueError:
+            return self._fall_back(url, INCOMPLETE)
+        if not has_classification(root):
+            return self._fall_back(url, INCOMPLETE)
+
+        self._decide(url, HTTP)
+        with stage("parse", url):
+            return LxmlHtmlParser().parse_tree(root)
+
+    def close(self):
+        self.http.close()
+        if self._browser is not None:
+            self._browser.close()
+
+    def __enter__(self) -> "HybridParser":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _fall_back(self, url: str, reason: str) -> Classification:
+        logger.warning(f"{url}: {reason}, es torna a provar amb Playwright")
+        if self.cache:
+            # Si no, Playwright trobaria la mateixa pàgina incompleta a la memòria cau
+            self.cache.discard(url)
+
+        classification = self.browser.parse_classification(url)
+        self._decide(url, BROWSER, reason)
+        return classification
+
+    def _needs_browser(self, url: str) -> bool:
+        decision = self.decisions.get(url)
+        if decision is None or decision.method != BROWSER:
+            return False
+        return time.time() - decision.decided_at < self.recheck_after
+
+    def _decide(self, url: str, method: str, reason: str = ""):
+        previous = self.decisions.get(url)
+        # Les pàgines servides per HTTP es validen cada cop: no cal reescriure el fitxer
+        if method == HTTP and previous is not None and previous.method == HTTP:
+            return
+        self.decisions[url] = FetchDecision(method=method, decided_at=time.time(), reason=reason)
+        self._save_decisions()
+
+    def _load_decisions(self) -> Dict[str, FetchDecision]:
+        if self.decisions_file is None or not self.decisions_file.exists():
+            return {}
+        try:
+            data = json.loads(self.decisions_file.read_text(encoding='utf-8'))
+            return {url: FetchDecision(**decision) for url, decision in data.items()}
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"No s'han pogut llegir les decisions de {self.decisions_file}: {e}")
+            return {}
+
+    def _save_decisions(self):
+        if self.decisions_file is None:
+            return
+        self.decisions_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.decisions_file.with_name(f".{self.decisions_file.name}.{os.getpid()}.tmp")
+        data = {url: asdict(decision) for url, decision in sorted(self.decisions.items())}
+        tmp.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        os.replace(tmp, self.decisions_file)
@@ -0,0 +1,148 @@
+"""Backend lxml del parser HTML: XPath precompilats, sense arbre BeautifulSoup."""
+
+from typing import List
+
+import lxml.html
+from loguru import logger
+from lxml import etree
+
+from stripscraper.models import Classification, Group, TeamStats
+from stripscraper.parser.html import team_from_cells
+
+# Els str es passen a lxml en UTF-8; els bytes es descodifiquen amb el charset de la pàgina
+_UTF8_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_HTML_PARSER = lxml.html.HTMLParser()
+
+_FIRST_H2 = etree.XPath('(//h2)[1]')
+_ALL_H4 = etree.XPath('//h4')
+_NEXT_H4 = etree.XPath('following::h4[1]')
+_NEXT_TABLE = etree.XPath('following::table[1]')
+_ROWS = etree.XPath('.//tr')
+_CELLS = etree.XPath('.//td')
+_FIRST_LINK = etree.XPath('(.//a)[1]')
+_ROWS_WITH_CELLS = etree.XPath('.//tr[td]')
+
+
+def _text(element) -> str:
+    return ''.join(element.itertext())
+
+
+def _stripped_text(element) -> str:
+    return ''.join(s.strip() for s in element.itertext())
+
+
+def parse_document(html):
+    """Arbre lxml de la pàgina, per validar-la i parsejar-la sense tornar-la a llegir."""
+    if isinstance(html, str):
+        data, parser = html.encode('utf-8'), _UTF8_PARSER
+    else:
+        data, parser = html, _HTML_PARSER
+    try:
+        root = etree.fromstring(data, parser)
+    except (etree.ParserError, ValueError) as e:
+        raise ValueError(f"No s'ha pogut parsejar l'HTML: {e}") from e
+    if root is None:
+        raise ValueError("No s'ha trobat l'element h2 amb la competició")
+    return root
+
+
+def has_classification(root) -> bool:
+    """Comprova que l'arbre porta la classificació: el títol h2 i cada grup amb la seva taula."""
+    title = _FIRST_H2(root)
+    if not title or not _stripped_text(title[0]):
+        return False
+
+    groups = [h4 for h4 in _ALL_H4(root) if 'PRIMERA FASE - GRUP' in _stripped_text(h4)]
+    if not groups:
+        return False
+
+    for h4 in groups:
+        table = _NEXT_TABLE(h4)
+        if not table or not _ROWS_WITH_CELLS(table[0]):
+            return False
+    return True
+
+
+class LxmlHtmlParser:
+
+    def parse_classification(self, html) -> Classification:
+        return self.parse_tree(parse_document(html))
+
+    def parse_tree(self, root) -> Classification:
+        competition = self._extract_title(root, "competició")
+        category = self._extract_title(root, "categoria")
+        groups = self._extract_groups(root)
+
+        logger.success("Parsing completed: " + str(len(groups)) + " groups")
+
+        return Classification(
+            competition=competition,
+            category=category,
+            groups=groups
+        )
+
+    def _extract_title(self, root, what: str) -> str:
+        found = _FIRST_H2(root)
+        if not found:
+            raise ValueError(f"No s'ha trobat l'element h2 amb la {what}")
+
+        text = _stripped_text(found[0])
+        if 'CLASIFICACIONES' in text:
+            return text.replace('CLASIFICACIONES', '').strip()
+
+        return text
+
+    def _extract_groups(self, root) -> List[Group]:
+        groups = []
+
+        all_h4 = _ALL_H4(root)
+        logger.info(f"Trobats {len(all_h4)} elements h4")
+
+        for h4 in all_h4:
+            text = _stripped_text(h4)
+            if 'PRIMERA FASE - GRUP' in text:
+                logger.info(f"Trobat grup: {text}")
+                groups.append(self._parse_group(h4, text))
+
+        return groups
+
+    def _parse_group(self, h4_element, heading: str) -> Group:
+        group_name = heading.replace("PRIMERA FASE - ", "")
+
+        round_num = 0
+        round_h4 = _NEXT_H4(h4_element)
+        if round_h4 and 'Jornada:' in _text(round_h4[0]):
+            round_num = int(_stripped_text(round_h4[0]).replace('Jornada:', '').strip())
+
+        table = _NEXT_TABLE(h4_element)
+        if not table:
+            raise ValueError(f"No s'ha trobat taula per al grup {group_name}")
+
+        teams = self._parse_table(table[0])
+
+        if len(teams) == 0:
+            raise ValueError(f"No s'han trobat equips per al grup {group_name}")
+
+        return Group(name=group_name, round=round_num, teams=teams)
+
+    def _parse_table(self, table) -> List[TeamStats]:
+        teams = []
+
+        for row in _ROWS(table)[1:]:
+            cols = _CELLS(row)
+            if len(cols) < 14:
+                continue
+            teams.append(self._parse_team_row(cols))
+
+        return teams
+
+    def _parse_team_row(self, cols) -> TeamStats:
+        if len(cols) < 15:
+            raise ValueError(f"Fila amb menys de 14 columnes: {len(cols)}")
+
+        team_link = _FIRST_LINK(cols[1])
+        team_name = _stripped_text(team_link[0] if team_link else cols[1])
+
+        form = _stripped_text(cols[2])
+
+        return team_from_cells(team_name, form, [_text(col) for col in cols])
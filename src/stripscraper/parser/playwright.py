@@ -1,30 +1,148 @@
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
 from loguru import logger
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import Browser, BrowserContext, Page, Playwright, sync_playwright
 
+from stripscraper.archive import PageArchive
+from stripscraper.instrumentation import stage
 from stripscraper.models import Classification
+from stripscraper.parser.cache import ResponseCache
 from stripscraper.parser.html import HtmlParser
 
 
+class _PooledPage:
+
+    def __init__(self, context: BrowserContext):
+        self.context = context
+        self.page = context.new_page()
+        self.uses = 0
+
+    def close(self):
+        try:
+            self.context.close()
+        except Exception as e:
+            logger.warning(f"Error tancant context de Playwright: {e}")
+
+
+class BrowserPool:
+    """Manté un Chromium obert i reutilitza contexts/pàgines entre URLs.
+
+    El navegador s'arrenca a la primera petició i es tanca amb ``close()``
+    (o sortint del ``with``). Cada pàgina es recicla fins a ``max_uses`` cops
+    abans de tancar el seu context i crear-ne un de nou.
+    """
+
+    def __init__(self, size: int = 2, max_uses: int = 25, headless: bool = True):
+        if size < 1:
+            raise ValueError(f"La mida del pool ha de ser >= 1: {size}")
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._idle: List[_PooledPage] = []
+
+    @property
+    def started(self) -> bool:
+        return self._browser is not None
+
+    def start(self):
+        if self.started:
+            return
+        logger.info("Arrencant Chromium per al pool de Playwright")
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=self.headless)
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        self.start()
+        pooled = self._idle.pop() if self._idle else _PooledPage(self._browser.new_context())
+
+        try:
+            yield pooled.page
+        except Exception:
+            pooled.close()
+            raise
+
+        pooled.uses += 1
+        if pooled.uses >= self.max_uses or len(self._idle) >= self.size:
+            pooled.close()
+            return
+
+        try:
+            pooled.page.goto("about:blank")
+        except Exception:
+            pooled.close()
+            return
+        self._idle.append(pooled)
+
+    def close(self):
+        for pooled in self._idle:
+            pooled.close()
+        self._idle.clear()
+
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+            logger.info("Chromium aturat")
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
 class PlaywrightParser:
 
+    def __init__(self,
+                 pool: Optional[BrowserPool] = None,
+                 pool_size: int = 2,
+                 cache: Optional[ResponseCache] = None,
+                 archive: Optional[PageArchive] = None):
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else BrowserPool(size=pool_size)
+        self.cache = cache
+        self.archive = archive
+
     def parse_classification(self, url: str) -> Classification:
-        html = self._download_with_playwright(url)
+        with stage("download", url):
+            html = self._download_with_playwright(url)
 
-        parser = HtmlParser()
-        return parser.parse_classification(html)
+        with stage("parse", url):
+            parser = HtmlParser()
+            return parser.parse_classification(html)
 
+    def close(self):
+        if self._owns_pool:
+            self.pool.close()
 
+    def __enter__(self) -> "PlaywrightParser":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def _download_with_playwright(self, url: str) -> str:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        cached = self.cache.get(url) if self.cache else None
+        if cached and self.cache.is_fresh(cached):
+            logger.info(f"Using cached page for {url} ({int(cached.age())}s old)")
+            return cached.body
 
+        with self.pool.page() as page:
             logger.info(f"Loading {url} with Playwright...")
             page.goto(url, wait_until='networkidle')
 
             html = page.content()
-            browser.close()
 
-            logger.success(f"Page rendered ({len(html)} bytes)")
-            return html
\ No newline at end of file
+        logger.success(f"Page rendered ({len(html)} bytes)")
+
+        if self.cache:
+            self.cache.put(url, html)
+        if self.archive:
+            self.archive.store(url, html.encode('utf-8'))
+        return html
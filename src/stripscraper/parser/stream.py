@@ -0,0 +1,114 @@
+"""Parser incremental: llegeix l'HTML a trossos i retorna cada grup tan aviat com es completa."""
+
+from typing import Iterable, Iterator, Optional, Union
+
+from loguru import logger
+from lxml import etree
+
+from stripscraper.models import Classification, Group
+from stripscraper.parser.lxml import LxmlHtmlParser, _stripped_text, _text
+
+
+class StreamingHtmlParser(LxmlHtmlParser):
+
+    def __init__(self, encoding: Optional[str] = None):
+        self.encoding = encoding
+        self.competition: Optional[str] = None
+        self.category: Optional[str] = None
+        self._pending = None
+        self._ready: Optional[Group] = None
+
+    def parse_stream(self, chunks: Iterable[Union[bytes, str]]) -> Classification:
+        groups = list(self.iter_groups(chunks))
+
+        logger.success("Parsing completed: " + str(len(groups)) + " groups")
+
+        return Classification(
+            competition=self.competition,
+            category=self.category,
+            groups=groups
+        )
+
+    def iter_groups(self, chunks: Iterable[Union[bytes, str]]) -> Iterator[Group]:
+        parser = etree.HTMLPullParser(events=('end',), tag=('h2', 'h4', 'table'),
+                                      encoding=self.encoding)
+        # Grup pendent de taula: (nom, jornada, ja s'ha vist l'h4 següent)
+        self._pending = None
+        # Grup amb taula que espera l'h4 següent, que pot portar la jornada
+        self._ready = None
+
+        for chunk in chunks:
+            # lxml descodifica els str tal qual; els bytes, amb el charset de la pàgina
+            parser.feed(chunk)
+            yield from self._consume(parser)
+
+        parser.close()
+        yield from self._consume(parser)
+
+        if self.category is None:
+            raise ValueError("No s'ha trobat l'element h2 amb la categoria")
+        if self._pending is not None:
+            raise ValueError(f"No s'ha trobat taula per al grup {self._pending[0]}")
+        if self._ready is not None:
+            yield self._ready
+            self._ready = None
+
+    def _consume(self, parser: etree.HTMLPullParser) -> Iterator[Group]:
+        # Mateix criteri que el parser DOM: la jornada és l'h4 següent a l'h4 del grup,
+        # estigui abans o després de la taula
+        for _, element in parser.read_events():
+            tag = element.tag
+
+            if tag == 'h2':
+                if self.category is None:
+                    text = _stripped_text(element)
+                    if 'CLASIFICACIONES' in text:
+                        text = text.replace('CLASIFICACIONES', '').strip()
+                    self.competition = text
+                    self.category = text
+
+            elif tag == 'h4':
+                text = _stripped_text(element)
+                round_num = None
+                if 'Jornada:' in _text(element):
+                    round_num = int(text.replace('Jornada:', '').strip())
+
+                if self._ready is not None:
+                    group, self._ready = self._ready, None
+                    if round_num is not None:
+                        group.round = round_num
+                    yield group
+                elif self._pending is not None and not self._pending[2]:
+                    group_name, _, _ = self._pending
+                    self._pending = (group_name, round_num or 0, True)
+
+                if 'PRIMERA FASE - GRUP' in text:
+                    if self._pending is not None:
+                        # El parser DOM faria servir la mateixa taula per als dos grups
+                        raise ValueError(f"No s'ha trobat taula per al grup {self._pending[0]} "
+                                         f"abans del grup {text}")
+                    logger.info(f"Trobat grup: {text}")
+                    self._pending = (text.replace("PRIMERA FASE - ", ""), 0, False)
+
+            elif tag == 'table' and self._pending is not None:
+                group_name, round_num, seen_next = self._pending
+                self._pending = None
+
+                teams = self._parse_table(element)
+                if len(teams) == 0:
+                    raise ValueError(f"No s'han trobat equips per al grup {group_name}")
+
+                self._release(element)
+                group = Group(name=group_name, round=round_num, teams=teams)
+                if seen_next:
+                    yield group
+                else:
+                    self._ready = group
+
+    def _release(self, element):
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        while parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+            element, parent = parent, parent.getparent()
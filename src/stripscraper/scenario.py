@@ -0,0 +1,99 @@
+"""Scenario - Rànquing de la tira sota totes les fórmules d'homogeneïtzació alhora."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from stripscraper import formula
+from stripscraper.models import Classification
+from stripscraper.strip import StripCalculator
+from stripscraper.table import TeamTable
+
+
+@dataclass
+class ScenarioRanking:
+    formula: str
+    scores: np.ndarray
+    group_positions: np.ndarray
+    global_positions: np.ndarray
+
+
+class ScenarioExplorer:
+
+    def __init__(self, table: TeamTable, category: str = "", categories: int = 2):
+        self.table = table
+        self.category = category
+
+        # Les fórmules esperen valors d'una sola categoria (6-7 partits): la tira suma
+        # Cadet + Juvenil, així que s'avaluen sobre la mitjana per categoria.
+        self._points = table['total_points'] / categories
+        self._played = table['matches_played'] / categories
+        self._group_teams = table.group_sizes
+        self._rankings: Dict[str, ScenarioRanking] = {}
+
+    @classmethod
+    def from_strip(cls, classification: Classification,
+                   categories: int = 2) -> "ScenarioExplorer":
+        return cls(TeamTable.from_classification(classification), classification.category,
+                   categories)
+
+    @classmethod
+    def from_parsed(cls, classifications: List[Classification]) -> Dict[str, "ScenarioExplorer"]:
+        strip = StripCalculator()
+        explorers = {}
+        for division, (cadet, juvenil) in strip.group_by_division(classifications).items():
+            explorers[division] = cls(strip.combine_tables(cadet, juvenil), f"Tira {division} Fem")
+        return explorers
+
+    def rank(self, formula_name: str) -> ScenarioRanking:
+        if formula_name in self._rankings:
+            return self._rankings[formula_name]
+
+        scores = formula.evaluate(formula_name, self._points, self._played, self._group_teams)
+        group_positions = self.table.group_positions(scores)
+        order = self.table.global_order(scores, group_positions)
+
+        global_positions = np.empty(len(order), dtype=np.int64)
+        global_positions[order] = np.arange(1, len(order) + 1)
+
+        ranking = ScenarioRanking(
+            formula=formula_name,
+            scores=scores,
+            group_positions=group_positions,
+            global_positions=global_positions
+        )
+        self._rankings[formula_name] = ranking
+        return ranking
+
+    def rank_all(self, formulas: Optional[Sequence[str]] = None) -> Dict[str, ScenarioRanking]:
+        names = list(formulas) if formulas is not None else sorted(formula.FORMULAS)
+        logger.info(f"Calculant {len(names)} escenaris per {self.category or 'la tira'}")
+        return {name: self.rank(name) for name in names}
+
+    def position_matrix(self, formulas: Optional[Sequence[str]] = None) -> np.ndarray:
+        rankings = self.rank_all(formulas)
+        return np.stack([r.global_positions for r in rankings.values()], axis=1)
+
+    def position_ranges(self, formulas: Optional[Sequence[str]] = None) -> List[dict]:
+        rankings = self.rank_all(formulas)
+        names = list(rankings)
+        positions = np.stack([rankings[n].global_positions for n in names], axis=1)
+
+        best = positions.min(axis=1)
+        worst = positions.max(axis=1)
+
+        rows = []
+        for i in np.lexsort((worst, best)):
+            rows.append({
+                'name': self.table.names[i],
+                'group': self.table.groups[i],
+                'positions': dict(zip(names, positions[i].tolist())),
+                'best': int(best[i]),
+                'worst': int(worst[i]),
+                'spread': int(worst[i] - best[i]),
+                'best_formula': names[int(np.argmin(positions[i]))],
+                'worst_formula': names[int(np.argmax(positions[i]))],
+            })
+        return rows
@@ -1,4 +1,24 @@
-from stripscraper.scraper.urls import FixedUrlsScraper
-from stripscraper.scraper.files import FilesUrlsScraper
+"""Scrapers de totes les categories. Es carreguen en accedir-hi, com els parsers."""
 
-__all__ = ["FixedUrlsScraper","FilesUrlsScraper"]
\ No newline at end of file
+import importlib
+
+_LAZY = {
+    "FixedUrlsScraper": "stripscraper.scraper.urls",
+    "FilesUrlsScraper": "stripscraper.scraper.files",
+    "AsyncUrlsScraper": "stripscraper.scraper.concurrent",
+    "ReplayScraper": "stripscraper.scraper.replay",
+}
+
+__all__ = ["FixedUrlsScraper", "FilesUrlsScraper", "AsyncUrlsScraper", "ReplayScraper"]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,121 @@
+"""Concurrent scraper - Descarrega totes les categories en paral·lel amb httpx asíncron."""
+
+import asyncio
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from stripscraper.archive import PageArchive
+from stripscraper.instrumentation import stage
+from stripscraper.models import Classification
+from stripscraper.parser.cache import CachedResponse, ResponseCache
+from stripscraper.parser.html import HtmlParser
+from stripscraper.parser.httpx import DEFAULT_HEADERS
+from stripscraper.scraper.urls import CATEGORY_URLS
+
+
+class AsyncUrlsScraper:
+
+    def __init__(self,
+                 urls: Optional[Iterable[str]] = None,
+                 max_concurrency: int = 4,
+                 host_delay: float = 0.5,
+                 timeout: float = 30.0,
+                 cache: Optional[ResponseCache] = None,
+                 archive: Optional[PageArchive] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency ha de ser >= 1: {max_concurrency}")
+        self.parser = HtmlParser()
+        self.urls = list(urls) if urls is not None else list(CATEGORY_URLS)
+        self.max_concurrency = max_concurrency
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self.transport = transport
+
+    def scrape_all_categories(self) -> List[Classification]:
+        return asyncio.run(self.scrape_all_categories_async())
+
+    async def scrape_all_categories_async(self) -> List[Classification]:
+        logger.info(f"Scraping {len(self.urls)} categories (max {self.max_concurrency} concurrent)")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        host_locks: Dict[str, asyncio.Lock] = {}
+        next_slot: Dict[str, float] = {}
+
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+
+        async with httpx.AsyncClient(headers=DEFAULT_HEADERS,
+                                     timeout=self.timeout,
+                                     limits=limits,
+                                     transport=self.transport,
+                                     follow_redirects=True) as client:
+
+            async def scrape(url: str) -> Classification:
+                cached = self.cache.get(url) if self.cache else None
+                if cached and self.cache.is_fresh(cached):
+                    logger.info(f"Using cached page for {url} ({int(cached.age())}s old)")
+                    return await asyncio.to_thread(self._parse, url, cached.body)
+
+                async with semaphore:
+                    host = urlsplit(url).netloc
+                    lock = host_locks.setdefault(host, asyncio.Lock())
+                    await self._wait_politeness(lock, next_slot, host)
+                    # Les descàrregues s'intercalen: sense pic de memòria per etapa
+                    with stage("download", url, memory=False):
+                        html = await self._download(client, url, cached)
+                # El parseig és CPU pur: en un fil, perquè no aturi les altres descàrregues
+                return await asyncio.to_thread(self._parse, url, html)
+
+            return list(await asyncio.gather(*(scrape(url) for url in self.urls)))
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "AsyncUrlsScraper":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _parse(self, url: str, html: str) -> Classification:
+        with stage("parse", url):
+            return self.parser.parse_classification(html)
+
+    async def _wait_politeness(self, lock: asyncio.Lock, next_slot: Dict[str, float], host: str):
+        loop = asyncio.get_running_loop()
+        async with lock:
+            wait = next_slot.get(host, 0.0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            next_slot[host] = loop.time() + self.host_delay
+
+    async def _download(self, client: httpx.AsyncClient, url: str,
+                        cached: Optional[CachedResponse] = None) -> str:
+        logger.info("Downloading " + url)
+
+        headers = self.cache.conditional_headers(cached) if cached else None
+        # El client ja aplica self.timeout a cada fase de la petició
+        response = await client.get(url, headers=headers)
+
+        if response.status_code == 304 and cached:
+            logger.success("Page not modified, using cached copy")
+            self.cache.touch(url)
+            return cached.body
+
+        response.raise_for_status()
+        html = response.text
+        logger.success("Page downloaded (" + str(len(html)) + " bytes)")
+
+        if self.archive:
+            self.archive.store(url, response.content)
+        if self.cache:
+            self.cache.put(url, html,
+                           etag=response.headers.get('ETag'),
+                           last_modified=response.headers.get('Last-Modified'))
+        return html
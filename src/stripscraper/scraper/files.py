@@ -3,6 +3,7 @@ from typing import List
 
 from loguru import logger
 
+from stripscraper.instrumentation import stage
 from stripscraper.models import Classification
 from stripscraper.parser.html import HtmlParser
 from charset_normalizer import from_path
@@ -28,8 +29,9 @@ class FilesUrlsScraper:
         results = []
 
         for file in self.files:
-            html = Path(file).read_text(encoding="utf-8", errors='replace')
-            classification = self.parser.parse_classification(html)
+            with stage("parse", file):
+                html = Path(file).read_text(encoding="utf-8", errors='replace')
+                classification = self.parser.parse_classification(html)
 
             results.append(classification)
 
@@ -0,0 +1,172 @@
+"""Replay scraper - Reparseja en paral·lel pàgines desades (directori, zip/tar o PageArchive)."""
+
+import hashlib
+import json
+import os
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from charset_normalizer import from_bytes
+from loguru import logger
+
+from stripscraper.archive import PageArchive
+from stripscraper.instrumentation import stage
+from stripscraper.models import Classification
+from stripscraper.parser.html import HtmlParser
+
+PAGE_SUFFIXES = ('.html', '.htm')
+
+
+def detect_encoding(data: bytes) -> str:
+    best_guess = from_bytes(data).best()
+    return best_guess.encoding if best_guess else 'utf-8'
+
+
+def _page_key(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _parse_page(name: str, data: bytes, encoding: Optional[str],
+                backend: str) -> Tuple[Classification, str]:
+    # La detecció és el més car de la primera passada: es fa aquí, al procés fill
+    if encoding is None:
+        encoding = detect_encoding(data)
+        logger.debug(f"{name}: codificació detectada {encoding}")
+    html = data.decode(encoding, errors='replace')
+    try:
+        return HtmlParser(backend).parse_classification(html), encoding
+    except ValueError as e:
+        raise ValueError(f"{name}: {e}") from e
+
+
+class ReplayScraper:
+    """Reparseja pàgines desades, llegint-les d'una en una.
+
+    ``encoding_cache`` (per defecte, només en memòria) desa la codificació detectada de cada
+    pàgina, per contingut; no s'escriu mai dins de l'origen.
+
+    Si l'origen és un directori de ``PageArchive`` (amb ``index.jsonl``), es reparseja la
+    darrera versió de cada URL arxivada fins a ``at`` (per defecte, la més recent).
+    """
+
+    def __init__(self,
+                 source: Path,
+                 workers: Optional[int] = None,
+                 backend: str = "lxml",
+                 encoding_cache: Optional[Path] = None,
+                 at: Optional[datetime] = None):
+        self.source = Path(source)
+        if not self.source.exists():
+            raise ValueError(f"No existeix l'origen de pàgines: {self.source}")
+
+        self.archive = PageArchive(self.source) \
+            if self.source.is_dir() and (self.source / "index.jsonl").exists() else None
+        if at is not None and self.archive is None:
+            raise ValueError(f"Només es pot triar el moment amb un PageArchive: {self.source}")
+        self.at = at
+
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+
+        self.encoding_cache = Path(encoding_cache) if encoding_cache else None
+        self._encodings: Dict[str, str] = {}
+        if self.encoding_cache is not None and self.encoding_cache.exists():
+            self._encodings = json.loads(self.encoding_cache.read_text(encoding='utf-8'))
+
+    def discover(self) -> List[str]:
+        if self.archive is not None:
+            return [entry.url for entry in self.archive.latest(self.at)]
+        if self.source.is_dir():
+            names = [p.relative_to(self.source).as_posix() for p in self.source.rglob('*')
+                     if p.is_file() and p.suffix.lower() in PAGE_SUFFIXES]
+        elif zipfile.is_zipfile(self.source):
+            with zipfile.ZipFile(self.source) as archive:
+                names = [n for n in archive.namelist() if n.lower().endswith(PAGE_SUFFIXES)]
+        elif tarfile.is_tarfile(self.source):
+            with tarfile.open(self.source) as archive:
+                names = [m.name for m in archive.getmembers()
+                         if m.isfile() and m.name.lower().endswith(PAGE_SUFFIXES)]
+        else:
+            raise ValueError(f"Format d'arxiu no suportat: {self.source}")
+
+        return sorted(names)
+
+    def scrape_all_categories(self) -> List[Classification]:
+        # El parseig es fa en altres processos: es mesura el conjunt
+        with stage("replay", str(self.source)):
+            return list(self.iter_classifications())
+
+    def iter_classifications(self) -> Iterator[Classification]:
+        logger.info(f"Reparsejant les pàgines de {self.source} ({self.workers} processos)")
+        try:
+            if self.workers <= 1:
+                for name, data in self._read_pages():
+                    key = _page_key(data)
+                    result = _parse_page(name, data, self._encodings.get(key), self.backend)
+                    yield self._remember(key, result)
+                return
+
+            # Com a molt dues pàgines per procés en vol: el corpus no es carrega sencer
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                pending: Deque = deque()
+                for name, data in self._read_pages():
+                    key = _page_key(data)
+                    pending.append((key, executor.submit(_parse_page, name, data,
+                                                         self._encodings.get(key),
+                                                         self.backend)))
+                    if len(pending) >= self.workers * 2:
+                        key, future = pending.popleft()
+                        yield self._remember(key, future.result())
+                while pending:
+                    key, future = pending.popleft()
+                    yield self._remember(key, future.result())
+        finally:
+            self._save_encodings()
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> "ReplayScraper":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _read_pages(self) -> Iterator[Tuple[str, bytes]]:
+        if self.archive is not None:
+            for entry in self.archive.latest(self.at):
+                yield entry.url, self.archive.read(entry.sha256)
+            return
+
+        names = self.discover()
+
+        if self.source.is_dir():
+            for name in names:
+                yield name, (self.source / name).read_bytes()
+        elif zipfile.is_zipfile(self.source):
+            with zipfile.ZipFile(self.source) as archive:
+                for name in names:
+                    yield name, archive.read(name)
+        else:
+            with tarfile.open(self.source) as archive:
+                for name in names:
+                    yield name, archive.extractfile(name).read()
+
+    def _remember(self, key: str, result: Tuple[Classification, str]) -> Classification:
+        classification, encoding = result
+        self._encodings[key] = encoding
+        return classification
+
+    def _save_encodings(self):
+        if self.encoding_cache is None:
+            return
+        try:
+            self.encoding_cache.parent.mkdir(parents=True, exist_ok=True)
+            self.encoding_cache.write_text(json.dumps(self._encodings, indent=1), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"No s'ha pogut desar la memòria cau de codificacions: {e}")
@@ -1,20 +1,32 @@
 """Competition scraper to get all classifications."""
 
-from typing import List, Set, Tuple
+from typing import List, Optional, Set, Tuple
 from loguru import logger
 
+from stripscraper.archive import PageArchive
 from stripscraper.models import Classification
-from stripscraper.parser import HttpxParser, PlaywrightParser
+from stripscraper.parser.cache import ResponseCache
+
+
+CATEGORY_URLS = [
+    "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1746&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=171&id_competicion=549",
+    "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1750&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=176&id_competicion=566",
+    "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1975&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=173&id_competicion=551",
+    "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1977&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=178&id_competicion=568",
+]
 
 
 class FixedUrlsScraper:
 
-    def __init__(self):
-        self.parser = PlaywrightParser()
-        self.urls = ["https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1746&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=171&id_competicion=549",
-                     "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1750&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=176&id_competicion=566",
-                     "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1975&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=173&id_competicion=551",
-                     "https://resultadosvoleibol.isquad.es/clasificacion_completa.php?seleccion=0&id=1977&id_ambito=0&id_territorial=17&id_superficie=1&iframe=0&id_categoria=178&id_competicion=568"]
+    def __init__(self,
+                 cache: Optional[ResponseCache] = None,
+                 archive: Optional[PageArchive] = None):
+        # CATEGORY_URLS també l'importa el scraper asíncron, que no necessita aquest parser
+        from stripscraper.parser.hybrid import HybridParser
+        # Les decisions d'httpx/Playwright es desen al costat de les pàgines, si n'hi ha memòria cau
+        decisions_file = cache.directory / "fetch-decisions.json" if cache else None
+        self.parser = HybridParser(cache=cache, archive=archive, decisions_file=decisions_file)
+        self.urls = list(CATEGORY_URLS)
 
     def scrape_all_categories(self) -> List[Classification]:
         logger.info("Scraping all category")
@@ -28,3 +40,12 @@ class FixedUrlsScraper:
             results.append(classification)
 
         return results
+
+    def close(self):
+        self.parser.close()
+
+    def __enter__(self) -> "FixedUrlsScraper":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
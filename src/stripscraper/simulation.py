@@ -0,0 +1,266 @@
+"""Simulation - Monte Carlo dels partits pendents per estimar la posició final a la tira."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from stripscraper import formula
+from stripscraper.models import Classification
+from stripscraper.table import TeamTable
+
+# Resultats possibles d'un partit: 3-0, 3-1, 3-2, 2-3, 1-3, 0-3
+OUTCOME_POINTS = np.array([3, 3, 2, 1, 0, 0], dtype=np.int64)
+OUTCOME_WON = np.array([1, 1, 1, 0, 0, 0], dtype=np.int64)
+OUTCOME_SETS_FOR = np.array([3, 3, 3, 2, 1, 0], dtype=np.int64)
+OUTCOME_SETS_AGAINST = np.array([0, 1, 2, 3, 3, 3], dtype=np.int64)
+
+
+@dataclass
+class SimulationResult:
+    names: List[str]
+    groups: List[str]
+    simulations: int
+    position_counts: np.ndarray
+
+    def position_probabilities(self) -> np.ndarray:
+        return self.position_counts / self.simulations
+
+    def top_probability(self, n: int = 40) -> np.ndarray:
+        return self.position_counts[:, :n].sum(axis=1) / self.simulations
+
+    def expected_position(self) -> np.ndarray:
+        positions = np.arange(1, self.position_counts.shape[1] + 1)
+        return (self.position_counts * positions).sum(axis=1) / self.simulations
+
+    def summary(self, top: int = 40) -> List[Dict]:
+        expected = self.expected_position()
+        in_top = self.top_probability(top)
+        probabilities = self.position_probabilities()
+        rows = []
+        for i in np.argsort(expected, kind='stable'):
+            reached = np.flatnonzero(self.position_counts[i])
+            rows.append({
+                'name': self.names[i],
+                'group': self.groups[i],
+                'expected_position': float(expected[i]),
+                'best_position': int(reached[0]) + 1,
+                'worst_position': int(reached[-1]) + 1,
+                'most_likely_position': int(np.argmax(probabilities[i])) + 1,
+                f'top_{top}': float(in_top[i]),
+            })
+        return rows
+
+
+def pending_fixtures(remaining: Sequence[int], meetings: int = 2) -> List[Tuple[int, int]]:
+    """Reparteix els partits pendents d'un grup en parelles d'equips.
+
+    La classificació no diu quins enfrontaments falten, només quants partits li queden a
+    cada equip. Cada parella es pot trobar ``meetings`` cops (un a Cadet i un a Juvenil);
+    sempre s'aparella l'equip amb més partits pendents amb el següent que en té més.
+    """
+    left = [int(r) for r in remaining]
+    played: Dict[Tuple[int, int], int] = {}
+    fixtures = []
+    while True:
+        order = sorted(range(len(left)), key=lambda i: (-left[i], i))
+        if not order or left[order[0]] == 0:
+            break
+        home = order[0]
+        away = next((j for j in order[1:] if left[j] > 0
+                     and played.get((min(home, j), max(home, j)), 0) < meetings), None)
+        if away is None:
+            break
+        pair = (min(home, away), max(home, away))
+        played[pair] = played.get(pair, 0) + 1
+        fixtures.append(pair)
+        left[home] -= 1
+        left[away] -= 1
+    return fixtures
+
+
+class MonteCarloSimulator:
+
+    def __init__(self,
+                 classification: Classification,
+                 matches_per_team: Optional[Dict[str, int]] = None,
+                 formula_name: str = "current_percentage",
+                 smoothing: float = 1.0,
+                 categories: int = 2):
+        self.classification = classification
+        self.formula_name = formula_name
+        self.categories = categories
+        self.table = TeamTable.from_classification(classification)
+        self.model = self._build_model(matches_per_team or {}, smoothing)
+
+        logger.info(f"Simulador {classification.category}: {len(self.table)} equips, "
+                    f"{len(self.model['home'])} partits pendents")
+
+    def simulate(self,
+                 simulations: int = 10_000,
+                 batch_size: int = 5_000,
+                 workers: Optional[int] = None,
+                 seed: Optional[int] = None) -> SimulationResult:
+        if simulations < 1:
+            raise ValueError(f"Cal com a mínim una simulació: {simulations}")
+        if batch_size < 1:
+            raise ValueError(f"La mida del lot ha de ser >= 1: {batch_size}")
+
+        sizes = [batch_size] * (simulations // batch_size)
+        if simulations % batch_size:
+            sizes.append(simulations % batch_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(sizes))
+
+        if workers <= 1:
+            counts = [_simulate_batch(self.model, size, s) for size, s in zip(sizes, seeds)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                counts = list(executor.map(_simulate_batch,
+                                           [self.model] * len(sizes), sizes, seeds))
+
+        return SimulationResult(
+            names=list(self.table.names),
+            groups=list(self.table.groups),
+            simulations=simulations,
+            position_counts=np.sum(counts, axis=0)
+        )
+
+    def _build_model(self, matches_per_team: Dict[str, int],
+                     smoothing: float) -> Dict[str, np.ndarray]:
+        table = self.table
+        group_sizes = table.group_sizes
+        group_ids = np.unique(table.groups.astype(str), return_inverse=True)[1]
+
+        # Cada equip de la tira juga (n-1) partits a Cadet i (n-1) a Juvenil
+        total_matches = np.array([matches_per_team.get(g, self.categories * (n - 1))
+                                  for g, n in zip(table.groups, group_sizes)], dtype=np.int64)
+        remaining = np.maximum(total_matches - table['matches_played'], 0)
+
+        home, away = [], []
+        for group_id in np.unique(group_ids):
+            members = np.flatnonzero(group_ids == group_id)
+            fixtures = pending_fixtures(remaining[members], meetings=self.categories)
+            home += [members[i] for i, _ in fixtures]
+            away += [members[j] for _, j in fixtures]
+
+        unpaired = int(remaining.sum()) - 2 * len(home)
+        if unpaired:
+            logger.warning(f"{self.classification.category}: {unpaired} partits pendents "
+                           f"sense rival possible dins del grup, no se simulen")
+
+        # Probabilitats per resultat a partir de l'historial, amb suavitzat de Laplace.
+        # Les victòries de 3 punts es reparteixen entre 3-0 i 3-1 (i les derrotes de 0 punts
+        # entre 1-3 i 0-3) perquè la classificació no les distingeix.
+        weights = np.stack([
+            table['victories_3_sets'] / 2,
+            table['victories_3_sets'] / 2,
+            table['victories_2_sets'],
+            table['defeats_1_point'],
+            table['defeats_0_points'] / 2,
+            table['defeats_0_points'] / 2,
+        ], axis=1).astype(np.float64) + smoothing / 6
+        probabilities = weights / weights.sum(axis=1, keepdims=True)
+
+        # Un sol resultat per partit: la mitjana del que diu l'historial de cada equip,
+        # girant el del visitant (el seu 3-0 és un 0-3 del local)
+        home = np.array(home, dtype=np.intp)
+        away = np.array(away, dtype=np.intp)
+        match_probabilities = (probabilities[home] + probabilities[away][:, ::-1]) / 2
+        cumulative = np.cumsum(match_probabilities, axis=1)
+
+        sets_played = table['sets_for'] + table['sets_against']
+        points_diff_per_set = np.zeros(len(table), dtype=np.float64)
+        np.divide(table.points_difference, sets_played, out=points_diff_per_set,
+                  where=sets_played > 0)
+
+        return {
+            'total_points': table['total_points'],
+            'matches_played': table['matches_played'],
+            'matches_won': table['matches_won'],
+            'sets_for': table['sets_for'],
+            'sets_against': table['sets_against'],
+            'points_difference': table.points_difference.astype(np.float64),
+            'points_diff_per_set': points_diff_per_set,
+            'home': home,
+            'away': away,
+            'cumulative': cumulative,
+            'group_ids': group_ids,
+            'group_sizes': group_sizes,
+            'categories': self.categories,
+            'formula': self.formula_name,
+        }
+
+
+def simulate_results(model: Dict[str, np.ndarray], simulations: int,
+                     rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Juga ``simulations`` cops els partits pendents i retorna les columnes finals per equip."""
+    home, away = model['home'], model['away']
+    teams = len(model['total_points'])
+
+    draws = rng.random((simulations, len(home)))
+    outcomes = (draws[..., None] > model['cumulative'][None, :, :-1]).sum(axis=-1)
+    mirrored = len(OUTCOME_POINTS) - 1 - outcomes
+
+    # Matrius partit × equip: cada partit suma al local el seu resultat i al visitant el girat
+    home_teams = np.zeros((len(home), teams), dtype=np.int64)
+    home_teams[np.arange(len(home)), home] = 1
+    away_teams = np.zeros((len(away), teams), dtype=np.int64)
+    away_teams[np.arange(len(away)), away] = 1
+
+    def added(values: np.ndarray) -> np.ndarray:
+        return values[outcomes] @ home_teams + values[mirrored] @ away_teams
+
+    sets_for_added = added(OUTCOME_SETS_FOR)
+    sets_against_added = added(OUTCOME_SETS_AGAINST)
+
+    total_points = model['total_points'] + added(OUTCOME_POINTS)
+    matches_played = model['matches_played'] + home_teams.sum(axis=0) + away_teams.sum(axis=0)
+    matches_won = model['matches_won'] + added(OUTCOME_WON)
+    sets_difference = ((model['sets_for'] + sets_for_added)
+                       - (model['sets_against'] + sets_against_added))
+    points_difference = (model['points_difference']
+                         + (sets_for_added + sets_against_added) * model['points_diff_per_set'])
+
+    return {
+        'total_points': total_points,
+        'matches_played': np.broadcast_to(matches_played, total_points.shape),
+        'matches_won': matches_won,
+        'sets_difference': sets_difference,
+        'points_difference': points_difference,
+    }
+
+
+def _simulate_batch(model: Dict[str, np.ndarray], simulations: int,
+                    seed: np.random.SeedSequence) -> np.ndarray:
+    results = simulate_results(model, simulations, np.random.default_rng(seed))
+    teams = len(model['total_points'])
+
+    # Les fórmules esperen valors d'una sola categoria, com a ScenarioExplorer
+    categories = model['categories']
+    percentage = formula.evaluate(model['formula'], results['total_points'] / categories,
+                                  results['matches_played'] / categories, model['group_sizes'])
+
+    keys = (-results['points_difference'], -results['sets_difference'],
+            -results['matches_won'], -percentage)
+
+    # Posició dins del grup de la tira i després ordre global com fa Classifier
+    group_positions = np.empty((simulations, teams), dtype=np.int64)
+    for group_id in np.unique(model['group_ids']):
+        members = np.flatnonzero(model['group_ids'] == group_id)
+        order = np.lexsort(tuple(k[:, members] for k in keys), axis=-1)
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(1, len(members) + 1)[None, :], axis=-1)
+        group_positions[:, members] = ranks
+
+    order = np.lexsort(keys + (group_positions,), axis=-1)
+    final_positions = np.empty_like(order)
+    np.put_along_axis(final_positions, order, np.arange(teams)[None, :], axis=-1)
+
+    flat = np.arange(teams)[None, :] * teams + final_positions
+    return np.bincount(flat.ravel(), minlength=teams * teams).reshape(teams, teams)
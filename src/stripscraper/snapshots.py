@@ -0,0 +1,228 @@
+"""Snapshots - Desa les classificacions parsejades en binari columnar i les recarrega amb mmap."""
+
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from stripscraper.models import Classification, Group, TeamStats
+from stripscraper.table import TeamTable
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Columnes numèriques: un .npy per columna, que es carrega amb mmap
+NUMERIC_COLUMNS: Dict[str, str] = {
+    'round': 'i4',
+    'position': 'i4',
+    'total_points': 'i4',
+    'points_percentage': 'f8',
+    'matches_played': 'i4',
+    'matches_won': 'i4',
+    'win_percentage': 'f8',
+    'matches_lost': 'i4',
+    'loss_percentage': 'f8',
+    'sets_for': 'i4',
+    'sets_against': 'i4',
+    'points_for': 'i4',
+    'avg_points_for': 'f8',
+    'points_against': 'i4',
+    'avg_points_against': 'f8',
+    'victories_3_sets': 'i4',
+    'victories_2_sets': 'i4',
+    'defeats_1_point': 'i4',
+    'defeats_0_points': 'i4',
+    'new_group': 'i4',
+}
+
+# Textos: codis de diccionari per fila i els valors diferents en UTF-8, un darrere l'altre,
+# amb els seus offsets (sense amplada fixa ni farciment)
+TEXT_COLUMNS = ('group', 'name', 'recent_form')
+TEXT_PARTS = ('codes', 'data', 'offsets')
+
+_TEAM_COLUMNS = tuple(f.name for f in fields(TeamStats))
+
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%S%fZ"
+
+
+@dataclass(frozen=True)
+class SnapshotKey:
+    category: str
+    competition: str
+    round: int
+    timestamp: str
+    file: str
+
+    @property
+    def fetched_at(self) -> datetime:
+        return datetime.strptime(self.timestamp, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def encode_text(values: List[str]) -> Dict[str, np.ndarray]:
+    index: Dict[str, int] = {}
+    codes = np.array([index.setdefault(value, len(index)) for value in values], dtype=np.int32)
+    encoded = [value.encode('utf-8') for value in index]
+
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return {'codes': codes, 'data': data, 'offsets': offsets}
+
+
+def decode_text(codes: np.ndarray, data: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    raw = data.tobytes()
+    values = np.array([raw[offsets[i]:offsets[i + 1]].decode('utf-8')
+                       for i in range(len(offsets) - 1)], dtype=object)
+    return values[np.asarray(codes, dtype=np.intp)]
+
+
+def to_columns(classification: Classification) -> Dict[str, np.ndarray]:
+    # Claus = fitxers del snapshot: 'position', ..., 'name.codes', 'name.data', 'name.offsets'
+    rows = [(group, team) for group in classification.groups for team in group.teams]
+    values = {'round': [group.round for group, _ in rows]}
+    for column in NUMERIC_COLUMNS:
+        if column != 'round':
+            values[column] = [getattr(team, column) for _, team in rows]
+    columns = {column: np.array(values[column], dtype=dtype)
+               for column, dtype in NUMERIC_COLUMNS.items()}
+
+    texts = {'group': [group.name for group, _ in rows],
+             'name': [team.name for _, team in rows],
+             'recent_form': [team.recent_form for _, team in rows]}
+    for column, values in texts.items():
+        for part, array in encode_text(values).items():
+            columns[f"{column}.{part}"] = array
+    return columns
+
+
+def decode_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    decoded = {column: columns[column] for column in NUMERIC_COLUMNS}
+    for column in TEXT_COLUMNS:
+        decoded[column] = decode_text(*(columns[f"{column}.{part}"] for part in TEXT_PARTS))
+    return decoded
+
+
+def from_columns(columns: Dict[str, np.ndarray], competition: str,
+                 category: str) -> Classification:
+    decoded = decode_columns(columns)
+    values = {name: decoded[name].tolist() for name in decoded}
+
+    groups: Dict[str, Group] = {}
+    for i, group_name in enumerate(values['group']):
+        group = groups.get(group_name)
+        if group is None:
+            group = groups[group_name] = Group(name=group_name, round=values['round'][i])
+        group.teams.append(TeamStats(**{name: values[name][i] for name in _TEAM_COLUMNS}))
+
+    return Classification(competition=competition, category=category, groups=list(groups.values()))
+
+
+class SnapshotStore:
+
+    def __init__(self, root: Path = Path("outputs/snapshots")):
+        self.root = Path(root)
+        self.index_file = self.root / "index.json"
+
+    def save(self, classification: Classification,
+             timestamp: Optional[datetime] = None) -> SnapshotKey:
+        key = self._write_snapshot(classification, timestamp or datetime.now(timezone.utc))
+        with self._index_lock():
+            self._write_index(self._read_index() + [key])
+        return key
+
+    def save_all(self, classifications: List[Classification],
+                 timestamp: Optional[datetime] = None) -> List[SnapshotKey]:
+        timestamp = timestamp or datetime.now(timezone.utc)
+        keys = [self._write_snapshot(c, timestamp) for c in classifications]
+        with self._index_lock():
+            self._write_index(self._read_index() + keys)
+        return keys
+
+    def _write_snapshot(self, classification: Classification, timestamp: datetime) -> SnapshotKey:
+        timestamp = timestamp.astimezone(timezone.utc)
+        round_num = max((g.round for g in classification.groups), default=0)
+        stamp = timestamp.strftime(TIMESTAMP_FORMAT)
+
+        relative = Path(self._slug(classification.category)) / f"{round_num:03d}-{stamp}"
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Es desa sencer en un directori temporal i es publica d'un sol cop
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.mkdir()
+        try:
+            for column, values in to_columns(classification).items():
+                np.save(tmp / f"{column}.npy", values)
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp)
+
+        key = SnapshotKey(
+            category=classification.category,
+            competition=classification.competition,
+            round=round_num,
+            timestamp=stamp,
+            file=relative.as_posix()
+        )
+
+        logger.info(f"Snapshot desat: {relative}")
+        return key
+
+    def list(self, category: Optional[str] = None) -> List[SnapshotKey]:
+        keys = self._read_index()
+        if category is not None:
+            keys = [k for k in keys if k.category == category]
+        return sorted(keys, key=lambda k: (k.category, k.timestamp))
+
+    def categories(self) -> List[str]:
+        return sorted({k.category for k in self._read_index()})
+
+    def columns(self, key: SnapshotKey) -> Dict[str, np.ndarray]:
+        path = self.root / key.file
+        files = list(NUMERIC_COLUMNS) + [f"{column}.{part}"
+                                         for column in TEXT_COLUMNS for part in TEXT_PARTS]
+        return {name: np.load(path / f"{name}.npy", mmap_mode='r') for name in files}
+
+    def load(self, key: SnapshotKey) -> Classification:
+        return from_columns(self.columns(key), key.competition, key.category)
+
+    def table(self, key: SnapshotKey) -> TeamTable:
+        return TeamTable.from_columns(decode_columns(self.columns(key)))
+
+    def load_season(self, category: str) -> List[Classification]:
+        return [self.load(k) for k in self.list(category)]
+
+    def _slug(self, category: str) -> str:
+        return re.sub(r'\W+', '_', category).strip('_') or 'categoria'
+
+    def _read_index(self) -> List[SnapshotKey]:
+        if not self.index_file.exists():
+            return []
+        entries = json.loads(self.index_file.read_text(encoding='utf-8'))
+        return [SnapshotKey(**entry) for entry in entries]
+
+    @contextmanager
+    def _index_lock(self) -> Iterator[None]:
+        # Sense el bloqueig, dos processos que llegeixen l'índex alhora perdrien entrades
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".index.lock", 'w') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _write_index(self, keys: List[SnapshotKey]):
+        tmp = self.index_file.with_name(f".{self.index_file.name}.{os.getpid()}.tmp")
+        entries = [asdict(k) for k in keys]
+        tmp.write_text(json.dumps(entries, indent=1, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, self.index_file)
@@ -1,11 +1,18 @@
 """Strip calculator - Combina classificacions de Cadet i Juvenil."""
 
-from typing import List, Dict, Tuple
+import unicodedata
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
 from loguru import logger
 
-from stripscraper.models import TeamStats, Group, Classification
 from stripscraper import formula
+from stripscraper.instrumentation import stage
+from stripscraper.models import Classification, Group, TeamStats
+from stripscraper.table import TeamTable
+
+FUZZY_THRESHOLD = 0.3
 
 @dataclass
 class TeamMatch:
@@ -21,32 +28,43 @@ class StripCalculator:
     def __init__(self):
         logger.info("Initializing StripCalculator")
 
-    def calculate_strip_classifications(self, classifications: List[Classification]) -> List[Classification]:
+    def calculate_strip_classifications(self, classifications: List[Classification]
+                                        ) -> List[Classification]:
         logger.info("Calculant classificacions de tira...")
 
-        divisions = self._group_by_division(classifications)
+        divisions = self.group_by_division(classifications)
 
         strip_classifications = []
 
         for division, (cadet_class, juvenil_class) in divisions.items():
             logger.info(f"Processant divisió: {division}")
-            strip_class = self._combine_classifications(cadet_class, juvenil_class, division)
+            with stage("strip", division):
+                strip_class = self._combine_classifications(cadet_class, juvenil_class, division)
             strip_classifications.append(strip_class)
 
         logger.success(f"Calculades {len(strip_classifications)} classificacions de tira")
         return strip_classifications
 
-    def _group_by_division(self, classifications: List[Classification]) -> Dict[str, Tuple[Classification, Classification]]:
+    def group_by_division(self, classifications: List[Classification]
+                          ) -> Dict[str, Tuple[Classification, Classification]]:
         cadet_by_div = {}
         juvenil_by_div = {}
 
         for classification in classifications:
-            division = self._extract_division(classification.category)
+            division = self.extract_division(classification.category)
 
             if "Cadet" in classification.category:
-                cadet_by_div[division] = classification
+                by_div = cadet_by_div
             elif "Juvenil" in classification.category:
-                juvenil_by_div[division] = classification
+                by_div = juvenil_by_div
+            else:
+                continue
+            # Dues pàgines de la mateixa categoria (p. ex. un --replay de diverses jornades):
+            # quedar-se'n una sense avisar donaria una tira d'una jornada qualsevol
+            if division in by_div:
+                raise ValueError(f"Hi ha més d'una classificació de {classification.category} "
+                                 f"(divisió {division}); cal calcular cada jornada per separat")
+            by_div[division] = classification
 
         divisions = {}
         for division in cadet_by_div.keys():
@@ -57,7 +75,7 @@ class StripCalculator:
 
         return divisions
 
-    def _extract_division(self, category: str) -> str:
+    def extract_division(self, category: str) -> str:
         if "2a Div" in category:
             return "2a Div"
         elif "4a Div" in category:
@@ -69,31 +87,83 @@ class StripCalculator:
         else:
             raise ValueError(f"Divisió desconeguda a la categoria: {category}")
 
-    def _combine_classifications(self, cadet: Classification, juvenil: Classification, division: str) -> Classification:
+    def _combine_classifications(self, cadet: Classification, juvenil: Classification,
+                                 division: str) -> Classification:
         strip_classification = Classification(
             competition=f"Tira {division}",
             category=f"Tira {division} Fem",
             groups=[]
         )
 
-        cadet_groups_dict = {g.name: g for g in cadet.groups}
-        juvenil_groups_dict = {g.name: g for g in juvenil.groups}
+        for group_name, cadet_group, juvenil_group, matches in self._paired_groups(cadet, juvenil):
+            strip_group = self._combine_groups(cadet_group, juvenil_group, group_name, matches)
+            strip_classification.groups.append(strip_group)
 
-        if len(cadet_groups_dict) != len(juvenil_groups_dict):
-            raise ValueError(f"Numero de grups diferent: Cadet={len(cadet_groups_dict)}, Juvenil={len(juvenil_groups_dict)}")
+        return strip_classification
 
-        for group_name in sorted(cadet_groups_dict.keys()):
-            cadet_group = cadet_groups_dict[group_name]
-            juvenil_group = juvenil_groups_dict[group_name]
+    def combine_tables(self, cadet: Classification, juvenil: Classification) -> TeamTable:
+        cadet_table = TeamTable.from_classification(cadet)
+        juvenil_table = TeamTable.from_classification(juvenil)
 
-            strip_group = self._combine_groups(cadet_group, juvenil_group, group_name)
-            strip_classification.groups.append(strip_group)
+        cadet_rows = {id(t): i for i, t in enumerate(t for g in cadet.groups for t in g.teams)}
+        juvenil_rows = {id(t): i for i, t in enumerate(t for g in juvenil.groups for t in g.teams)}
 
-        return strip_classification
+        left, right, names = [], [], []
+        for _, _, _, matches in self._paired_groups(cadet, juvenil):
+            for match in matches:
+                left.append(cadet_rows[id(match.cadet_team)])
+                right.append(juvenil_rows[id(match.juvenil_team)])
+                names.append(match.nom_definitiu)
 
-    def _combine_groups(self, cadet_group: Group, juvenil_group: Group, group_name: str) -> Group:
-        matches = self._match_teams(cadet_group.teams, juvenil_group.teams, group_name)
+        table = cadet_table.combine(juvenil_table, left, right, names)
+        table.columns['position'] = table.group_positions()
+        return table
+
+    def _paired_groups(self, cadet: Classification, juvenil: Classification
+                       ) -> List[Tuple[str, Group, Group, List[TeamMatch]]]:
+        cadet_groups_dict = {g.name: g for g in cadet.groups}
+        juvenil_groups_dict = {g.name: g for g in juvenil.groups}
+
+        if cadet_groups_dict.keys() == juvenil_groups_dict.keys():
+            paired = []
+            for group_name in sorted(cadet_groups_dict.keys()):
+                cadet_group = cadet_groups_dict[group_name]
+                juvenil_group = juvenil_groups_dict[group_name]
+                matches = self._match_teams(cadet_group.teams, juvenil_group.teams, group_name)
+                paired.append((group_name, cadet_group, juvenil_group, matches))
+            return paired
+
+        # Si els grups no es diuen igual a Cadet i Juvenil s'emparella tota la divisió
+        # de cop i cada parella queda al grup on juga el Cadet
+        logger.warning(f"Grups diferents a {cadet.category} ({len(cadet_groups_dict)}) i "
+                       f"{juvenil.category} ({len(juvenil_groups_dict)}): "
+                       f"emparellant tota la divisió")
+
+        cadet_teams = [t for g in cadet.groups for t in g.teams]
+        juvenil_teams = [t for g in juvenil.groups for t in g.teams]
+        matches = self._match_teams(cadet_teams, juvenil_teams, cadet.category)
+
+        cadet_group_of = {id(t): g.name for g in cadet.groups for t in g.teams}
+        juvenil_group_of = {id(t): g for g in juvenil.groups for t in g.teams}
+
+        matches_by_group: Dict[str, List[TeamMatch]] = {name: [] for name in cadet_groups_dict}
+        for match in matches:
+            matches_by_group[cadet_group_of[id(match.cadet_team)]].append(match)
 
+        paired = []
+        for group_name in sorted(cadet_groups_dict.keys()):
+            group_matches = matches_by_group[group_name]
+            partner_groups = [juvenil_group_of[id(m.juvenil_team)] for m in group_matches]
+            juvenil_group = Group(
+                name=group_name,
+                round=max((g.round for g in partner_groups), default=0),
+                teams=[m.juvenil_team for m in group_matches]
+            )
+            paired.append((group_name, cadet_groups_dict[group_name], juvenil_group, group_matches))
+        return paired
+
+    def _combine_groups(self, cadet_group: Group, juvenil_group: Group, group_name: str,
+                        matches: List[TeamMatch]) -> Group:
         logger.info(f"Grup {group_name}: {len(matches)} equips amb Cadet+Juvenil")
 
         strip_teams = []
@@ -120,103 +190,92 @@ class StripCalculator:
 
         return strip_group
 
-    def _match_teams(self, cadet_teams: List[TeamStats], juvenil_teams: List[TeamStats], group_name: str) -> List[TeamMatch]:
+    def _match_teams(self, cadet_teams: List[TeamStats], juvenil_teams: List[TeamStats],
+                     group_name: str) -> List[TeamMatch]:
         if len(cadet_teams) != len(juvenil_teams):
-            raise ValueError(f"Grup {group_name}: diferent nombre d'equips (Cadet={len(cadet_teams)}, Juvenil={len(juvenil_teams)})")
-
-        cadet_normalized = [(i, team, self._normalize_name(team.name)) for i, team in enumerate(cadet_teams)]
-        juvenil_normalized = [(i, team, self._normalize_name(team.name)) for i, team in enumerate(juvenil_teams)]
-
-        matches = []
-        used_juvenil_idx = set()
-
-        for cadet_idx, cadet_team, cadet_norm in cadet_normalized:
-            for juvenil_idx, juvenil_team, juvenil_norm in juvenil_normalized:
-                if juvenil_idx in used_juvenil_idx:
-                    continue
-
-                if cadet_norm == juvenil_norm:
-                    nom_definitiu = self._get_definitive_name(cadet_team.name, juvenil_team.name)
-                    matches.append(TeamMatch(
-                        nom_definitiu=nom_definitiu,
-                        nom_cadet=cadet_team.name,
-                        nom_juvenil=juvenil_team.name,
-                        cadet_team=cadet_team,
-                        juvenil_team=juvenil_team
-                    ))
-                    used_juvenil_idx.add(juvenil_idx)
-                    logger.debug(f"  Match exacte: '{cadet_team.name}' ↔ '{juvenil_team.name}' → '{nom_definitiu}'")
-                    break
-
-        unmatched_cadet = [(idx, team) for idx, team, _ in cadet_normalized if not any(m.cadet_team == team for m in matches)]
-        unmatched_juvenil = [(idx, team) for idx, team, _ in juvenil_normalized if idx not in used_juvenil_idx]
+            raise ValueError(f"Grup {group_name}: diferent nombre d'equips "
+                             f"(Cadet={len(cadet_teams)}, Juvenil={len(juvenil_teams)})")
+
+        cadet_norms = [normalize_team_name(team.name) for team in cadet_teams]
+        juvenil_norms = [normalize_team_name(team.name) for team in juvenil_teams]
+
+        # Índex nom normalitzat -> posicions Juvenil, en ordre d'aparició
+        juvenil_index: Dict[str, List[int]] = {}
+        for juvenil_idx, juvenil_norm in enumerate(juvenil_norms):
+            juvenil_index.setdefault(juvenil_norm, []).append(juvenil_idx)
+
+        pairs: Dict[int, int] = {}
+        for cadet_idx, cadet_norm in enumerate(cadet_norms):
+            candidates = juvenil_index.get(cadet_norm)
+            if candidates:
+                juvenil_idx = candidates.pop(0)
+                pairs[cadet_idx] = juvenil_idx
+                logger.debug(f"  Match exacte: '{cadet_teams[cadet_idx].name}' ↔ "
+                             f"'{juvenil_teams[juvenil_idx].name}'")
+
+        matched_juvenil = set(pairs.values())
+        unmatched_cadet = [i for i in range(len(cadet_teams)) if i not in pairs]
+        unmatched_juvenil = [i for i in range(len(juvenil_teams)) if i not in matched_juvenil]
 
         if unmatched_cadet or unmatched_juvenil:
-            logger.warning(f"Grup {group_name}: {len(unmatched_cadet)} equips sense match exacte, intentant matching fuzzy...")
-            fuzzy_matches = self._fuzzy_match(unmatched_cadet, unmatched_juvenil, group_name)
-            matches.extend(fuzzy_matches)
-
-        if len(matches) != len(cadet_teams):
-            unmatched_cadet_names = [team.name for idx, team, _ in cadet_normalized if not any(m.cadet_team == team for m in matches)]
-            unmatched_juvenil_names = [team.name for idx, team, _ in juvenil_normalized if not any(m.juvenil_team == team for m in matches)]
+            logger.warning(f"Grup {group_name}: {len(unmatched_cadet)} equips sense match exacte, "
+                           f"intentant matching fuzzy...")
+            for cadet_idx, juvenil_idx, score in self._fuzzy_match(
+                    [cadet_norms[i] for i in unmatched_cadet],
+                    [juvenil_norms[i] for i in unmatched_juvenil]):
+                cadet_idx = unmatched_cadet[cadet_idx]
+                juvenil_idx = unmatched_juvenil[juvenil_idx]
+                pairs[cadet_idx] = juvenil_idx
+                logger.info(f"  Match fuzzy ({score:.2f}): '{cadet_teams[cadet_idx].name}' ↔ "
+                            f"'{juvenil_teams[juvenil_idx].name}'")
+
+        if len(pairs) != len(cadet_teams):
+            matched_juvenil = set(pairs.values())
+            unmatched_cadet_names = [t.name for i, t in enumerate(cadet_teams) if i not in pairs]
+            unmatched_juvenil_names = [t.name for i, t in enumerate(juvenil_teams)
+                                       if i not in matched_juvenil]
             logger.error(f"Grup {group_name} - Equips sense parella:")
             logger.error(f"  Cadet: {unmatched_cadet_names}")
             logger.error(f"  Juvenil: {unmatched_juvenil_names}")
             raise ValueError(f"No s'han pogut emparellar tots els equips del grup {group_name}")
 
-        return matches
-
-    def _fuzzy_match(self, cadet_teams: List[Tuple[int, TeamStats]], juvenil_teams: List[Tuple[int, TeamStats]], group_name: str) -> List[TeamMatch]:
         matches = []
-        used_juvenil_idx = set()
-
-        for cadet_idx, cadet_team in cadet_teams:
-            best_match = None
-            best_match_idx = None
-            best_score = 0
-
-            cadet_norm = self._normalize_name(cadet_team.name)
-            cadet_words = set(cadet_norm.split())
-
-            for juvenil_idx, juvenil_team in juvenil_teams:
-                if juvenil_idx in used_juvenil_idx:
-                    continue
-
-                juvenil_norm = self._normalize_name(juvenil_team.name)
-                juvenil_words = set(juvenil_norm.split())
-
-                common_words = cadet_words & juvenil_words
-
-                if not common_words:
-                    continue
+        for cadet_idx in sorted(pairs):
+            cadet_team = cadet_teams[cadet_idx]
+            juvenil_team = juvenil_teams[pairs[cadet_idx]]
+            matches.append(TeamMatch(
+                nom_definitiu=self._get_definitive_name(cadet_team.name, juvenil_team.name),
+                nom_cadet=cadet_team.name,
+                nom_juvenil=juvenil_team.name,
+                cadet_team=cadet_team,
+                juvenil_team=juvenil_team
+            ))
+        return matches
 
-                min_words = min(len(cadet_words), len(juvenil_words))
-                max_words = max(len(cadet_words), len(juvenil_words))
+    def _fuzzy_match(self, cadet_norms: List[str],
+                     juvenil_norms: List[str]) -> List[Tuple[int, int, float]]:
+        scores = [[self._name_similarity(c, j) for j in juvenil_norms] for c in cadet_norms]
 
-                word_score = len(common_words) / min_words
+        # Parelles per sota del llindar valen 0: l'assignació maximitza només les parelles vàlides
+        weights = [[score if score > FUZZY_THRESHOLD else 0.0 for score in row] for row in scores]
+        assignment = optimal_assignment(weights)
 
-                char_score = self._character_similarity(cadet_norm, juvenil_norm)
+        return [(cadet_idx, juvenil_idx, scores[cadet_idx][juvenil_idx])
+                for cadet_idx, juvenil_idx in assignment
+                if scores[cadet_idx][juvenil_idx] > FUZZY_THRESHOLD]
 
-                score = word_score * 0.8 + char_score * 0.2
+    def _name_similarity(self, cadet_norm: str, juvenil_norm: str) -> float:
+        cadet_words = _name_words(cadet_norm)
+        juvenil_words = _name_words(juvenil_norm)
 
-                if score > best_score:
-                    best_score = score
-                    best_match = juvenil_team
-                    best_match_idx = juvenil_idx
+        common_words = cadet_words & juvenil_words
+        if not common_words:
+            return 0.0
 
-            if best_match and best_score > 0.3:
-                nom_definitiu = self._get_definitive_name(cadet_team.name, best_match.name)
-                matches.append(TeamMatch(
-                    nom_definitiu=nom_definitiu,
-                    nom_cadet=cadet_team.name,
-                    nom_juvenil=best_match.name,
-                    cadet_team=cadet_team,
-                    juvenil_team=best_match
-                ))
-                used_juvenil_idx.add(best_match_idx)
-                logger.info(f"  Match fuzzy ({best_score:.2f}): '{cadet_team.name}' ↔ '{best_match.name}' → '{nom_definitiu}'")
+        word_score = len(common_words) / min(len(cadet_words), len(juvenil_words))
+        char_score = self._character_similarity(cadet_norm, juvenil_norm)
 
-        return matches
+        return word_score * 0.8 + char_score * 0.2
 
     def _character_similarity(self, s1: str, s2: str) -> float:
         if not s1 or not s2:
@@ -232,18 +291,7 @@ class StripCalculator:
         return matches / len(longer)
 
     def _normalize_name(self, name: str) -> str:
-        import unicodedata
-
-        normalized = name.upper()
-        normalized = unicodedata.normalize('NFKD', normalized)
-        normalized = ''.join([c for c in normalized if not unicodedata.combining(c)])
-
-        normalized = ''.join([c if c.isalnum() or c.isspace() else ' ' for c in normalized])
-
-        words = normalized.split()
-        words = [w for w in words if w not in ['CADET', 'JUVENIL', 'JFG', 'CFG']]
-
-        return ' '.join(words).strip()
+        return normalize_team_name(name)
 
     def _get_definitive_name(self, cadet_name: str, juvenil_name: str) -> str:
         longer_name = cadet_name if len(cadet_name) >= len(juvenil_name) else juvenil_name
@@ -298,3 +346,86 @@ class StripCalculator:
             new_group=0
         )
 
+
+@lru_cache(maxsize=4096)
+def normalize_team_name(name: str) -> str:
+    normalized = name.upper()
+    normalized = unicodedata.normalize('NFKD', normalized)
+    normalized = ''.join([c for c in normalized if not unicodedata.combining(c)])
+
+    normalized = ''.join([c if c.isalnum() or c.isspace() else ' ' for c in normalized])
+
+    words = normalized.split()
+    words = [w for w in words if w not in ['CADET', 'JUVENIL', 'JFG', 'CFG']]
+
+    return ' '.join(words).strip()
+
+
+@lru_cache(maxsize=4096)
+def _name_words(normalized: str) -> frozenset:
+    return frozenset(normalized.split())
+
+
+def optimal_assignment(weights: Sequence[Sequence[float]]) -> List[Tuple[int, int]]:
+    """Assignació de pes màxim (algorisme hongarès, O(n³)).
+
+    Retorna les parelles (fila, columna) ordenades per fila. Amb empats tria sempre
+    la primera opció, de manera que el resultat és determinista.
+    """
+    rows = len(weights)
+    cols = len(weights[0]) if rows else 0
+    if rows == 0 or cols == 0:
+        return []
+
+    transposed = rows > cols
+    if transposed:
+        weights = [[weights[r][c] for r in range(rows)] for c in range(cols)]
+        rows, cols = cols, rows
+
+    top = max(max(row) for row in weights)
+    cost = [[top - w for w in row] for row in weights]
+
+    # Potencials u (files) i v (columnes), 1-indexats; way[j] = columna anterior del camí
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    owner = [0] * (cols + 1)
+    way = [0] * (cols + 1)
+
+    for row in range(1, rows + 1):
+        owner[0] = row
+        col0 = 0
+        minv = [float('inf')] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[col0] = True
+            row0 = owner[col0]
+            delta = float('inf')
+            col1: Optional[int] = None
+            for col in range(1, cols + 1):
+                if used[col]:
+                    continue
+                current = cost[row0 - 1][col - 1] - u[row0] - v[col]
+                if current < minv[col]:
+                    minv[col] = current
+                    way[col] = col0
+                if minv[col] < delta:
+                    delta = minv[col]
+                    col1 = col
+            for col in range(cols + 1):
+                if used[col]:
+                    u[owner[col]] += delta
+                    v[col] -= delta
+                else:
+                    minv[col] -= delta
+            col0 = col1
+            if owner[col0] == 0:
+                break
+        while col0:
+            col1 = way[col0]
+            owner[col0] = owner[col1]
+            col0 = col1
+
+    pairs = [(owner[col] - 1, col - 1) for col in range(1, cols + 1) if owner[col]]
+    if transposed:
+        pairs = [(c, r) for r, c in pairs]
+    return sorted(pairs)
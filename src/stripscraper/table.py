@@ -0,0 +1,240 @@
+"""TeamTable - Taula columnar (NumPy) d'equips per a combinacions i rànquings massius."""
+
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from stripscraper import formula
+from stripscraper.models import Classification, Group, TeamStats
+
+INT_COLUMNS = (
+    'position',
+    'total_points',
+    'matches_played',
+    'matches_won',
+    'matches_lost',
+    'sets_for',
+    'sets_against',
+    'points_for',
+    'points_against',
+    'victories_3_sets',
+    'victories_2_sets',
+    'defeats_1_point',
+    'defeats_0_points',
+    'new_group',
+)
+
+FLOAT_COLUMNS = (
+    'points_percentage',
+    'win_percentage',
+    'loss_percentage',
+    'avg_points_for',
+    'avg_points_against',
+)
+
+# Sumables en combinar Cadet + Juvenil
+SUM_COLUMNS = (
+    'total_points',
+    'matches_played',
+    'matches_won',
+    'matches_lost',
+    'sets_for',
+    'sets_against',
+    'points_for',
+    'points_against',
+    'victories_3_sets',
+    'victories_2_sets',
+    'defeats_1_point',
+    'defeats_0_points',
+)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    out = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out * scale if scale != 1.0 else out
+
+
+class TeamTable:
+
+    def __init__(self,
+                 names: np.ndarray,
+                 groups: np.ndarray,
+                 forms: np.ndarray,
+                 columns: Dict[str, np.ndarray]):
+        self.names = names
+        self.groups = groups
+        self.forms = forms
+        self.columns = columns
+
+    @classmethod
+    def from_teams(cls, teams: Sequence[TeamStats], groups: Sequence[str]) -> "TeamTable":
+        count = len(teams)
+        columns = {}
+        for name in INT_COLUMNS:
+            values = (getattr(t, name) for t in teams)
+            columns[name] = np.fromiter(values, dtype=np.int64, count=count)
+        for name in FLOAT_COLUMNS:
+            values = (getattr(t, name) for t in teams)
+            columns[name] = np.fromiter(values, dtype=np.float64, count=count)
+
+        return cls(
+            names=np.array([t.name for t in teams], dtype=object),
+            groups=np.array(list(groups), dtype=object),
+            forms=np.array([t.recent_form for t in teams], dtype=object),
+            columns=columns
+        )
+
+    @classmethod
+    def from_classification(cls, classification: Classification) -> "TeamTable":
+        teams = [team for group in classification.groups for team in group.teams]
+        groups = [group.name for group in classification.groups for _ in group.teams]
+        return cls.from_teams(teams, groups)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, np.ndarray]) -> "TeamTable":
+        # Les columnes numèriques no es copien (també si són memmaps)
+        return cls(
+            names=np.asarray(columns['name'], dtype=object),
+            groups=np.asarray(columns['group'], dtype=object),
+            forms=np.asarray(columns['recent_form'], dtype=object),
+            columns={name: columns[name] for name in INT_COLUMNS + FLOAT_COLUMNS}
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @property
+    def sets_difference(self) -> np.ndarray:
+        return self.columns['sets_for'] - self.columns['sets_against']
+
+    @property
+    def points_difference(self) -> np.ndarray:
+        return self.columns['points_for'] - self.columns['points_against']
+
+    @property
+    def group_sizes(self) -> np.ndarray:
+        _, inverse, counts = np.unique(self.groups.astype(str),
+                                       return_inverse=True, return_counts=True)
+        return counts[inverse]
+
+    def take(self, index: np.ndarray) -> "TeamTable":
+        return TeamTable(
+            names=self.names[index],
+            groups=self.groups[index],
+            forms=self.forms[index],
+            columns={name: values[index] for name, values in self.columns.items()}
+        )
+
+    def combine(self,
+                other: "TeamTable",
+                left: np.ndarray,
+                right: np.ndarray,
+                names: Optional[Sequence[str]] = None) -> "TeamTable":
+        left = np.asarray(left, dtype=np.intp)
+        right = np.asarray(right, dtype=np.intp)
+
+        columns = {name: self.columns[name][left] + other.columns[name][right]
+                   for name in SUM_COLUMNS}
+
+        played = columns['matches_played']
+        columns['points_percentage'] = formula.current_percentage_batch(columns['total_points'],
+                                                                        played)
+        columns['win_percentage'] = _ratio(columns['matches_won'], played, 100.0)
+        columns['loss_percentage'] = _ratio(columns['matches_lost'], played, 100.0)
+        columns['avg_points_for'] = _ratio(columns['points_for'], played)
+        columns['avg_points_against'] = _ratio(columns['points_against'], played)
+        columns['position'] = np.zeros(len(left), dtype=np.int64)
+        columns['new_group'] = np.zeros(len(left), dtype=np.int64)
+
+        return TeamTable(
+            names=np.array(list(names), dtype=object) if names is not None else self.names[left],
+            groups=self.groups[left],
+            forms=self.forms[left] + other.forms[right],
+            columns=columns
+        )
+
+    def evaluate(self, formula_name: str, group_teams: Optional[np.ndarray] = None) -> np.ndarray:
+        if group_teams is None:
+            group_teams = self.group_sizes
+        return formula.evaluate(formula_name,
+                                self.columns['total_points'],
+                                self.columns['matches_played'],
+                                group_teams)
+
+    def ranking_keys(self, percentage: Optional[np.ndarray] = None) -> tuple:
+        if percentage is None:
+            percentage = self.columns['points_percentage']
+        # np.lexsort ordena per l'última clau primer
+        return (
+            -self.points_difference,
+            -self.sets_difference,
+            -self.columns['matches_won'],
+            -percentage,
+        )
+
+    def order(self, percentage: Optional[np.ndarray] = None) -> np.ndarray:
+        return np.lexsort(self.ranking_keys(percentage))
+
+    def group_positions(self, percentage: Optional[np.ndarray] = None) -> np.ndarray:
+        group_ids = np.unique(self.groups.astype(str), return_inverse=True)[1]
+        order = np.lexsort(self.ranking_keys(percentage) + (group_ids,))
+
+        positions = np.empty(len(self), dtype=np.int64)
+        sorted_groups = group_ids[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_groups)) + 1]
+        first = np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+        positions[order] = np.arange(len(order)) - first + 1
+        return positions
+
+    def global_order(self,
+                     percentage: Optional[np.ndarray] = None,
+                     positions: Optional[np.ndarray] = None) -> np.ndarray:
+        if positions is None:
+            positions = self.columns['position']
+        return np.lexsort(self.ranking_keys(percentage) + (positions,))
+
+    def to_teams(self) -> List[TeamStats]:
+        int_values = {name: self.columns[name].tolist() for name in INT_COLUMNS}
+        float_values = {name: self.columns[name].tolist() for name in FLOAT_COLUMNS}
+
+        teams = []
+        for i in range(len(self)):
+            teams.append(TeamStats(
+                position=int_values['position'][i],
+                name=self.names[i],
+                recent_form=self.forms[i],
+                total_points=int_values['total_points'][i],
+                points_percentage=float_values['points_percentage'][i],
+                matches_played=int_values['matches_played'][i],
+                matches_won=int_values['matches_won'][i],
+                win_percentage=float_values['win_percentage'][i],
+                matches_lost=int_values['matches_lost'][i],
+                loss_percentage=float_values['loss_percentage'][i],
+                sets_for=int_values['sets_for'][i],
+                sets_against=int_values['sets_against'][i],
+                points_for=int_values['points_for'][i],
+                avg_points_for=float_values['avg_points_for'][i],
+                points_against=int_values['points_against'][i],
+                avg_points_against=float_values['avg_points_against'][i],
+                victories_3_sets=int_values['victories_3_sets'][i],
+                victories_2_sets=int_values['victories_2_sets'][i],
+                defeats_1_point=int_values['defeats_1_point'][i],
+                defeats_0_points=int_values['defeats_0_points'][i],
+                new_group=int_values['new_group'][i]
+            ))
+        return teams
+
+    def to_groups(self, rounds: Optional[Dict[str, int]] = None) -> List[Group]:
+        ranked = self.take(np.lexsort((self.columns['position'], self.groups.astype(str))))
+        teams = ranked.to_teams()
+
+        groups: Dict[str, Group] = {}
+        for group_name, team in zip(ranked.groups, teams):
+            if group_name not in groups:
+                groups[group_name] = Group(name=group_name, round=(rounds or {}).get(group_name, 0))
+            groups[group_name].teams.append(team)
+        return list(groups.values())
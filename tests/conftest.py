@@ -0,0 +1,29 @@
+"""Fixtures compartides: pàgines sintètiques amb l'estructura de clasificacion_completa.php."""
+
+from typing import List
+
+import pytest
+
+from benchmarks.synthetic import generate_division
+from stripscraper.models import Classification
+from stripscraper.parser.html import HtmlParser
+from stripscraper.strip import StripCalculator
+
+
+def division_pages(division: str = "1a Div", groups: int = 2, teams: int = 8,
+                   round_num: int = 4, seed: int = 0):
+    return generate_division(division, groups, teams, round_num=round_num, seed=seed)
+
+
+def parse_pages(*pages: str) -> List[Classification]:
+    return [HtmlParser().parse_classification(page) for page in pages]
+
+
+@pytest.fixture
+def parsed_division() -> List[Classification]:
+    return parse_pages(*division_pages())
+
+
+@pytest.fixture
+def strip_classification(parsed_division) -> Classification:
+    return StripCalculator().calculate_strip_classifications(parsed_division)[0]
@@ -0,0 +1,114 @@
+import hashlib
+import multiprocessing
+
+import pytest
+
+from stripscraper.archive import PageArchive
+
+PAGE = "<html><body><h2>CLASIFICACIONES Cadet Femení 1a Div</h2></body></html>".encode('utf-8')
+
+
+def _objects(root):
+    return sorted(p for p in (root / "objects").rglob("*") if p.is_file())
+
+
+def test_same_content_is_stored_once(tmp_path):
+    archive = PageArchive(tmp_path)
+
+    first = archive.store("https://example.test/a", PAGE)
+    second = archive.store("https://example.test/b", PAGE)
+
+    assert first == second == hashlib.sha256(PAGE).hexdigest()
+    assert len(_objects(tmp_path)) == 1
+    assert [(e.url, e.sha256, e.size) for e in archive.history()] == [
+        ("https://example.test/a", first, len(PAGE)),
+        ("https://example.test/b", first, len(PAGE)),
+    ]
+    assert [e.url for e in archive.history("https://example.test/b")] == ["https://example.test/b"]
+
+
+def test_changed_content_gets_a_new_object(tmp_path):
+    archive = PageArchive(tmp_path)
+    old = archive.store("https://example.test/a", PAGE)
+    new = archive.store("https://example.test/a", PAGE.replace(b"1a Div", b"2a Div"))
+
+    assert old != new
+    assert len(_objects(tmp_path)) == 2
+    assert archive.read(old) == PAGE
+
+
+def test_streamed_pages_hash_like_whole_pages(tmp_path):
+    archive = PageArchive(tmp_path)
+    chunks = [PAGE[i:i + 7] for i in range(0, len(PAGE), 7)]
+
+    assert archive.store_stream("https://example.test/a", iter(chunks)) == archive.store(
+        "https://example.test/a", PAGE)
+    assert len(_objects(tmp_path)) == 1
+
+
+def test_tee_archives_what_the_consumer_reads(tmp_path):
+    archive = PageArchive(tmp_path)
+    with archive.writer("https://example.test/a") as sink:
+        read = b"".join(sink.tee([PAGE[:10], PAGE[10:]]))
+
+    assert read == PAGE
+    assert archive.read(sink.sha256) == PAGE
+
+
+def test_failed_write_leaves_nothing_behind(tmp_path):
+    archive = PageArchive(tmp_path)
+    with pytest.raises(RuntimeError):
+        with archive.writer("https://example.test/a") as sink:
+            sink.write(PAGE)
+            raise RuntimeError("connexió tallada")
+
+    assert _objects(tmp_path) == []
+    assert archive.history() == []
+
+
+def test_gzip_objects_are_reproducible(tmp_path):
+    sha = PageArchive(tmp_path / "one").store("https://example.test/a", PAGE)
+    PageArchive(tmp_path / "two").store("https://example.test/a", PAGE)
+
+    one, two = (_objects(tmp_path / name)[0].read_bytes() for name in ("one", "two"))
+    assert one == two
+    assert _objects(tmp_path / "one")[0].name == f"{sha}.html.gz"
+
+
+def test_zstd_round_trip(tmp_path):
+    pytest.importorskip("zstandard")
+    archive = PageArchive(tmp_path, compression="zstd")
+
+    sha = archive.store("https://example.test/a", PAGE)
+
+    assert archive.read(sha) == PAGE
+    assert _objects(tmp_path)[0].suffix == ".zst"
+
+
+def test_unknown_compression_raises(tmp_path):
+    with pytest.raises(ValueError, match="Compressió desconeguda"):
+        PageArchive(tmp_path, compression="lz4")
+
+
+def test_missing_object_raises(tmp_path):
+    with pytest.raises(ValueError, match="No hi ha cap pàgina arxivada"):
+        PageArchive(tmp_path).read("0" * 64)
+
+
+def _store_many(root, worker, count):
+    archive = PageArchive(root)
+    for i in range(count):
+        archive.store(f"https://example.test/{worker}", PAGE + str(i % 3).encode())
+
+
+def test_concurrent_writers_share_objects_and_index(tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_store_many, args=(tmp_path, w, 20)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert len(PageArchive(tmp_path).history()) == 80
+    assert len(_objects(tmp_path)) == 3
+    assert not list((tmp_path / "objects").glob(".*.tmp"))
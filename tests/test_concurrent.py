@@ -0,0 +1,96 @@
+import asyncio
+import time
+
+import httpx
+
+from stripscraper.parser.cache import ResponseCache
+from stripscraper.parser.html import HtmlParser
+from stripscraper.scraper.concurrent import AsyncUrlsScraper
+from tests.conftest import division_pages
+
+PAGE = division_pages()[0]
+
+
+def _url(host, i=0):
+    return f"https://{host}.example.test/clasificacion_completa.php?id={i}"
+
+
+def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return httpx.Response(200, text=PAGE)
+
+    urls = [_url(f"host{i}") for i in range(8)]
+    scraper = AsyncUrlsScraper(urls, max_concurrency=3, host_delay=0,
+                               transport=httpx.MockTransport(handler))
+
+    assert scraper.scrape_all_categories() == [HtmlParser().parse_classification(PAGE)] * 8
+    assert peak == 3
+
+
+def test_requests_to_one_host_are_spaced():
+    started = {}
+
+    async def handler(request):
+        started.setdefault(request.url.host, []).append(time.monotonic())
+        return httpx.Response(200, text=PAGE)
+
+    urls = [_url("a", i) for i in range(3)] + [_url("b", i) for i in range(3)]
+    AsyncUrlsScraper(urls, max_concurrency=6, host_delay=0.1,
+                     transport=httpx.MockTransport(handler)).scrape_all_categories()
+
+    for times in started.values():
+        assert len(times) == 3
+        assert all(later - earlier >= 0.09 for earlier, later in zip(times, times[1:]))
+    # La pausa és per host: el primer accés a cada host no espera l'altre
+    first = [times[0] for times in started.values()]
+    assert max(first) - min(first) < 0.09
+
+
+def test_not_modified_uses_the_cached_page(tmp_path):
+    url = _url("a")
+    cache = ResponseCache(tmp_path, ttl=0)
+    cache.put(url, PAGE, etag='"v1"')
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get('If-None-Match'))
+        return httpx.Response(304)
+
+    before = cache.get(url).fetched_at
+    scraper = AsyncUrlsScraper([url], cache=cache, transport=httpx.MockTransport(handler))
+
+    assert scraper.scrape_all_categories() == [HtmlParser().parse_classification(PAGE)]
+    assert seen == ['"v1"']
+    assert cache.get(url).fetched_at > before
+
+
+def test_fresh_cache_skips_the_request(tmp_path):
+    url = _url("a")
+    cache = ResponseCache(tmp_path, ttl=300)
+    cache.put(url, PAGE)
+
+    def handler(request):
+        raise AssertionError("no s'havia de descarregar")
+
+    scraper = AsyncUrlsScraper([url], cache=cache, transport=httpx.MockTransport(handler))
+    assert scraper.scrape_all_categories() == [HtmlParser().parse_classification(PAGE)]
+
+
+def test_downloaded_pages_are_cached(tmp_path):
+    url = _url("a")
+    cache = ResponseCache(tmp_path)
+
+    def handler(request):
+        return httpx.Response(200, text=PAGE, headers={'ETag': '"v2"'})
+
+    AsyncUrlsScraper([url], cache=cache,
+                     transport=httpx.MockTransport(handler)).scrape_all_categories()
+    assert (cache.get(url).etag, cache.get(url).body) == ('"v2"', PAGE)
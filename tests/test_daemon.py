@@ -0,0 +1,94 @@
+import dataclasses
+
+import pytest
+
+from stripscraper.daemon import WatchDaemon
+from tests.conftest import division_pages, parse_pages
+
+
+class FakeParser:
+
+    def __init__(self, pages: dict):
+        self.pages = pages
+
+    def parse_classification(self, url):
+        page = self.pages[url]
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+
+class RecordingExporter:
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.exports = []
+
+    def export(self, classifications, filepath):
+        if self.error:
+            raise self.error
+        self.exports.append([c.category for c in classifications])
+
+
+def _advance(classification):
+    groups = [dataclasses.replace(g, round=g.round + 1) for g in classification.groups]
+    return dataclasses.replace(classification, groups=groups)
+
+
+@pytest.fixture
+def pages():
+    cadet, juvenil = parse_pages(*division_pages())
+    return {"cadet": cadet, "juvenil": juvenil}
+
+
+def _daemon(pages, exporter, **kwargs):
+    daemon = WatchDaemon(FakeParser(pages), list(pages), exporters=[exporter], seed=1, **kwargs)
+    for schedule in daemon.schedules:
+        schedule.next_poll = 0.0
+    return daemon
+
+
+def _poll_all(daemon):
+    for schedule in daemon.schedules:
+        schedule.next_poll = 0.0
+    daemon.run(max_cycles=1)
+
+
+def test_first_poll_only_seeds_rounds(pages):
+    exporter = RecordingExporter()
+    daemon = _daemon(pages, exporter)
+
+    _poll_all(daemon)
+    assert exporter.exports == []
+
+    daemon.parser.pages["cadet"] = _advance(pages["cadet"])
+    _poll_all(daemon)
+    assert exporter.exports == [["Tira 1a Div Fem"]]
+
+
+def test_export_on_start(pages):
+    exporter = RecordingExporter()
+    _poll_all(_daemon(pages, exporter, export_on_start=True))
+    assert len(exporter.exports) == 1
+
+
+def test_unknown_division_is_skipped(pages):
+    unknown = dataclasses.replace(pages["cadet"], category="Cadet Sènior")
+    pages = dict(pages, unknown=unknown)
+    exporter = RecordingExporter()
+    daemon = _daemon(pages, exporter, export_on_start=True)
+
+    _poll_all(daemon)
+    assert len(exporter.exports) == 1
+
+
+def test_export_error_keeps_the_daemon_running(pages):
+    daemon = _daemon(pages, RecordingExporter(OSError("disc ple")), export_on_start=True)
+
+    _poll_all(daemon)
+    assert daemon._pending == {"1a Div"}
+
+    daemon.exporters = [RecordingExporter()]
+    _poll_all(daemon)
+    assert daemon._pending == set()
+    assert len(daemon.exporters[0].exports) == 1
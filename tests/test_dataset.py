@@ -0,0 +1,71 @@
+import csv
+import gzip
+import io
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from stripscraper.classifier import Classifier
+from stripscraper.exporters.dataset import CLASSIFICATION_COLUMNS, DatasetExporter
+from stripscraper.snapshots import SnapshotStore
+from stripscraper.strip import StripCalculator
+
+START = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(parsed_division, tmp_path):
+    store = SnapshotStore(tmp_path / "snapshots")
+    cadet, juvenil = parsed_division
+    # Cadet: dos snapshots el primer dia i un el segon; Juvenil: dos el primer dia
+    for offset in (timedelta(0), timedelta(hours=3), timedelta(days=1)):
+        store.save(cadet, timestamp=START + offset)
+    for offset in (timedelta(0), timedelta(hours=3)):
+        store.save(juvenil, timestamp=START + offset)
+    return store
+
+
+def test_snapshots_are_joined_per_category_and_day(store, tmp_path):
+    written = DatasetExporter("csv.gz").export_snapshots(store, tmp_path / "dataset")
+
+    assert len(written) == 3
+    assert len({path.parent for path in written}) == 3
+
+
+def test_dataset_reads_back_with_one_schema(store, parsed_division, tmp_path):
+    ds = pytest.importorskip("pyarrow.dataset")
+    root = tmp_path / "dataset"
+    exporter = DatasetExporter("parquet")
+    exporter.export_snapshots(store, root)
+    strip = Classifier().classify(StripCalculator().calculate_strip_classifications(
+        parsed_division))
+    exporter.export(strip, root, day=date(2026, 3, 2))
+
+    table = ds.dataset(root, format="parquet", partitioning="hive").to_table()
+
+    assert table.column_names == list(CLASSIFICATION_COLUMNS) + ["category", "date"]
+    teams = len([t for g in parsed_division[0].groups for t in g.teams])
+    assert table.num_rows == 5 * teams + len(strip[0].teams)
+
+    cadet = table.filter(ds.field("category") == "Cadet_Femení_1a_Div").to_pylist()
+    first = [row for row in cadet if row['fetched_at'] == START.isoformat()]
+    expected = Classifier().classify([store.load(store.list(parsed_division[0].category)[0])])[0]
+    assert [(r['global_position'], r['name'], r['group_position']) for r in first] == [
+        (i, t.stats.name, t.stats.position) for i, t in enumerate(expected.teams, start=1)]
+
+
+def test_csv_partition_has_the_classification_header(store, tmp_path):
+    written = DatasetExporter("csv.gz").export_snapshots(store, tmp_path / "dataset",
+                                                         category=store.categories()[0])
+
+    with gzip.open(written[0], 'rt', encoding='utf-8') as f:
+        rows = list(csv.reader(io.StringIO(f.read())))
+    assert rows[0] == list(CLASSIFICATION_COLUMNS)
+    assert {row[0] for row in rows[1:]} == {START.isoformat(),
+                                            (START + timedelta(hours=3)).isoformat()}
+
+
+def test_gzip_partitions_are_reproducible(store, tmp_path):
+    one = DatasetExporter("csv.gz").export_snapshots(store, tmp_path / "one")
+    two = DatasetExporter("csv.gz").export_snapshots(store, tmp_path / "two")
+    assert [p.read_bytes() for p in one] == [p.read_bytes() for p in two]
@@ -0,0 +1,73 @@
+import hashlib
+import time
+import zipfile
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from stripscraper.classifier import Classifier
+from stripscraper.exporters.csv import CSVExporter
+from stripscraper.exporters.excel import ExcelExporter
+from stripscraper.exporters.pdf import PDFExporter
+from stripscraper.exporters.pipeline import ExportPipeline
+from stripscraper.strip import StripCalculator
+
+
+@pytest.fixture
+def classified(parsed_division):
+    return Classifier().classify(StripCalculator().calculate_strip_classifications(parsed_division))
+
+
+def _hashes(directory: Path) -> dict:
+    return {p.name: hashlib.sha256(p.read_bytes()).hexdigest() for p in directory.iterdir()}
+
+
+def _exporters():
+    return [CSVExporter(), ExcelExporter(), PDFExporter()]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_pipeline_matches_sequential_export(classified, tmp_path, executor):
+    for exporter in _exporters():
+        exporter.export(classified, tmp_path / "sequential")
+    ExportPipeline(_exporters(), workers=2, executor=executor).export(classified,
+                                                                       tmp_path / "pipeline")
+
+    sequential = _hashes(tmp_path / "sequential")
+    assert {Path(name).suffix for name in sequential} == {".csv", ".xlsx", ".pdf"}
+    assert _hashes(tmp_path / "pipeline") == sequential
+
+
+@pytest.mark.parametrize("write_only", [False, True])
+def test_xlsx_has_no_wall_clock_timestamps(classified, tmp_path, write_only):
+    ExcelExporter(write_only=write_only).export(classified, tmp_path)
+
+    midnight = date.today().timetuple()[:3] + (0, 0, 0)
+    for path in tmp_path.glob("*.xlsx"):
+        with zipfile.ZipFile(path) as archive:
+            assert {info.date_time for info in archive.infolist()} == {midnight}
+            core = archive.read('docProps/core.xml').decode('utf-8')
+        stamp = f"{date.today().isoformat()}T00:00:00Z"
+        assert f">{stamp}</dcterms:created>" in core
+        assert f">{stamp}</dcterms:modified>" in core
+
+
+@pytest.mark.parametrize("write_only", [False, True])
+def test_xlsx_reloads(classified, tmp_path, write_only):
+    ExcelExporter(write_only=write_only).export(classified, tmp_path)
+
+    from openpyxl import load_workbook
+    ws = load_workbook(next(tmp_path.glob("*.xlsx"))).active
+    assert [cell.value for cell in ws[1]][:2] == ['Posició Global', 'Equip']
+    assert ws.max_row == len(classified[0].teams) + 1
+
+
+def test_pdf_document_is_byte_identical(classified, tmp_path):
+    first = PDFExporter().export_document(classified, tmp_path / "first")
+    # Les dates del PDF tenen resolució de segons: una segona exportació més tard no en pot dur
+    time.sleep(1.1)
+    second = PDFExporter().export_document(classified, tmp_path / "second")
+
+    assert first.read_bytes().startswith(b"%PDF")
+    assert first.read_bytes() == second.read_bytes()
@@ -0,0 +1,64 @@
+import dataclasses
+
+from stripscraper.fingerprint import FingerprintStore
+from stripscraper.strip import StripCalculator
+from tests.conftest import division_pages, parse_pages
+
+division_of = StripCalculator().extract_division
+
+
+def _parsed():
+    return parse_pages(*division_pages("1a Div", seed=0), *division_pages("2a Div", seed=1))
+
+
+def _with_extra_point(classification):
+    group = classification.groups[0]
+    team = dataclasses.replace(group.teams[0], total_points=group.teams[0].total_points + 1)
+    return dataclasses.replace(classification, groups=[
+        dataclasses.replace(group, teams=[team] + group.teams[1:])] + classification.groups[1:])
+
+
+def test_first_seen_categories_are_selected(tmp_path):
+    parsed = _parsed()
+    store = FingerprintStore(tmp_path / "fingerprints.json")
+    assert store.select_changed(parsed, division_of) == parsed
+
+
+def test_unchanged_divisions_are_skipped(tmp_path):
+    parsed = _parsed()
+    store = FingerprintStore(tmp_path / "fingerprints.json")
+    store.update(parsed)
+
+    assert store.select_changed(parsed, division_of) == []
+
+
+def test_a_change_selects_its_whole_division(tmp_path):
+    parsed = _parsed()
+    store = FingerprintStore(tmp_path / "fingerprints.json")
+    store.update(parsed)
+
+    # Només canvia el Juvenil de 2a: es recalcula amb el seu Cadet, la 1a s'omet
+    changed = parsed[:3] + [_with_extra_point(parsed[3])]
+    assert store.select_changed(changed, division_of) == changed[2:]
+
+
+def test_a_new_category_selects_its_division(tmp_path):
+    parsed = _parsed()
+    store = FingerprintStore(tmp_path / "fingerprints.json")
+    store.update(parsed[:3])
+
+    assert store.select_changed(parsed, division_of) == parsed[2:]
+
+
+def test_saved_fingerprints_are_reloaded(tmp_path):
+    parsed = _parsed()
+    path = tmp_path / "state" / "fingerprints.json"
+    store = FingerprintStore(path)
+    store.update(parsed)
+    store.save()
+
+    reloaded = FingerprintStore(path)
+    assert reloaded.select_changed(parsed, division_of) == []
+    assert reloaded.select_changed([_with_extra_point(parsed[0]), parsed[1]], division_of) \
+        == [_with_extra_point(parsed[0]), parsed[1]]
+    assert [p.name for p in path.parent.iterdir()] == ["fingerprints.json"]
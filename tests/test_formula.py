@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from stripscraper import formula
+
+# (points, played, teams) de tots els casos possibles en grups de 7 i 8 equips
+CASES = [(points, played, teams)
+         for teams in (7, 8)
+         for played in range(0, teams)
+         for points in range(0, played * 3 + 1)]
+POINTS, PLAYED, TEAMS = (np.array(column) for column in zip(*CASES))
+
+BY_PLAYED = ["current_percentage", "normalized_to_7", "normalized_to_6",
+             "normalized_with_penalty", "weighted_difficulty"]
+BY_TEAMS = ["rounding_to_8", "rounding_to_7"]
+BY_BOTH = ["project_to_group_total", "weighted_by_completion"]
+
+
+def _scalar(name, points, played, teams):
+    scalar = getattr(formula, name)
+    if name in BY_PLAYED:
+        return scalar(points, played)
+    if name in BY_TEAMS:
+        return scalar(points, teams)
+    return scalar(points, played, teams)
+
+
+@pytest.mark.parametrize("name", BY_PLAYED + BY_TEAMS + BY_BOTH)
+def test_batch_matches_scalar(name):
+    expected = [_scalar(name, *case) for case in CASES]
+
+    assert formula.evaluate(name, POINTS, PLAYED, TEAMS) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("name", BY_PLAYED)
+def test_batch_accepts_scalars(name):
+    batch = getattr(formula, f"{name}_batch")
+    assert float(batch(9, 4)) == pytest.approx(getattr(formula, name)(9, 4))
+    assert float(batch(0, 0)) == 0
+
+
+def test_every_formula_is_registered():
+    assert set(formula.FORMULAS) == set(BY_PLAYED + BY_TEAMS + BY_BOTH)
+
+
+def test_unknown_formula_raises():
+    with pytest.raises(ValueError, match="desconeguda"):
+        formula.get_formula("no_existeix")
+
+
+def test_register_as_decorator():
+    @formula.register("test_constant")
+    def constant(points, played, teams):
+        return np.ones_like(points, dtype=np.float64)
+
+    try:
+        values = formula.evaluate("test_constant", POINTS, PLAYED, TEAMS)
+        assert values.tolist() == [1.0] * len(CASES)
+    finally:
+        del formula.FORMULAS["test_constant"]
@@ -0,0 +1,116 @@
+import json
+
+import httpx
+import pytest
+
+from stripscraper.models import Classification
+from stripscraper.parser.cache import ResponseCache
+from stripscraper.parser.html import HtmlParser
+from stripscraper.parser.httpx import HttpxParser
+from stripscraper.parser.hybrid import BROWSER, HTTP, HybridParser
+from tests.conftest import division_pages
+
+URL = "https://example.test/clasificacion_completa.php?id=1"
+
+INCOMPLETE_PAGE = "<html><body><h2>CLASIFICACIONES</h2><div id='app'></div></body></html>"
+
+
+class FakeBrowser:
+
+    def __init__(self, page: str):
+        self.page = page
+        self.urls = []
+
+    def parse_classification(self, url: str) -> Classification:
+        self.urls.append(url)
+        return HtmlParser().parse_classification(self.page)
+
+    def close(self):
+        pass
+
+
+def _http(handler) -> HttpxParser:
+    parser = HttpxParser(retries=0, backoff=0)
+    parser.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return parser
+
+
+def _serving(body: str, status: int = 200):
+    return _http(lambda request: httpx.Response(status, text=body))
+
+
+@pytest.fixture
+def page() -> str:
+    return division_pages()[0]
+
+
+def test_complete_page_is_parsed_from_http(page):
+    browser = FakeBrowser(page)
+    with HybridParser(http=_serving(page), browser=browser) as parser:
+        classification = parser.parse_classification(URL)
+
+    assert classification == HtmlParser().parse_classification(page)
+    assert browser.urls == []
+    assert parser.decisions[URL].method == HTTP
+
+
+@pytest.mark.parametrize("http", [
+    lambda page: _serving(INCOMPLETE_PAGE),
+    lambda page: _serving("", status=404),
+    lambda page: _serving("\x00"),
+], ids=["incomplete", "http-error", "unparsable"])
+def test_falls_back_to_browser(page, http):
+    browser = FakeBrowser(page)
+    with HybridParser(http=http(page), browser=browser) as parser:
+        classification = parser.parse_classification(URL)
+
+    assert classification == HtmlParser().parse_classification(page)
+    assert browser.urls == [URL]
+    assert parser.decisions[URL].method == BROWSER
+
+
+def test_falls_back_on_transport_errors(page):
+    def refuse(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    browser = FakeBrowser(page)
+    with HybridParser(http=_http(refuse), browser=browser) as parser:
+        parser.parse_classification(URL)
+
+    assert browser.urls == [URL]
+
+
+def test_browser_decision_is_remembered(page, tmp_path):
+    decisions_file = tmp_path / "fetch-decisions.json"
+    browser = FakeBrowser(page)
+    with HybridParser(http=_serving(INCOMPLETE_PAGE), browser=browser,
+                      decisions_file=decisions_file) as parser:
+        parser.parse_classification(URL)
+
+    assert json.loads(decisions_file.read_text())[URL]['method'] == BROWSER
+
+    requests = []
+    http = _http(lambda request: requests.append(request) or httpx.Response(200, text=page))
+    with HybridParser(http=http, browser=browser, decisions_file=decisions_file) as parser:
+        parser.parse_classification(URL)
+
+    assert requests == []
+    assert browser.urls == [URL, URL]
+
+
+def test_incomplete_page_is_dropped_from_cache(page, tmp_path):
+    cache = ResponseCache(tmp_path / "pages")
+    http = _serving(INCOMPLETE_PAGE)
+    http.cache = cache
+    with HybridParser(cache=cache, http=http, browser=FakeBrowser(page)) as parser:
+        parser.parse_classification(URL)
+
+    assert cache.get(URL) is None
+
+
+def test_decisions_are_kept_in_memory_by_default(page, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with HybridParser(http=_serving(INCOMPLETE_PAGE), browser=FakeBrowser(page)) as parser:
+        parser.parse_classification(URL)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stripscraper import instrumentation
+from stripscraper.classifier import Classifier
+from stripscraper.exporters.csv import CSVExporter
+from stripscraper.exporters.excel import ExcelExporter
+from stripscraper.exporters.pipeline import ExportPipeline
+from stripscraper.instrumentation import Instrumentation
+from stripscraper.strip import StripCalculator
+
+
+@pytest.fixture
+def classified(parsed_division):
+    return Classifier().classify(StripCalculator().calculate_strip_classifications(parsed_division))
+
+
+def test_disabled_collects_nothing():
+    instruments = Instrumentation(enabled=False)
+    with instruments.stage("parse"):
+        pass
+    assert list(instruments.records) == []
+
+
+def test_records_are_bounded():
+    instruments = Instrumentation(enabled=True, memory=False, max_records=3)
+    for i in range(5):
+        with instruments.stage("watch.poll", str(i)):
+            pass
+
+    assert [r.label for r in instruments.snapshot()] == ["2", "3", "4"]
+    assert instruments.dropped == 2
+    assert instruments.report()['records_dropped'] == 2
+    assert instruments.summary()['watch.poll']['count'] == 3
+
+
+def test_nested_memory_peaks_reach_the_parent():
+    instruments = Instrumentation(enabled=True)
+    try:
+        with instruments.stage("outer"):
+            with instruments.stage("inner"):
+                block = bytearray(2_000_000)
+            del block
+    finally:
+        instruments.close()
+
+    peaks = {r.stage: r.peak_bytes for r in instruments.snapshot()}
+    assert peaks["inner"] >= 2_000_000
+    assert peaks["outer"] >= peaks["inner"]
+
+
+def test_prometheus_output_escapes_labels():
+    instruments = Instrumentation(enabled=True, memory=False)
+    instruments.record("download", 'http://x/?a="b"', 0.5)
+
+    text = instruments.prometheus()
+    assert 'label="http://x/?a=\\"b\\""' in text
+    assert "stripscraper_stage_runs" in text
+
+
+def test_suppressed_only_affects_the_current_thread():
+    instruments = Instrumentation(enabled=True, memory=False)
+    with instruments.suppressed():
+        with instruments.stage("hidden"):
+            pass
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(lambda: instruments.stage("other-thread").__enter__().__exit__(
+                None, None, None)).result()
+    with instruments.stage("visible"):
+        pass
+
+    assert [r.stage for r in instruments.snapshot()] == ["other-thread", "visible"]
+
+
+def test_memory_is_only_traced_from_the_main_thread():
+    instruments = Instrumentation(enabled=True)
+
+    def work():
+        with instruments.stage("worker"):
+            pass
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(work).result()
+    finally:
+        instruments.close()
+    assert instruments.snapshot()[0].peak_bytes is None
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_pipeline_records_each_export_once(classified, tmp_path, monkeypatch, workers):
+    instruments = Instrumentation(enabled=True, memory=False)
+    monkeypatch.setattr(instrumentation, "_instrumentation", instruments)
+
+    pipeline = ExportPipeline([CSVExporter(), ExcelExporter()], workers=workers,
+                              executor="thread")
+    pipeline.export(classified, tmp_path)
+
+    stages = sorted(r.stage for r in instruments.snapshot())
+    if workers == 1:
+        assert stages == ["export.csv", "export.excel"]
+    else:
+        assert stages == ["export.job", "export.job"]
+        assert all(r.cpu_seconds is not None for r in instruments.snapshot())
@@ -0,0 +1,38 @@
+import pytest
+
+from stripscraper.parser.html import HtmlParser
+from stripscraper.parser.lxml import LxmlHtmlParser, has_classification, parse_document
+from tests.conftest import division_pages
+
+
+@pytest.fixture
+def page() -> str:
+    return division_pages()[0]
+
+
+def test_matches_bs4_backend(page):
+    assert LxmlHtmlParser().parse_classification(page) == HtmlParser().parse_classification(page)
+
+
+@pytest.mark.parametrize("charset", ["utf-8", "iso-8859-1"])
+def test_bytes_are_decoded_with_the_page_charset(page, charset):
+    page = page.replace("charset='utf-8'", f"charset='{charset}'")
+    # Noms amb accents perquè la codificació importi
+    page = page.replace("Cadet Femení", "Cadet Femení Sarrià")
+
+    parsed = LxmlHtmlParser().parse_classification(page.encode(charset))
+
+    assert parsed == HtmlParser().parse_classification(page)
+    assert "Sarrià" in parsed.category
+
+
+def test_str_ignores_the_declared_charset(page):
+    page = page.replace("charset='utf-8'", "charset='iso-8859-1'")
+    assert LxmlHtmlParser().parse_classification(page).category.endswith("Femení 1a Div")
+
+
+def test_has_classification(page):
+    assert has_classification(parse_document(page))
+    assert not has_classification(parse_document("<html><body><h2>Títol</h2></body></html>"))
+    without_rows = page.split("<table>")[0] + "<table><tr><th>col</th></tr></table>"
+    assert not has_classification(parse_document(without_rows))
@@ -0,0 +1,129 @@
+import json
+import tarfile
+import zipfile
+from datetime import datetime, timezone
+
+import pytest
+
+from stripscraper.archive import PageArchive
+from stripscraper.parser.html import HtmlParser
+from stripscraper.scraper import replay
+from stripscraper.scraper.replay import ReplayScraper
+from stripscraper.strip import StripCalculator
+from tests.conftest import division_pages
+
+
+@pytest.fixture
+def pages():
+    cadet, juvenil = division_pages()
+    # Una divisió desada en ISO-8859-1, com la serveix de vegades el servidor
+    latin = [page.replace("charset='utf-8'", "charset='iso-8859-1'")
+             for page in division_pages("2a Div", seed=1)]
+    return {
+        "1a/cadet.html": cadet.encode('utf-8'),
+        "1a/juvenil.html": juvenil.encode('utf-8'),
+        "2a/cadet.html": latin[0].encode('latin-1'),
+        "2a/juvenil.htm": latin[1].encode('latin-1'),
+    }
+
+
+@pytest.fixture
+def corpus(pages, tmp_path):
+    root = tmp_path / "corpus"
+    for name, data in pages.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_bytes(data)
+    (root / "notes.txt").write_text("no és una pàgina")
+    return root
+
+
+def _expected(pages):
+    return [HtmlParser().parse_classification(pages[name].decode(
+        'utf-8' if name.startswith("1a") else 'latin-1')) for name in sorted(pages)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_directory_replay(corpus, pages, workers):
+    with ReplayScraper(corpus, workers=workers) as scraper:
+        assert scraper.discover() == sorted(pages)
+        assert scraper.scrape_all_categories() == _expected(pages)
+
+
+@pytest.mark.parametrize("kind", ["zip", "tar"])
+def test_archive_replay(pages, tmp_path, kind):
+    path = tmp_path / f"corpus.{kind}"
+    if kind == "zip":
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, data in pages.items():
+                archive.writestr(name, data)
+    else:
+        corpus_dir = tmp_path / "files"
+        with tarfile.open(path, 'w') as archive:
+            for name, data in pages.items():
+                (corpus_dir / name).parent.mkdir(parents=True, exist_ok=True)
+                (corpus_dir / name).write_bytes(data)
+                archive.add(corpus_dir / name, arcname=name)
+
+    assert ReplayScraper(path, workers=2).scrape_all_categories() == _expected(pages)
+
+
+def test_encodings_are_cached_outside_the_source(corpus, pages, tmp_path, monkeypatch):
+    before = sorted(p.name for p in corpus.rglob("*"))
+    cache = tmp_path / "cache" / "encodings.json"
+
+    ReplayScraper(corpus, workers=2, encoding_cache=cache).scrape_all_categories()
+
+    assert sorted(p.name for p in corpus.rglob("*")) == before
+    assert len(json.loads(cache.read_text())) == len(pages)
+
+    def no_detection(data):
+        raise AssertionError("la codificació ja era a la memòria cau")
+
+    monkeypatch.setattr(replay, "detect_encoding", no_detection)
+    assert ReplayScraper(corpus, workers=1, encoding_cache=cache).scrape_all_categories() \
+        == _expected(pages)
+
+
+def test_default_replay_writes_nothing(corpus):
+    before = sorted(p.name for p in corpus.rglob("*"))
+    ReplayScraper(corpus, workers=1).scrape_all_categories()
+    assert sorted(p.name for p in corpus.rglob("*")) == before
+
+
+def test_broken_page_names_the_file(corpus):
+    (corpus / "1a" / "broken.html").write_text("<html><body></body></html>")
+    with pytest.raises(ValueError, match="1a/broken.html"):
+        ReplayScraper(corpus, workers=1).scrape_all_categories()
+
+
+def test_several_rounds_of_one_division_fail_loudly(corpus, pages):
+    (corpus / "1a" / "cadet-round-5.html").write_bytes(pages["1a/cadet.html"])
+    parsed = ReplayScraper(corpus, workers=1).scrape_all_categories()
+    with pytest.raises(ValueError, match="més d'una classificació"):
+        StripCalculator().calculate_strip_classifications(parsed)
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_archived_pages_replay(pages, tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    archive = PageArchive(tmp_path / "archive", compression)
+    urls = {name: f"https://example.test/{name}" for name in pages}
+    for name, data in pages.items():
+        archive.store(urls[name], data.replace(b"Jornada: 4", b"Jornada: 3"))
+    stored = datetime.now(timezone.utc)
+    for name, data in pages.items():
+        archive.store(urls[name], data)
+
+    scraper = ReplayScraper(archive.root, workers=2)
+    assert scraper.discover() == sorted(urls.values())
+    assert scraper.scrape_all_categories() == _expected(pages)
+
+    earlier = ReplayScraper(archive.root, workers=1, at=stored).scrape_all_categories()
+    assert {g.round for c in earlier for g in c.groups} == {3}
+    assert [c.category for c in earlier] == [c.category for c in _expected(pages)]
+
+
+def test_moment_needs_an_archive(corpus):
+    with pytest.raises(ValueError, match="PageArchive"):
+        ReplayScraper(corpus, at=datetime.now(timezone.utc))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from stripscraper.classifier import Classifier
+from stripscraper.models import TeamStats
+from stripscraper.scenario import ScenarioExplorer
+from stripscraper.strip import StripCalculator
+from stripscraper.table import TeamTable
+from tests.conftest import division_pages, parse_pages
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_current_percentage_matches_classifier(seed):
+    parsed = parse_pages(*division_pages(groups=3, teams=8, round_num=5, seed=seed))
+    strip = StripCalculator().calculate_strip_classifications(parsed)[0]
+    expected = [t.stats.name for t in Classifier().classify([strip])[0].teams]
+
+    explorer = ScenarioExplorer.from_parsed(parsed)["1a Div"]
+    ranking = explorer.rank("current_percentage")
+    names = explorer.table.names.tolist()
+
+    assert explorer.table.names[np.argsort(ranking.global_positions)].tolist() == expected
+    group_positions = dict(zip(names, ranking.group_positions.tolist()))
+    assert all(group_positions[t.name] == t.position for g in strip.groups for t in g.teams)
+
+
+def _team(name, points, played, won):
+    return TeamStats(
+        position=0, name=name, recent_form="", total_points=points,
+        points_percentage=0.0, matches_played=played, matches_won=won, win_percentage=0,
+        matches_lost=played - won, loss_percentage=0, sets_for=0, sets_against=0,
+        points_for=0, avg_points_for=0.0, points_against=0, avg_points_against=0.0,
+        victories_3_sets=0, victories_2_sets=0, defeats_1_point=0, defeats_0_points=0,
+        new_group=0
+    )
+
+
+def test_position_ranges_on_a_hand_built_table():
+    # A té el millor percentatge, B més punts: rounding_to_8 (punts per mida de grup) els
+    # inverteix; C és tercer sempre
+    teams = [_team("A", 9, 3, 3), _team("B", 12, 6, 4), _team("C", 3, 3, 1)]
+    table = TeamTable.from_teams(teams, ["Grup A"] * 3)
+    explorer = ScenarioExplorer(table, categories=1)
+
+    rows = explorer.position_ranges(["current_percentage", "rounding_to_8"])
+
+    assert [(r['name'], r['best'], r['worst'], r['spread']) for r in rows] == [
+        ("A", 1, 2, 1),
+        ("B", 1, 2, 1),
+        ("C", 3, 3, 0),
+    ]
+    assert rows[0]['positions'] == {"current_percentage": 1, "rounding_to_8": 2}
+    assert [(r['best_formula'], r['worst_formula']) for r in rows] == [
+        ("current_percentage", "rounding_to_8"),
+        ("rounding_to_8", "current_percentage"),
+        ("current_percentage", "current_percentage"),
+    ]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from stripscraper.simulation import MonteCarloSimulator, pending_fixtures, simulate_results
+
+
+def test_pending_fixtures_match_each_team_remaining():
+    remaining = [4, 3, 3, 2, 2]
+    fixtures = pending_fixtures(remaining)
+
+    counts = np.bincount(np.array(fixtures).ravel(), minlength=len(remaining))
+    assert counts.tolist() == remaining
+    assert all(home != away for home, away in fixtures)
+    # Cada parella es troba com a molt un cop per categoria
+    pairs = [tuple(sorted(f)) for f in fixtures]
+    assert max(pairs.count(pair) for pair in set(pairs)) <= 2
+
+
+def test_pending_fixtures_without_rival_are_dropped():
+    assert pending_fixtures([3, 0, 0]) == []
+
+
+def test_each_match_is_zero_sum(strip_classification):
+    model = MonteCarloSimulator(strip_classification).model
+    matches = len(model['home'])
+    assert matches > 0
+
+    results = simulate_results(model, 500, np.random.default_rng(7))
+
+    won = results['matches_won'] - model['matches_won']
+    points = results['total_points'] - model['total_points']
+    sets = results['sets_difference'] - (model['sets_for'] - model['sets_against'])
+
+    # Un guanyador per partit i 3 punts repartits (3-0 o 2-1): no tothom pot guanyar-ho tot
+    assert (won.sum(axis=1) == matches).all()
+    assert (points.sum(axis=1) == 3 * matches).all()
+    assert (sets.sum(axis=1) == 0).all()
+
+
+def test_simulation_plays_every_team_to_the_end(strip_classification):
+    simulator = MonteCarloSimulator(strip_classification)
+    results = simulate_results(simulator.model, 10, np.random.default_rng(0))
+
+    sizes = simulator.table.group_sizes
+    assert (results['matches_played'] == 2 * (sizes - 1)).all()
+
+
+def test_position_probabilities_are_distributions(strip_classification):
+    result = MonteCarloSimulator(strip_classification).simulate(300, batch_size=128,
+                                                                workers=1, seed=3)
+
+    probabilities = result.position_probabilities()
+    assert np.allclose(probabilities.sum(axis=0), 1.0)
+    assert np.allclose(probabilities.sum(axis=1), 1.0)
+
+
+def test_same_seed_gives_same_result(strip_classification):
+    simulator = MonteCarloSimulator(strip_classification)
+    first = simulator.simulate(200, workers=1, seed=11)
+    second = simulator.simulate(200, workers=1, seed=11)
+    assert (first.position_counts == second.position_counts).all()
+
+
+@pytest.mark.parametrize("simulations", [0, -5])
+def test_rejects_empty_simulation(strip_classification, simulations):
+    with pytest.raises(ValueError):
+        MonteCarloSimulator(strip_classification).simulate(simulations)
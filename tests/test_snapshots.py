@@ -0,0 +1,107 @@
+import dataclasses
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from stripscraper.snapshots import (
+    NUMERIC_COLUMNS,
+    SnapshotStore,
+    decode_text,
+    encode_text,
+    from_columns,
+    to_columns,
+)
+from stripscraper.table import TeamTable
+
+START = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def test_columns_round_trip(parsed_division):
+    for classification in parsed_division:
+        columns = to_columns(classification)
+        assert all(columns[name].dtype == dtype for name, dtype in NUMERIC_COLUMNS.items())
+        restored = from_columns(columns, classification.competition, classification.category)
+        assert restored == classification
+
+
+def test_text_is_dictionary_encoded():
+    values = ["Grup A", "Grup B", "Grup A", "Grup A", "Grup B"]
+    encoded = encode_text(values)
+
+    assert encoded['codes'].tolist() == [0, 1, 0, 0, 1]
+    assert encoded['data'].tobytes() == b"Grup AGrup B"
+    assert encoded['offsets'].tolist() == [0, 6, 12]
+    assert decode_text(**encoded).tolist() == values
+    assert decode_text(**encode_text([])).tolist() == []
+
+
+def test_store_round_trip(parsed_division, tmp_path):
+    store = SnapshotStore(tmp_path)
+    keys = store.save_all(parsed_division, timestamp=START)
+
+    assert SnapshotStore(tmp_path).list() == sorted(keys, key=lambda k: k.category)
+    assert [store.load(key) for key in keys] == parsed_division
+    assert keys[0].fetched_at == START
+    assert store.categories() == sorted(c.category for c in parsed_division)
+
+
+def test_season_is_ordered_by_time(parsed_division, tmp_path):
+    store = SnapshotStore(tmp_path)
+    cadet = parsed_division[0]
+    later = dataclasses.replace(cadet, groups=[dataclasses.replace(g, round=g.round + 1)
+                                               for g in cadet.groups])
+    store.save(later, timestamp=START + timedelta(days=7))
+    store.save(cadet, timestamp=START)
+
+    assert store.load_season(cadet.category) == [cadet, later]
+
+
+def _with_team_name(classification, name):
+    group = classification.groups[0]
+    team = dataclasses.replace(group.teams[0], name=name)
+    return dataclasses.replace(classification, groups=[
+        dataclasses.replace(group, teams=[team] + group.teams[1:])] + classification.groups[1:])
+
+
+def test_long_names_are_kept(parsed_division, tmp_path):
+    classification = _with_team_name(parsed_division[0], "Club Vòlei Sant Joan Despí " * 20)
+    store = SnapshotStore(tmp_path)
+    key = store.save(classification, timestamp=START)
+    assert store.load(key) == classification
+
+
+def test_numeric_columns_are_memory_mapped(parsed_division, tmp_path):
+    store = SnapshotStore(tmp_path)
+    key = store.save(parsed_division[0], timestamp=START)
+
+    columns = store.columns(key)
+    assert all(isinstance(columns[name], np.memmap) for name in NUMERIC_COLUMNS)
+
+    table = store.table(key)
+    expected = TeamTable.from_classification(parsed_division[0])
+    assert table.names.tolist() == expected.names.tolist()
+    assert table.groups.tolist() == expected.groups.tolist()
+    assert all(np.array_equal(table[name], expected[name]) for name in expected.columns)
+
+
+def _save_many(root, classification, worker, count):
+    store = SnapshotStore(root)
+    for i in range(count):
+        store.save(classification, timestamp=START + timedelta(seconds=worker * count + i))
+
+
+def test_concurrent_saves_keep_every_index_entry(parsed_division, tmp_path):
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_save_many, args=(tmp_path, parsed_division[0], w, 10))
+               for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    keys = SnapshotStore(tmp_path).list()
+    assert len(keys) == 40
+    expected = to_columns(parsed_division[0])
+    assert all(np.array_equal(SnapshotStore(tmp_path).columns(k)[name], values)
+               for k in keys[:3] for name, values in expected.items())
@@ -0,0 +1,80 @@
+import httpx
+import pytest
+
+from stripscraper.parser.cache import ResponseCache
+from stripscraper.parser.html import HtmlParser
+from stripscraper.parser.httpx import HttpxParser
+from stripscraper.parser.stream import StreamingHtmlParser
+from tests.conftest import division_pages
+
+URL = "https://example.test/clasificacion_completa.php?id=1"
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _late_rounds(page: str) -> str:
+    # Cada "Jornada:" just després de la taula del grup en comptes d'abans
+    head, *groups = page.split("<h4>PRIMERA FASE - ")
+    moved = []
+    for group in groups:
+        heading, rest = group.split("</h4>", 1)
+        jornada, rest = rest.split("</h4>", 1)
+        table, tail = rest.split("</table>", 1)
+        moved.append(f"{heading}</h4>{table}</table>{jornada}</h4>{tail}")
+    return head + "".join("<h4>PRIMERA FASE - " + group for group in moved)
+
+
+@pytest.mark.parametrize("size", [64, 1000, 1 << 20])
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_matches_dom_parser(size, as_bytes):
+    for page in division_pages():
+        data = page.encode('utf-8') if as_bytes else page
+        streamed = StreamingHtmlParser().parse_stream(_chunks(data, size))
+        assert streamed == HtmlParser().parse_classification(page)
+
+
+@pytest.mark.parametrize("size", [64, 1 << 20])
+def test_round_after_the_table_matches_dom_parser(size):
+    page = _late_rounds(division_pages()[0])
+    expected = HtmlParser().parse_classification(page)
+    assert expected.groups[0].round == 4
+
+    assert StreamingHtmlParser().parse_stream(_chunks(page, size)) == expected
+
+
+def test_latin1_bytes_are_decoded_with_the_page_charset():
+    page = division_pages()[0].replace("charset='utf-8'", "charset='iso-8859-1'")
+    streamed = StreamingHtmlParser().parse_stream(_chunks(page.encode('latin-1'), 64))
+    assert streamed == HtmlParser().parse_classification(page)
+
+
+def test_group_heading_without_table_raises():
+    page = division_pages()[0].replace("<h4>PRIMERA FASE - GRUP A</h4>",
+                                       "<h4>PRIMERA FASE - GRUP A</h4>"
+                                       "<h4>PRIMERA FASE - GRUP Z</h4>", 1)
+    with pytest.raises(ValueError, match="GRUP A"):
+        StreamingHtmlParser().parse_stream([page])
+
+
+def test_iter_groups_retries_and_uses_the_cache(tmp_path):
+    page = division_pages()[0]
+    statuses = [503, 200]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(statuses.pop(0), text=page)
+
+    with HttpxParser(backoff=0) as parser:
+        parser.client = httpx.Client(transport=httpx.MockTransport(handler))
+        streamed = list(parser.iter_groups(URL))
+        assert streamed == HtmlParser().parse_classification(page).groups
+        assert len(requests) == 2
+
+        parser.cache = ResponseCache(tmp_path)
+        statuses.append(200)
+        assert list(parser.iter_groups(URL)) == streamed
+        assert list(parser.iter_groups(URL)) == streamed
+        assert len(requests) == 3
@@ -0,0 +1,100 @@
+import dataclasses
+import itertools
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from stripscraper.parser.html import HtmlParser
+from stripscraper.strip import StripCalculator, optimal_assignment
+
+DATA = Path(__file__).parent / "data" / "matching"
+
+
+@pytest.fixture
+def matching_pages():
+    return [HtmlParser().parse_classification((DATA / name).read_text(encoding='utf-8'))
+            for name in ("cadet.html", "juvenil.html")]
+
+
+@pytest.fixture
+def expected():
+    # Parelles i tira calculades amb l'emparellament anterior (recorregut niat + fuzzy voraç)
+    return json.loads((DATA / "expected.json").read_text(encoding='utf-8'))
+
+
+def _pairings(paired):
+    return {name: sorted([m.nom_cadet, m.nom_juvenil, m.nom_definitiu] for m in matches)
+            for name, _, _, matches in paired}
+
+
+def _strip_rows(strip):
+    return {g.name: [[t.name, t.total_points, t.matches_played, t.matches_won, t.sets_for,
+                      t.sets_against, t.points_for, t.points_against] for t in g.teams]
+            for g in strip.groups}
+
+
+def test_pairings_match_recorded_pages(matching_pages, expected):
+    cadet, juvenil = matching_pages
+    assert _pairings(StripCalculator()._paired_groups(cadet, juvenil)) == expected['pairings']
+
+
+def test_strip_matches_recorded_pages(matching_pages, expected):
+    strip = StripCalculator().calculate_strip_classifications(matching_pages)
+    assert len(strip) == 1
+    assert _strip_rows(strip[0]) == expected['strip']
+
+
+def test_different_group_labels_match_the_whole_division(matching_pages, expected):
+    cadet, juvenil = matching_pages
+    relabelled = dataclasses.replace(juvenil, groups=[
+        dataclasses.replace(g, name=f"GRUP {i}") for i, g in enumerate(juvenil.groups, start=1)])
+
+    paired = StripCalculator()._paired_groups(cadet, relabelled)
+    assert _pairings(paired) == expected['pairings']
+
+
+def test_fuzzy_matching_is_not_greedy():
+    # Voraç, "CV Sant Just Desvern" (0.96) s'enduria "CV Sant Just Desvern Blau", l'única
+    # parella possible de "Desvern Blau", que quedaria sense emparellar
+    calculator = StripCalculator()
+    cadet, juvenil = [HtmlParser().parse_classification(page) for page in _pages(
+        ["CV Sant Just Desvern", "Desvern Blau"], ["CV Sant Just Desvern Blau", "CV Sant Just"])]
+    matches = calculator._paired_groups(cadet, juvenil)[0][3]
+    assert [(m.nom_cadet, m.nom_juvenil) for m in matches] == [
+        ("CV Sant Just Desvern", "CV Sant Just"), ("Desvern Blau", "CV Sant Just Desvern Blau")]
+
+
+def _pages(cadet_names, juvenil_names):
+    from benchmarks.synthetic import generate_page
+    return (generate_page("Cadet Femení 3a Div", 1, len(cadet_names), names=cadet_names),
+            generate_page("Juvenil Femení 3a Div", 1, len(juvenil_names), names=juvenil_names))
+
+
+def _brute_force(weights):
+    rows, cols = len(weights), len(weights[0])
+    if rows <= cols:
+        return max(sum(weights[r][c] for r, c in enumerate(perm))
+                   for perm in itertools.permutations(range(cols), rows))
+    return max(sum(weights[r][c] for c, r in enumerate(perm))
+               for perm in itertools.permutations(range(rows), cols))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_optimal_assignment_matches_brute_force(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(1, 6), rng.randint(1, 6)
+    weights = [[rng.choice([0, 0.25, 0.5, rng.random()]) for _ in range(cols)]
+               for _ in range(rows)]
+
+    assignment = optimal_assignment(weights)
+
+    assert len(assignment) == min(rows, cols)
+    assert len({r for r, _ in assignment}) == len({c for _, c in assignment}) == len(assignment)
+    assert sum(weights[r][c] for r, c in assignment) == pytest.approx(_brute_force(weights))
+
+
+def test_optimal_assignment_is_deterministic_on_ties():
+    weights = [[1.0, 1.0], [1.0, 1.0]]
+    assert optimal_assignment(weights) == optimal_assignment(weights) == [(0, 0), (1, 1)]
@@ -0,0 +1,58 @@
+import pytest
+
+from stripscraper.classifier import Classifier
+from stripscraper.strip import StripCalculator
+from stripscraper.table import TeamTable
+from tests.conftest import division_pages, parse_pages
+
+SEEDS = range(5)
+
+
+def _division(seed):
+    return parse_pages(*division_pages(groups=3, teams=8, round_num=5, seed=seed))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_combined_table_matches_strip_groups(seed):
+    cadet, juvenil = _division(seed)
+    calculator = StripCalculator()
+    strip = calculator.calculate_strip_classifications([cadet, juvenil])[0]
+
+    table = calculator.combine_tables(cadet, juvenil)
+    groups = table.to_groups({g.name: g.round for g in strip.groups})
+
+    assert groups == strip.groups
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_global_order_matches_classifier(seed):
+    cadet, juvenil = _division(seed)
+    calculator = StripCalculator()
+    strip = calculator.calculate_strip_classifications([cadet, juvenil])[0]
+    expected = [t.stats.name for t in Classifier().classify([strip])[0].teams]
+
+    table = calculator.combine_tables(cadet, juvenil)
+    assert table.names[table.global_order()].tolist() == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_order_matches_scalar_sort(seed):
+    classification = _division(seed)[0]
+    teams = [t for g in classification.groups for t in g.teams]
+    expected = sorted(teams, key=lambda t: (-t.points_percentage, -t.matches_won,
+                                            -t.sets_difference, -t.points_difference))
+
+    table = TeamTable.from_classification(classification)
+    assert table.names[table.order()].tolist() == [t.name for t in expected]
+
+
+def test_group_positions_match_scalar_sort_per_group():
+    classification = _division(0)[0]
+    table = TeamTable.from_classification(classification)
+
+    positions = dict(zip(table.names.tolist(), table.group_positions().tolist()))
+
+    for group in classification.groups:
+        ranked = sorted(group.teams, key=lambda t: (-t.points_percentage, -t.matches_won,
+                                                    -t.sets_difference, -t.points_difference))
+        assert [positions[t.name] for t in ranked] == list(range(1, len(ranked) + 1))